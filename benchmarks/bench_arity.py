@@ -0,0 +1,62 @@
+"""
+Compare heap arities across insert-heavy, pop-heavy and update-heavy traces.
+
+Each trace starts from a `MinHeap` of `--size` values with separate priorities:
+- insert-heavy: insert `--size` new values.
+- pop-heavy: pop every value.
+- update-heavy: apply `--size` random `decrease_key` calls, followed by `--size // 10` pops.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_arity.py --size 200000 --arities 2 4 8
+"""
+import argparse
+import random
+import time
+
+from indexedheap import MinHeap
+
+def build(size, arity, rng):
+    """
+    Return a heap of `size` values with random priorities.
+    """
+    heap = MinHeap(arity=arity)
+    for value in range(size):
+        heap.insert(value, priority=rng.random())
+    return heap
+
+def insert_heavy(heap, size, rng):
+    for value in range(size, 2 * size):
+        heap.insert(value, priority=rng.random())
+
+def pop_heavy(heap, size, rng):
+    while heap:
+        heap.pop()
+
+def update_heavy(heap, size, rng):
+    for _ in range(size):
+        value = rng.randrange(size)
+        heap.decrease_key(value, heap.priority(value) * rng.random())
+    for _ in range(size // 10):
+        heap.pop()
+
+TRACES = [("insert-heavy", insert_heavy), ("pop-heavy", pop_heavy), ("update-heavy", update_heavy)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--arities", type=int, nargs="+", default=[2, 3, 4, 8])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'trace':<14} {'arity':>5} {'seconds':>10}")
+    for name, trace in TRACES:
+        for arity in args.arities:
+            rng = random.Random(args.seed)
+            heap = build(args.size, arity, rng)
+            start = time.perf_counter()
+            trace(heap, args.size, rng)
+            print(f"{name:<14} {arity:>5} {time.perf_counter() - start:>10.3f}")
+
+if __name__ == "__main__":
+    main()
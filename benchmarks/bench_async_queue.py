@@ -0,0 +1,65 @@
+"""
+Compare `AsyncIndexedPriorityQueue` with `asyncio.PriorityQueue` under request cancellation.
+
+Both queues receive `--requests` requests with random priorities. A `--cancel` fraction of
+them is cancelled before a consumer drains the queue:
+- `AsyncIndexedPriorityQueue` removes each cancelled request with `remove` in O(log(N)).
+- `asyncio.PriorityQueue` cannot remove entries, so cancelled request ids are recorded in a
+  tombstone set and skipped (and still popped) by the consumer.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_async_queue.py --requests 200000 --cancel 0.8
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from indexedheap import AsyncIndexedPriorityQueue
+
+async def run_indexed(priorities, cancelled):
+    queue = AsyncIndexedPriorityQueue()
+    for request_id, priority in enumerate(priorities):
+        await queue.put(request_id, priority=priority)
+    for request_id in cancelled:
+        queue.remove(request_id)
+    served = 0
+    while not queue.empty():
+        await queue.get()
+        served += 1
+    return served
+
+async def run_tombstones(priorities, cancelled):
+    queue = asyncio.PriorityQueue()
+    for request_id, priority in enumerate(priorities):
+        await queue.put((priority, request_id))
+    tombstones = set(cancelled)
+    served = 0
+    while not queue.empty():
+        _, request_id = await queue.get()
+        if request_id in tombstones:
+            tombstones.discard(request_id)
+            continue
+        served += 1
+    return served
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--cancel", type=float, default=0.5, help="fraction of requests cancelled")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    priorities = [rng.random() for _ in range(args.requests)]
+    cancelled = rng.sample(range(args.requests), int(args.requests * args.cancel))
+
+    print(f"{'queue':<34} {'served':>8} {'seconds':>9}")
+    for name, runner in (("AsyncIndexedPriorityQueue.remove", run_indexed), ("asyncio.PriorityQueue+tombstones", run_tombstones)):
+        start = time.perf_counter()
+        served = asyncio.run(runner(priorities, cancelled))
+        print(f"{name:<34} {served:>8} {time.perf_counter() - start:>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measure multithreaded producer/consumer throughput of `ConcurrentMinHeap`.
+
+Producers `put` values one at a time (or in batches with `--batch`), consumers `pop`
+(or `pop_many`) until every value has been consumed. `queue.PriorityQueue` is timed on
+the same single-item workload as a baseline.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_concurrent.py --items 200000 --producers 4 --consumers 4
+"""
+import argparse
+import queue
+import threading
+import time
+
+from indexedheap import ConcurrentMinHeap
+
+def run(heap, items, producers, consumers, batch):
+    """
+    Return the seconds taken to push `items` values through `heap`.
+    """
+    per_producer = items // producers
+    remaining = [per_producer * producers]
+    remaining_lock = threading.Lock()
+
+    def produce(offset):
+        values = range(offset, offset + per_producer)
+        if batch > 1:
+            for start in range(0, per_producer, batch):
+                heap.insert_many(values[start:start + batch])
+        else:
+            for value in values:
+                heap.put(value)
+
+    def consume():
+        while True:
+            with remaining_lock:
+                if remaining[0] <= 0:
+                    return
+            try:
+                if batch > 1:
+                    taken = len(heap.pop_many(batch, timeout=0.05))
+                else:
+                    heap.get(timeout=0.05)
+                    taken = 1
+            except queue.Empty:
+                continue
+            with remaining_lock:
+                remaining[0] -= taken
+
+    threads = [threading.Thread(target=produce, args=(p * per_producer,)) for p in range(producers)]
+    threads += [threading.Thread(target=consume) for _ in range(consumers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--consumers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=100, help="batch size for the batched run")
+    args = parser.parse_args()
+
+    runs = [
+        ("queue.PriorityQueue", queue.PriorityQueue(), 1),
+        ("ConcurrentMinHeap", ConcurrentMinHeap(), 1),
+        (f"ConcurrentMinHeap x{args.batch}", ConcurrentMinHeap(), args.batch),
+    ]
+    print(f"{'queue':<26} {'items/s':>12}")
+    for name, heap, batch in runs:
+        elapsed = run(heap, args.items, args.producers, args.consumers, batch)
+        print(f"{name:<26} {args.items / elapsed:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare heap construction paths, in seconds per million elements.
+
+Each path builds a `MinHeap` from `--size` random integers (`--distinct` distinct values):
+- MinHeap(list): the constructor, validating every value individually before heapifying.
+- from_iterable: a generator, tallied with `Counter` and validated once per type.
+- from_counts: the pre-aggregated `Counter`.
+- from_sorted: the values already sorted, used as they are without heapifying.
+- heapq.heapify: the plain-list baseline, without an index or frequencies.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_construction.py --size 2000000 --distinct 1000000
+"""
+import argparse
+import heapq
+import random
+import time
+from collections import Counter
+
+from indexedheap import MinHeap
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=None, help="number of distinct values; defaults to --size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    distinct = args.distinct or args.size
+    data = [rng.randrange(distinct) for _ in range(args.size)]
+    counts = Counter(data)
+    ordered = sorted(data)
+
+    paths = (
+        ("MinHeap(list)", lambda: MinHeap(data)),
+        ("from_iterable", lambda: MinHeap.from_iterable(value for value in data)),
+        ("from_counts", lambda: MinHeap.from_counts(counts)),
+        ("from_sorted", lambda: MinHeap.from_sorted(ordered)),
+        ("heapq.heapify", lambda: heapq.heapify(list(data))),
+    )
+    print(f"{'path':<16} {'seconds':>9} {'s/million':>10}")
+    for name, build in paths:
+        start = time.perf_counter()
+        build()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<16} {elapsed:>9.3f} {elapsed / args.size * 1e6:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measure `ExternalHeap` throughput against its in-memory buffer size.
+
+`--values` random floats are inserted and then all popped, once with a plain `MinHeap` and
+once per `--buffer-sizes` entry with an `ExternalHeap` spilling to sorted runs on disk.
+A `--remove` fraction of the values is removed with `remove_many` before popping,
+exercising the on-disk tombstones for spilled values.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_external.py --values 1000000 --buffer-sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+
+from indexedheap import ExternalHeap, MinHeap
+
+def run_min_heap(values, removed):
+    heap = MinHeap()
+    for value in values:
+        heap.insert(value)
+    heap.remove_many(removed)
+    while heap:
+        heap.pop()
+
+def run_external(values, removed, buffer_size):
+    with ExternalHeap(buffer_size) as heap:
+        for value in values:
+            heap.insert(value)
+        runs = heap.run_count()
+        heap.remove_many(removed)
+        while heap:
+            heap.pop()
+    return runs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--values", type=int, default=200_000)
+    parser.add_argument("--buffer-sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--remove", type=float, default=0.1, help="fraction of values removed before popping")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    values = [rng.random() for _ in range(args.values)]
+    removed = rng.sample(values, int(args.values * args.remove))
+
+    print(f"{'heap':<28} {'runs':>6} {'seconds':>9} {'ops/s':>10}")
+    start = time.perf_counter()
+    run_min_heap(values, removed)
+    elapsed = time.perf_counter() - start
+    print(f"{'MinHeap (in memory)':<28} {'-':>6} {elapsed:>9.3f} {2 * args.values / elapsed:>10.0f}")
+    for buffer_size in args.buffer_sizes:
+        start = time.perf_counter()
+        runs = run_external(values, removed, buffer_size)
+        elapsed = time.perf_counter() - start
+        name = f"ExternalHeap({buffer_size})"
+        print(f"{name:<28} {runs:>6} {elapsed:>9.3f} {2 * args.values / elapsed:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare heap backends on Dijkstra shortest-path and Prim minimum-spanning-tree traces.
+
+Both algorithms run over the same random graph, keep one entry per vertex in the heap and
+improve it in place with `decrease_key`. The array-backed `MinHeap` (at `--arity`) and the
+`PairingMinHeap` are timed, with `heapq` plus lazy deletion of stale entries as a baseline.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_graph.py --vertices 50000 --edges 500000
+"""
+import argparse
+import heapq
+import random
+import time
+
+from indexedheap import create_heap
+
+def random_graph(vertices, edges, seed):
+    """
+    Return an undirected adjacency list of `(neighbour, weight)` pairs.
+    """
+    rng = random.Random(seed)
+    graph = [[] for _ in range(vertices)]
+    for v in range(1, vertices):
+        u = rng.randrange(v)
+        w = rng.random()
+        graph[u].append((v, w))
+        graph[v].append((u, w))
+    for _ in range(edges - vertices + 1):
+        u, v, w = rng.randrange(vertices), rng.randrange(vertices), rng.random()
+        graph[u].append((v, w))
+        graph[v].append((u, w))
+    return graph
+
+def indexed_search(graph, heap, prim):
+    """
+    Run Dijkstra (or Prim if `prim`) from vertex 0 and return the total of the final keys.
+    """
+    done = [False] * len(graph)
+    total = 0.0
+    heap.insert(0, priority=0.0)
+    while heap:
+        u = heap.peek()
+        key = heap.priority(u)
+        heap.pop()
+        done[u] = True
+        total += key
+        for v, w in graph[u]:
+            if done[v]:
+                continue
+            candidate = w if prim else key + w
+            if v in heap:
+                if candidate < heap.priority(v):
+                    heap.decrease_key(v, candidate)
+            else:
+                heap.insert(v, priority=candidate)
+    return total
+
+def heapq_search(graph, prim):
+    """
+    Run Dijkstra (or Prim if `prim`) with `heapq`, skipping stale entries on pop.
+    """
+    done = [False] * len(graph)
+    best = [float("inf")] * len(graph)
+    best[0] = 0.0
+    total = 0.0
+    entries = [(0.0, 0)]
+    while entries:
+        key, u = heapq.heappop(entries)
+        if done[u]:
+            continue
+        done[u] = True
+        total += key
+        for v, w in graph[u]:
+            candidate = w if prim else key + w
+            if not done[v] and candidate < best[v]:
+                best[v] = candidate
+                heapq.heappush(entries, (candidate, v))
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vertices", type=int, default=50_000)
+    parser.add_argument("--edges", type=int, default=500_000)
+    parser.add_argument("--arity", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = random_graph(args.vertices, args.edges, args.seed)
+    print(f"{'trace':<9} {'heap':<22} {'seconds':>9}")
+    for trace, prim in (("dijkstra", False), ("prim", True)):
+        runs = [
+            (f"array (arity {args.arity})", lambda: indexed_search(graph, create_heap(arity=args.arity), prim)),
+            ("pairing", lambda: indexed_search(graph, create_heap(backend="pairing"), prim)),
+            ("heapq + lazy deletion", lambda: heapq_search(graph, prim)),
+        ]
+        for name, run in runs:
+            start = time.perf_counter()
+            run()
+            print(f"{trace:<9} {name:<22} {time.perf_counter() - start:>9.3f}")
+
+if __name__ == "__main__":
+    main()
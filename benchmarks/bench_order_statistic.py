@@ -0,0 +1,52 @@
+"""
+Compare order-statistic queries on `OrderStatisticHeap` with draining a sorted copy of a `MinHeap`.
+
+Both structures hold `--size` random integers. For `--queries` random priorities, each
+answers "how many values are below this priority" and "what is the k-th smallest value":
+- `OrderStatisticHeap` uses `rank` and `kth`, in O(log(N)) each.
+- `MinHeap` builds `to_sorted_list()` (O(N * log(N))) and bisects it, per query.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_order_statistic.py --size 100000 --queries 100
+"""
+import argparse
+import bisect
+import random
+import time
+
+from indexedheap import MinHeap, OrderStatisticHeap
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = [rng.randrange(args.size) for _ in range(args.size)]
+    queries = [rng.randrange(args.size) for _ in range(args.queries)]
+
+    print(f"{'structure':<20} {'build':>9} {'queries':>9}")
+    start = time.perf_counter()
+    tree = OrderStatisticHeap(data)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = [(tree.rank(q), tree.kth(q)) for q in queries]
+    print(f"{'OrderStatisticHeap':<20} {built:>9.3f} {time.perf_counter() - start:>9.3f}")
+
+    start = time.perf_counter()
+    heap = MinHeap(data)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    answers = []
+    for q in queries:
+        ordered = heap.to_sorted_list()
+        answers.append((bisect.bisect_left(ordered, q), ordered[q]))
+    print(f"{'MinHeap+sorted copy':<20} {built:>9.3f} {time.perf_counter() - start:>9.3f}")
+    if answers != expected:
+        raise AssertionError("Query results differ")
+
+if __name__ == "__main__":
+    main()
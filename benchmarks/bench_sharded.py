@@ -0,0 +1,61 @@
+"""
+Measure `ShardedHeap` throughput for 1 to 16 worker processes against a single `MinHeap`.
+
+Each run inserts `--inserts` random integers with `insert_many` in batches of
+`--batch-size`, then drains the heap with `pop_many` in
+chunks of `--chunk`. Throughput is reported separately for the insert phase (including the
+final flush) and the drain phase.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_sharded.py --inserts 1000000 --shards 1 2 4 8 16
+"""
+import argparse
+import os
+import random
+import time
+
+from indexedheap import MinHeap, ShardedHeap
+
+def run_single(data, chunk, batch_size):
+    heap = MinHeap()
+    start = time.perf_counter()
+    for offset in range(0, len(data), batch_size):
+        heap.insert_many(data[offset:offset + batch_size])
+    inserted = time.perf_counter()
+    while heap:
+        heap.pop_many(min(chunk, len(heap)))
+    return inserted - start, time.perf_counter() - inserted
+
+def run_sharded(data, chunk, shards, batch_size):
+    with ShardedHeap(shards, batch_size=batch_size) as heap:
+        start = time.perf_counter()
+        for offset in range(0, len(data), batch_size):
+            heap.insert_many(data[offset:offset + batch_size])
+        heap.flush()
+        inserted = time.perf_counter()
+        while heap:
+            heap.pop_many(min(chunk, len(heap)))
+        return inserted - start, time.perf_counter() - inserted
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--inserts", type=int, default=500_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--chunk", type=int, default=1000, help="values per pop_many call")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = [rng.randrange(1 << 40) for _ in range(args.inserts)]
+
+    print(f"cpus: {os.cpu_count()}")
+    print(f"{'heap':<16} {'insert/s':>12} {'pop/s':>12}")
+    results = [("MinHeap", run_single(data, args.chunk, args.batch_size))]
+    results += [(f"ShardedHeap({shards})", run_sharded(data, args.chunk, shards, args.batch_size)) for shards in args.shards]
+    for name, (insert_seconds, pop_seconds) in results:
+        print(f"{name:<16} {args.inserts / insert_seconds:>12,.0f} {args.inserts / pop_seconds:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
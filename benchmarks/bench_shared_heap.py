@@ -0,0 +1,78 @@
+"""
+Compare popping from a `SharedMinHeap` in several processes with a `multiprocessing.Queue`.
+
+`--values` random floats are loaded up front, then `--consumers` processes drain them:
+- SharedMinHeap: each consumer pops from the shared heap in priority order.
+- multiprocessing.Queue: each consumer gets pickled values in FIFO order, with no priority
+  ordering, until it receives a sentinel.
+
+The reported time covers starting the consumers until every consumer has finished.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_shared_heap.py --values 200000 --consumers 1 2 4 8
+"""
+import argparse
+import multiprocessing
+import random
+import time
+
+from indexedheap import SharedMinHeap
+
+def drain_heap(heap, done):
+    popped = 0
+    pop = heap.pop
+    while True:
+        try:
+            pop()
+        except IndexError:
+            break
+        popped += 1
+    heap.close()
+    done.put(popped)
+
+def drain_queue(queue, done):
+    popped = 0
+    get = queue.get
+    while get() is not None:
+        popped += 1
+    done.put(popped)
+
+def timed_consumers(target, shared, consumers):
+    done = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=target, args=(shared, done)) for _ in range(consumers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    popped = sum(done.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return popped, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--values", type=int, default=200_000)
+    parser.add_argument("--consumers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = [rng.random() for _ in range(args.values)]
+
+    print(f"{'queue':<22} {'consumers':>9} {'seconds':>9} {'pops/s':>12}")
+    for consumers in args.consumers:
+        with SharedMinHeap(args.values) as heap:
+            heap.insert_many(data)
+            popped, elapsed = timed_consumers(drain_heap, heap, consumers)
+        print(f"{'SharedMinHeap':<22} {consumers:>9} {elapsed:>9.3f} {popped / elapsed:>12,.0f}")
+
+        queue = multiprocessing.Queue()
+        for value in data:
+            queue.put(value)
+        for _ in range(consumers):
+            queue.put(None)
+        popped, elapsed = timed_consumers(drain_queue, queue, consumers)
+        print(f"{'multiprocessing.Queue':<22} {consumers:>9} {elapsed:>9.3f} {popped / elapsed:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare `SlidingQuantile` with recomputing the quantile of each window.
+
+Both compute the `--q` quantile of the last `--window` samples after each of `--samples`
+random samples:
+- `SlidingQuantile` adds the new sample and removes the expiring one in O(log(N)).
+- sort-per-window sorts a copy of the window for every sample, in O(N * log(N)).
+- insort keeps a sorted list, with `bisect.insort` and a binary-search delete, in O(N).
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_sliding_quantile.py --samples 20000 --window 1000 2000 10000
+"""
+import argparse
+import bisect
+import random
+import time
+from collections import deque
+
+from indexedheap import SlidingQuantile
+
+def run_heaps(samples, window, q):
+    return SlidingQuantile(window, q).process(samples)
+
+def run_sort(samples, window, q):
+    result = []
+    current = deque()
+    for sample in samples:
+        current.append(sample)
+        if len(current) > window:
+            current.popleft()
+        result.append(sorted(current)[int(q * (len(current) - 1))])
+    return result
+
+def run_insort(samples, window, q):
+    result = []
+    current = deque()
+    ordered = []
+    for sample in samples:
+        current.append(sample)
+        bisect.insort(ordered, sample)
+        if len(current) > window:
+            del ordered[bisect.bisect_left(ordered, current.popleft())]
+        result.append(ordered[int(q * (len(ordered) - 1))])
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=20_000)
+    parser.add_argument("--window", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--q", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    samples = [rng.expovariate(1.0) for _ in range(args.samples)]
+
+    print(f"{'window':>8} {'method':<16} {'seconds':>9}")
+    for window in args.window:
+        expected = None
+        for name, runner in (("SlidingQuantile", run_heaps), ("sort-per-window", run_sort), ("insort", run_insort)):
+            start = time.perf_counter()
+            result = runner(samples, window, args.q)
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                expected = result
+            elif result != expected:
+                raise AssertionError(f"{name} disagrees with SlidingQuantile")
+            print(f"{window:>8} {name:<16} {elapsed:>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Compare the list-backed and array-backed slot storage of `MinHeap`.
+
+For each storage layout this reports the memory used per unique entry (measured with
+`tracemalloc` while building the heap) and the throughput of `insert` and `pop`. The
+`HeapItem` row is a baseline reproducing the earlier layout, a list of one object per
+entry swapped by the sift loops, so the slot layouts can be compared against it.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_storage.py --size 1000000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from indexedheap import MinHeap
+
+class HeapItem:
+    def __init__(self, item, frequency = 1, priority = None):
+        self.value = item
+        self.frequency = frequency
+        self.priority = item if priority is None else priority
+
+    def __lt__(self, other):
+        return self.priority < other.priority
+
+class HeapItemMinHeap:
+    """
+    Baseline min-heap storing one `HeapItem` per entry, with swap-based sifts that update
+    the index for both swapped items on every level.
+    """
+
+    def __init__(self, arr = None):
+        self.heap = []
+        self.value_to_index = {}
+        self.size = 0
+        for value in arr or []:
+            self.insert(value)
+
+    def insert(self, value, *, count = 1):
+        self.size += count
+        idx = self.value_to_index.get(value)
+        if idx is not None:
+            self.heap[idx].frequency += count
+            return
+        heap, value_to_index = self.heap, self.value_to_index
+        heap.append(HeapItem(value, count))
+        idx = len(heap) - 1
+        value_to_index[value] = idx
+        while idx > 0:
+            parent_idx = (idx - 1) // 2
+            item, parent = heap[idx], heap[parent_idx]
+            if not item < parent:
+                break
+            heap[idx], heap[parent_idx] = parent, item
+            value_to_index[item.value] = parent_idx
+            value_to_index[parent.value] = idx
+            idx = parent_idx
+
+    def pop(self):
+        heap, value_to_index = self.heap, self.value_to_index
+        self.size -= 1
+        root = heap[0]
+        if root.frequency > 1:
+            root.frequency -= 1
+            return root.value
+        last = heap.pop()
+        del value_to_index[root.value]
+        if heap:
+            heap[0] = last
+            value_to_index[last.value] = 0
+            n, idx = len(heap), 0
+            while True:
+                child_idx = 2 * idx + 1
+                if child_idx >= n:
+                    break
+                if child_idx + 1 < n and heap[child_idx + 1] < heap[child_idx]:
+                    child_idx += 1
+                item, child = heap[idx], heap[child_idx]
+                if not child < item:
+                    break
+                heap[idx], heap[child_idx] = child, item
+                value_to_index[child.value] = idx
+                value_to_index[item.value] = child_idx
+                idx = child_idx
+        return root.value
+
+    def __bool__(self):
+        return self.size > 0
+
+LAYOUTS = [("HeapItem", None), ("list", None), ("array('q')", "q"), ("array('d')", "d")]
+
+def make_heap(name, typecode, values = None):
+    if name == "HeapItem":
+        return HeapItemMinHeap(values)
+    return MinHeap(values, typecode=typecode)
+
+def measure_memory(values, name, typecode):
+    """
+    Return the number of bytes allocated per entry while building a heap from `values`.
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    heap = make_heap(name, typecode, values)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del heap
+    return (after - before) / len(values)
+
+def measure_throughput(values, name, typecode):
+    """
+    Return `(insert_ops_per_sec, pop_ops_per_sec)` for inserting then popping every value.
+    """
+    heap = make_heap(name, typecode)
+    start = time.perf_counter()
+    for value in values:
+        heap.insert(value)
+    insert_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    while heap:
+        heap.pop()
+    pop_elapsed = time.perf_counter() - start
+    return (len(values) / insert_elapsed, len(values) / pop_elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000, help="number of unique entries")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    values = list(range(args.size))
+    random.Random(args.seed).shuffle(values)
+
+    print(f"{'layout':<12} {'bytes/entry':>12} {'insert ops/s':>14} {'pop ops/s':>14}")
+    for name, typecode in LAYOUTS:
+        bytes_per_entry = measure_memory(values, name, typecode)
+        insert_rate, pop_rate = measure_throughput(values, name, typecode)
+        print(f"{name:<12} {bytes_per_entry:>12.1f} {insert_rate:>14,.0f} {pop_rate:>14,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measure the throughput gained by declaring a `value_type` instead of validating every value.
+
+For int, float, str and tuple workloads this reports `insert` and `pop` ops/sec for a
+`MinHeap` with full per-value validation and for one created with `value_type=...`.
+
+Run with the package importable, e.g. after `pip install -e .`:
+
+    python benchmarks/bench_validation.py --size 200000
+"""
+import argparse
+import random
+import time
+
+from indexedheap import MinHeap
+
+def make_workloads(size, seed):
+    """
+    Return a list of `(name, value_type, values)` workloads of `size` unique values each.
+    """
+    rng = random.Random(seed)
+    ints = rng.sample(range(size * 10), size)
+    return [
+        ("int", int, ints),
+        ("float", float, [value / 7 for value in ints]),
+        ("str", str, [f"key-{value:010d}" for value in ints]),
+        ("tuple", tuple, [(value % 97, value) for value in ints]),
+    ]
+
+def measure(values, value_type):
+    """
+    Return `(insert_ops_per_sec, pop_ops_per_sec)` for inserting then popping every value.
+    """
+    heap = MinHeap(value_type=value_type)
+    start = time.perf_counter()
+    for value in values:
+        heap.insert(value)
+    insert_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    while heap:
+        heap.pop()
+    pop_elapsed = time.perf_counter() - start
+    return (len(values) / insert_elapsed, len(values) / pop_elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000, help="number of unique values per workload")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'workload':<10} {'mode':<12} {'insert ops/s':>14} {'pop ops/s':>14}")
+    for name, value_type, values in make_workloads(args.size, args.seed):
+        for mode, declared_type in (("validated", None), ("value_type", value_type)):
+            insert_rate, pop_rate = measure(values, declared_type)
+            print(f"{name:<10} {mode:<12} {insert_rate:>14,.0f} {pop_rate:>14,.0f}")
+
+if __name__ == "__main__":
+    main()
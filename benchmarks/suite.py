@@ -0,0 +1,269 @@
+"""
+Benchmark suite timing the common heap workloads for `MinHeap` and `MaxHeap` against `heapq`
+and `sortedcontainers.SortedList` baselines, with JSON output for tracking results over time.
+
+Workloads, each run on `--sizes` random floats:
+- build: construct a heap from a list.
+- insert: insert every value one at a time into an empty heap.
+- pop: pop every value from a built heap.
+- remove: remove a random half of the values from a built heap, then pop the rest.
+  `heapq` cannot remove entries, so it records removed values in a tombstone counter
+  and skips them while popping.
+- duplicates: insert values drawn from `size // 100` distinct values, then pop them all,
+  exercising the frequency counter.
+- sorted_iteration: iterate over a built heap in sorted order.
+
+`SortedList` is only included if `sortedcontainers` is installed.
+
+Run from the repository root with the package importable, e.g. after `pip install -e .`:
+
+    python -m benchmarks --sizes 1000 100000 10000000 --output results.json
+    python -m benchmarks --compare results.json
+"""
+import argparse
+import heapq
+import json
+import platform
+import random
+import sys
+import time
+from collections import Counter
+
+from indexedheap import MaxHeap, MinHeap
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+class IndexedHeapAdapter:
+    """
+    Runs the workloads on a `MinHeap` or `MaxHeap`.
+    """
+
+    def __init__(self, heap_class):
+        self.heap_class = heap_class
+        self.name = heap_class.__name__
+
+    def build(self, values):
+        return self.heap_class(values)
+
+    def insert(self, values):
+        heap = self.heap_class()
+        insert = heap.insert
+        for value in values:
+            insert(value)
+        return heap
+
+    def pop_all(self, heap):
+        pop = heap.pop
+        while heap:
+            pop()
+
+    def remove_then_pop(self, heap, removed):
+        remove = heap.remove
+        for value in removed:
+            remove(value)
+        self.pop_all(heap)
+
+    def iterate(self, heap):
+        for _ in heap:
+            pass
+
+class HeapqAdapter:
+    """
+    Runs the workloads on a plain list with `heapq`.
+    """
+    name = "heapq"
+
+    def build(self, values):
+        heap = list(values)
+        heapq.heapify(heap)
+        return heap
+
+    def insert(self, values):
+        heap = []
+        push = heapq.heappush
+        for value in values:
+            push(heap, value)
+        return heap
+
+    def pop_all(self, heap):
+        pop = heapq.heappop
+        while heap:
+            pop(heap)
+
+    def remove_then_pop(self, heap, removed):
+        tombstones = Counter(removed)
+        pop = heapq.heappop
+        while heap:
+            value = pop(heap)
+            if tombstones[value]:
+                tombstones[value] -= 1
+
+    def iterate(self, heap):
+        for _ in sorted(heap):
+            pass
+
+class SortedListAdapter:
+    """
+    Runs the workloads on a `sortedcontainers.SortedList`.
+    """
+    name = "SortedList"
+
+    def build(self, values):
+        return SortedList(values)
+
+    def insert(self, values):
+        sorted_list = SortedList()
+        add = sorted_list.add
+        for value in values:
+            add(value)
+        return sorted_list
+
+    def pop_all(self, sorted_list):
+        pop = sorted_list.pop
+        while sorted_list:
+            pop(0)
+
+    def remove_then_pop(self, sorted_list, removed):
+        remove = sorted_list.remove
+        for value in removed:
+            remove(value)
+        self.pop_all(sorted_list)
+
+    def iterate(self, sorted_list):
+        for _ in sorted_list:
+            pass
+
+def adapters():
+    """
+    Return the adapters for every available implementation.
+    """
+    result = [IndexedHeapAdapter(MinHeap), IndexedHeapAdapter(MaxHeap), HeapqAdapter()]
+    if SortedList is not None:
+        result.append(SortedListAdapter())
+    return result
+
+def timed(function, *args):
+    """
+    Return the number of seconds `function(*args)` took.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+def run_workload(workload, adapter, size, rng):
+    """
+    Run one workload once and return `(seconds, operations)`.
+    """
+    values = [rng.random() for _ in range(size)]
+    if workload == "build":
+        return timed(adapter.build, values), size
+    if workload == "insert":
+        return timed(adapter.insert, values), size
+    if workload == "pop":
+        return timed(adapter.pop_all, adapter.build(values)), size
+    if workload == "remove":
+        removed = rng.sample(values, size // 2)
+        return timed(adapter.remove_then_pop, adapter.build(values), removed), size
+    if workload == "duplicates":
+        distinct = max(1, size // 100)
+        values = [rng.randrange(distinct) for _ in range(size)]
+        return timed(lambda: adapter.pop_all(adapter.insert(values))), 2 * size
+    if workload == "sorted_iteration":
+        return timed(adapter.iterate, adapter.build(values)), size
+    raise ValueError(f"Unknown workload {workload!r}")
+
+WORKLOADS = ["build", "insert", "pop", "remove", "duplicates", "sorted_iteration"]
+
+def package_version():
+    """
+    Return the installed version of `indexedheap`, or None if it is unknown.
+    """
+    try:
+        from importlib.metadata import version
+        return version("indexedheap")
+    except Exception:
+        return None
+
+def run_suite(sizes, workloads, implementations, repeat, seed):
+    """
+    Run every workload for every implementation and size, keeping the fastest of `repeat` runs.
+
+    Returns:
+    dict
+        `metadata` about the environment and a list of `results`.
+
+    """
+    results = []
+    for size in sizes:
+        for workload in workloads:
+            for adapter in adapters():
+                if implementations and adapter.name not in implementations:
+                    continue
+                best = None
+                for attempt in range(repeat):
+                    seconds, operations = run_workload(workload, adapter, size, random.Random(seed + attempt))
+                    best = seconds if best is None else min(best, seconds)
+                results.append({
+                    "workload": workload,
+                    "implementation": adapter.name,
+                    "size": size,
+                    "seconds": best,
+                    "ops_per_sec": operations / best if best else None,
+                })
+                print(f"{workload:<17} {adapter.name:<11} {size:>10} {best:>10.4f}s", file=sys.stderr)
+    return {
+        "metadata": {
+            "indexedheap": package_version(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+def compare(report, baseline):
+    """
+    Print the change in time of each result against the matching result in `baseline`.
+    """
+    previous = {(entry["workload"], entry["implementation"], entry["size"]): entry["seconds"] for entry in baseline["results"]}
+    print(f"{'workload':<17} {'implementation':<14} {'size':>10} {'before':>10} {'after':>10} {'change':>8}")
+    for entry in report["results"]:
+        before = previous.get((entry["workload"], entry["implementation"], entry["size"]))
+        if before is None:
+            continue
+        change = (entry["seconds"] - before) / before * 100
+        print(f"{entry['workload']:<17} {entry['implementation']:<14} {entry['size']:>10} "
+              f"{before:>10.4f} {entry['seconds']:>10.4f} {change:>+7.1f}%")
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=WORKLOADS)
+    parser.add_argument("--implementations", nargs="+", help="subset of MinHeap, MaxHeap, heapq, SortedList")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", help="a previous JSON report to compare the results against")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.workloads, args.implementations, args.repeat, args.seed)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(report, json.load(file))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
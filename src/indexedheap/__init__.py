@@ -1,2 +1,17 @@
 from .indexed_heap import MinHeap, MaxHeap
-__all__ = ["MinHeap", "MaxHeap"]
\ No newline at end of file
+from .pairing_heap import PairingMinHeap, PairingMaxHeap
+from .min_max_heap import IndexedMinMaxHeap
+from .bounded_heap import BoundedHeap
+from .frequency_heap import FrequencyHeap, SpaceSavingHeap
+from .order_statistic import OrderStatisticHeap
+from .sliding_quantile import SlidingQuantile
+from .persistence import HeapSnapshot
+from .external_heap import ExternalHeap
+from .instrumented import InstrumentedMinHeap, InstrumentedMaxHeap
+from .sharded_heap import ShardedHeap
+from .shared_heap import SharedMinHeap, SharedMaxHeap
+from .factory import create_heap
+from .concurrent_heap import ConcurrentMinHeap, ConcurrentMaxHeap
+from .async_queue import AsyncIndexedPriorityQueue
+from .scheduler import DeadlineScheduler
+__all__ = ["MinHeap", "MaxHeap", "PairingMinHeap", "PairingMaxHeap", "IndexedMinMaxHeap", "BoundedHeap", "FrequencyHeap", "SpaceSavingHeap", "OrderStatisticHeap", "SlidingQuantile", "HeapSnapshot", "ExternalHeap", "InstrumentedMinHeap", "InstrumentedMaxHeap", "ShardedHeap", "SharedMinHeap", "SharedMaxHeap", "create_heap", "ConcurrentMinHeap", "ConcurrentMaxHeap", "AsyncIndexedPriorityQueue", "DeadlineScheduler"]
\ No newline at end of file
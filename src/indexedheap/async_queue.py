@@ -0,0 +1,247 @@
+import asyncio
+from collections import deque
+from .indexed_heap import MinHeap
+
+class AsyncIndexedPriorityQueue:
+    """
+    asyncio priority queue backed by an `IndexedHeap`.
+
+    Behaves like `asyncio.PriorityQueue` (`await put`, `await get`, `maxsize` back-pressure,
+    `put_nowait`/`get_nowait` raising `asyncio.QueueFull`/`asyncio.QueueEmpty`), but values are
+    indexed: a queued value can be removed or reprioritised in O(log(N)) through the heap's
+    `value_to_index` mapping, so cancelled requests are pulled out of the queue instead of
+    being left behind as tombstones.
+
+    Values may be queued with a separate `priority`, in which case they only need to be hashable.
+    By default the smallest priority is returned first; pass `heap_class=MaxHeap` to reverse this.
+
+    Not thread-safe: like `asyncio.Queue`, it must only be used from the event loop's thread.
+
+    """
+
+    def __init__(self, maxsize = 0, *, heap_class = MinHeap, **heap_options):
+        """
+        Initialize an empty queue.
+
+        Parameters:
+        maxsize : int, optional
+            Upper bound on the number of values (including duplicates) in the queue.
+            Defaults to 0, meaning unbounded.
+        heap_class : type, optional
+            The heap class used for storage. Defaults to `MinHeap`.
+        **heap_options
+            Passed to `heap_class`, e.g. `arity` or `value_type`.
+
+        Raises:
+        ValueError
+            If `maxsize` is negative.
+
+        """
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError("maxsize must be a non-negative integer")
+        self._maxsize = maxsize
+        self.heap = heap_class(**heap_options)
+        self._getters = deque()
+        self._putters = deque()
+
+    @property
+    def maxsize(self):
+        """
+        Number of values allowed in the queue, or 0 if unbounded.
+        """
+        return self._maxsize
+
+    def qsize(self):
+        """
+        Return the number of values in the queue, including duplicates.
+        """
+        return len(self.heap)
+
+    def empty(self):
+        """
+        Return True if the queue is empty.
+        """
+        return not self.heap
+
+    def full(self):
+        """
+        Return True if the queue holds `maxsize` values. Always False when unbounded.
+        """
+        return 0 < self._maxsize <= len(self.heap)
+
+    def _has_room(self, count):
+        """
+        Return True if `count` more values fit within `maxsize`.
+        """
+        return not self._maxsize or len(self.heap) + count <= self._maxsize
+
+    def _wakeup_next(self, waiters, room = 1):
+        """
+        Wake, in order, the waiters that have not been cancelled and whose counts fit in
+        `room`, until it is used up.
+
+        A waiter whose count does not fit keeps its place, so a large put that still cannot
+        proceed does not hold up smaller ones queued behind it.
+        """
+        skipped = []
+        while waiters and room > 0:
+            entry = waiters.popleft()
+            waiter, count = entry
+            if waiter.done():
+                continue
+            if count <= room:
+                waiter.set_result(None)
+                room -= count
+            else:
+                skipped.append(entry)
+        waiters.extendleft(reversed(skipped))
+
+    async def _wait(self, waiters, ready, count = 1):
+        """
+        Wait in `waiters` for room for `count` values until `ready()` holds, passing the
+        wakeup on if cancelled.
+        """
+        loop = asyncio.get_event_loop()
+        while not ready():
+            waiter = loop.create_future()
+            entry = (waiter, count)
+            waiters.append(entry)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    waiters.remove(entry)
+                except ValueError:
+                    pass
+                if ready() and not waiter.cancelled():
+                    self._wakeup_next(waiters, count)
+                raise
+
+    def _wakeup_putters(self):
+        """
+        Wake the waiting putters that fit in the room now free.
+        """
+        self._wakeup_next(self._putters, self._maxsize - len(self.heap))
+
+    async def put(self, value, *, count = 1, priority = None):
+        """
+        Put a value into the queue, waiting for room if the queue is full.
+
+        Parameters:
+        value : Any
+            The value to queue.
+        count : int, optional
+            Number of occurrences to add. Defaults to 1.
+        priority : Any, optional
+            The priority the value is ordered by. Defaults to the value itself.
+
+        Raises:
+        ValueError
+            If `count` exceeds `maxsize`.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        if self._maxsize and count > self._maxsize:
+            raise ValueError(f"Cannot put {count} values into queue with maxsize {self._maxsize}")
+        await self._wait(self._putters, lambda: self._has_room(count), count)
+        self.put_nowait(value, count = count, priority = priority)
+
+    def put_nowait(self, value, *, count = 1, priority = None):
+        """
+        Put a value into the queue without waiting.
+
+        Raises:
+        asyncio.QueueFull
+            If there is no room for `count` more values.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        if not self._has_room(count):
+            raise asyncio.QueueFull
+        self.heap.insert(value, count = count, priority = priority)
+        self._wakeup_next(self._getters, count)
+
+    async def get(self):
+        """
+        Remove and return the highest-priority value, waiting until one is available.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        await self._wait(self._getters, self.heap.__bool__)
+        return self.get_nowait()
+
+    def get_nowait(self):
+        """
+        Remove and return the highest-priority value without waiting.
+
+        Raises:
+        asyncio.QueueEmpty
+            If the queue is empty.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        if not self.heap:
+            raise asyncio.QueueEmpty
+        value = self.heap.pop()
+        self._wakeup_putters()
+        return value
+
+    def remove(self, value, *, count = 1, strict = True):
+        """
+        Remove occurrences of a queued value, e.g. when its request is cancelled.
+
+        Parameters and return value are as for `IndexedHeap.remove`.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        removed = self.heap.remove(value, count = count, strict = strict)
+        self._wakeup_putters()
+        return removed
+
+    def update_priority(self, value, priority):
+        """
+        Change the priority of a queued value, as `IndexedHeap.update_priority`.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        self.heap.update_priority(value, priority)
+
+    def priority(self, value):
+        """
+        Return the priority of a queued value, as `IndexedHeap.priority`.
+        """
+        return self.heap.priority(value)
+
+    def peek(self):
+        """
+        Return the highest-priority value without removing it, or None if the queue is empty.
+        """
+        return self.heap.peek()
+
+    def count(self, value):
+        """
+        Return the number of queued occurrences of a value.
+        """
+        return self.heap.count(value)
+
+    def __contains__(self, value):
+        return value in self.heap
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} maxsize={self._maxsize!r} qsize={self.qsize()}>"
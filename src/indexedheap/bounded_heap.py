@@ -0,0 +1,253 @@
+from operator import lt, gt, ne
+from .indexed_heap import IndexedHeap
+
+class BoundedHeap(IndexedHeap):
+    """
+    Indexed heap holding at most `capacity` values, evicting the worst one when full.
+
+    With `keep="largest"` the heap keeps the largest priorities seen so far, so its root is
+    the smallest kept value (the next to be evicted); with `keep="smallest"` the reverse.
+    This is the streaming top-K pattern in a single structure:
+
+    - While every kept value is its own priority, a candidate offered without a priority is
+      compared with the root first, and rejected in O(1) if it does not beat it, before it
+      is validated or looked up. Other candidates are validated as by `IndexedHeap.insert`
+      before the comparison.
+    - A new value that beats the root replaces it in a single sift down.
+    - A kept value offered with a new priority is reprioritised and its frequency raised, as
+      by `IndexedHeap.insert`, and the worst value is then evicted.
+    - Every insert reports the values it evicted.
+
+    `pop` removes the root, i.e. the worst kept value. `to_sorted_list` and iteration run
+    from the root, worst first.
+
+    Time Complexity Overview (N = number of unique items in the heap):
+    - push / insert: O(1) when rejected, otherwise O(log(N))
+    - pop: O(log(N))
+    - remove: O(log(N))
+    - update_priority: O(log(N))
+
+    """
+    # Overridden per instance for keep="smallest".
+    _comes_before = staticmethod(lt)
+    _descending = False
+    # Set once any value is given a priority of its own, which disables the early rejection.
+    _own_priorities = False
+
+    def __init__(self, capacity, arr = None, *, keep = "largest", **heap_options):
+        """
+        Initialize the bounded heap.
+
+        Parameters:
+        capacity : int
+            The maximum number of values (including duplicates) held by the heap.
+        arr : list, optional
+            Initial values. If there are more than `capacity`, only the best are kept.
+        keep : str, optional
+            `"largest"` (default) to keep the largest priorities, `"smallest"` to keep the smallest.
+        **heap_options
+            Passed to `IndexedHeap`, e.g. `arity` or `value_type`.
+
+        Raises:
+        ValueError
+            If `capacity` is not a positive integer or `keep` is not recognised.
+
+        Time Complexity:
+        O(N)
+
+        """
+        if not isinstance(capacity, int) or capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+        if keep == "largest":
+            self._comes_before, self._descending = lt, False
+        elif keep == "smallest":
+            self._comes_before, self._descending = gt, True
+        else:
+            raise ValueError(f"keep must be 'largest' or 'smallest', got {keep!r}")
+        self.capacity = capacity
+        self.keep = keep
+        super().__init__(arr, **heap_options)
+
+    def full(self):
+        """
+        Return True if the heap holds `capacity` values.
+        """
+        return self.size >= self.capacity
+
+    def push(self, value, *, priority = None):
+        """
+        Offer a value to the heap, evicting the worst kept value if the heap is full.
+
+        Parameters:
+        value : Any
+            The value to offer.
+        priority : Any, optional
+            The priority the value is ordered by. Defaults to the value itself.
+
+        Returns:
+        Any or None
+            The value evicted from the heap, `value` itself if it was rejected, or None if
+            the heap had room.
+
+        Raises:
+        TypeError
+            If the value (or priority) is not valid for the heap.
+
+        Time Complexity:
+        O(1) when rejected, otherwise O(log(N))
+
+        """
+        evicted = self._offer(value, priority)
+        return evicted[0] if evicted else None
+
+    def _offer(self, value, priority):
+        """
+        Offer one occurrence of a value.
+
+        Returns:
+        list
+            The evicted or rejected value, or an empty list if nothing was evicted.
+
+        """
+        if self.dead:
+            self._discard_dead_root()
+        full = self.size >= self.capacity
+        if full and priority is None and not self._own_priorities:
+            # The candidate would be ordered by the value itself, held or not.
+            try:
+                if not self._comes_before(self.priorities[0], value):
+                    return [value]
+            except TypeError:
+                pass # Let the validation below raise the usual error.
+        self._validate_value(value, priority)
+        if priority is not None:
+            self._own_priorities = True
+        if full:
+            idx = self.value_to_index.get(value)
+            if idx is None:
+                key = value if priority is None else priority
+                if not self._comes_before(self.priorities[0], key):
+                    return [value]
+                if self.frequencies[0] == 1:
+                    return [self._replace_root(value, key)]
+            elif priority is None and not self._comes_before(self.priorities[0], self.priorities[idx]):
+                # A value already held keeps its stored priority, as in `IndexedHeap.insert`.
+                return [value]
+        super().insert(value, priority = priority)
+        return self._evict_overflow()
+
+    def insert(self, value, *, count = 1, priority = None):
+        """
+        Offer `count` occurrences of a value, as by `push`.
+
+        Returns:
+        list
+            The evicted values, including any rejected occurrences of `value`.
+
+        Time Complexity:
+        O(count * log(N))
+
+        """
+        evicted = []
+        for _ in range(count):
+            evicted.extend(self._offer(value, priority))
+        return evicted
+
+    def insert_many(self, values):
+        """
+        Insert every value of an iterable, then evict the worst values beyond `capacity`.
+
+        Returns:
+        list
+            The evicted values, worst first.
+
+        Time Complexity:
+        O(K * log(N)), or O(N + K) when re-heapifying.
+
+        """
+        super().insert_many(values)
+        return self._evict_overflow()
+
+    def update(self, other):
+        """
+        Add the values of another heap or iterable, as `IndexedHeap.update`, then evict the
+        worst values beyond `capacity`.
+
+        Returns:
+        list
+            The evicted values, worst first.
+
+        Time Complexity:
+        O(N + M)
+
+        """
+        super().update(other)
+        if isinstance(other, IndexedHeap) and not self._own_priorities:
+            self._own_priorities = any(map(ne, other.values, other.priorities))
+        return self._evict_overflow()
+
+    @classmethod
+    def _from_slots(cls, values, frequencies, *, heapify, **heap_options):
+        """
+        Create a heap for the bulk constructors, then evict the worst values beyond `capacity`.
+        `capacity` must be given as a keyword, e.g. `BoundedHeap.from_counts(counts, capacity=10)`.
+
+        Time Complexity:
+        O(N + E * log(N)) for E evicted values.
+
+        """
+        heap = super()._from_slots(values, frequencies, heapify = heapify, **heap_options)
+        heap._evict_overflow()
+        return heap
+
+    def _set_priority(self, idx, priority):
+        """
+        Reprioritise a slot as `IndexedHeap._set_priority`, noting that a value now has a
+        priority of its own.
+        """
+        self._own_priorities = True
+        return super()._set_priority(idx, priority)
+
+    def _swap_root(self, value, key):
+        """
+        Swap a new value in at the root as `IndexedHeap._swap_root`, noting whether it was
+        given a priority of its own.
+        """
+        if key is not value:
+            self._own_priorities = True
+        return super()._swap_root(value, key)
+
+    def _evict_overflow(self):
+        """
+        Pop values until the heap holds at most `capacity`, returning them.
+        """
+        evicted = []
+        while self.size > self.capacity:
+            evicted.append(self.pop())
+        return evicted
+
+    def _is_comparable(self, a, b):
+        """
+        Check if two values can be compared using the heap's ordering operator.
+
+        Returns:
+        tuple
+            (is_comparable, type(a), type(b))
+
+        Time Complexity:
+        O(1)
+
+        """
+        comes_before = self._comes_before
+        try:
+            comes_before(a, b)
+            comes_before(b, a)
+            return (True, type(a), type(b))
+        except TypeError:
+            return (False, type(a), type(b))
+
+    def _is_class(self, other):
+        """
+        Check if another object is a BoundedHeap keeping the same end.
+        """
+        return isinstance(other, BoundedHeap) and other.keep == self.keep
@@ -0,0 +1,390 @@
+import threading
+from queue import Empty, Full
+from time import monotonic
+from .indexed_heap import MinHeap, MaxHeap
+
+class ConcurrentIndexedHeap:
+    """
+    Thread-safe wrapper around an `IndexedHeap`, usable as an indexed priority job queue.
+
+    Every operation on the wrapped heap runs under a single mutex, so the multi-step updates of
+    `values`, `value_to_index` and `size` are never observed half done. Two conditions on that
+    mutex let consumers block in `pop` until a value arrives, and producers block in `insert`
+    until there is room when a `maxsize` is set. Bulk operations acquire the mutex once per batch.
+
+    The API mirrors `IndexedHeap`, with `queue.Queue` style `put`/`get`, `put_nowait` and
+    `get_nowait` aliases. Blocking calls raise `queue.Empty` or `queue.Full` on timeout.
+
+    Use `ConcurrentMinHeap` or `ConcurrentMaxHeap`.
+
+    """
+    _heap_class = None
+
+    def __init__(self, arr = None, *, maxsize = 0, **heap_options):
+        """
+        Initialize the concurrent heap.
+
+        Parameters:
+        arr : list, optional
+            Initial values to populate the heap.
+        maxsize : int, optional
+            Upper bound on the number of values (including duplicates) in the heap.
+            Defaults to 0, meaning unbounded.
+        **heap_options
+            Passed to the wrapped heap class, e.g. `arity` or `value_type`.
+
+        Raises:
+        ValueError
+            If `maxsize` is negative, or `arr` holds more than `maxsize` values.
+
+        Time Complexity:
+        O(N)
+
+        """
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError("maxsize must be a non-negative integer")
+        self.maxsize = maxsize
+        self.heap = self._heap_class(arr, **heap_options)
+        if maxsize and len(self.heap) > maxsize:
+            raise ValueError(f"arr holds {len(self.heap)} values, more than maxsize ({maxsize})")
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+
+    def _wait(self, condition, predicate, block, timeout, exception):
+        """
+        Wait on `condition` until `predicate()` holds. Must be called with the mutex held.
+
+        Parameters:
+        condition : threading.Condition
+            The condition to wait on.
+        predicate : callable
+            Returns True once the caller may proceed.
+        block : bool
+            If False, raise immediately instead of waiting.
+        timeout : float or None
+            Maximum number of seconds to wait. None waits indefinitely.
+        exception : type
+            `queue.Empty` or `queue.Full`, raised if the predicate does not hold in time.
+
+        """
+        if predicate():
+            return
+        if not block:
+            raise exception
+        if timeout is None:
+            while not predicate():
+                condition.wait()
+            return
+        if timeout < 0:
+            raise ValueError("timeout must be a non-negative number")
+        deadline = monotonic() + timeout
+        while not predicate():
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                raise exception
+            condition.wait(remaining)
+
+    def _notify_producers(self):
+        """
+        Wake every producer waiting for room. Producers wait for different counts, so waking
+        only some of them could pick one that still does not fit over one that would.
+        """
+        self.not_full.notify_all()
+
+    def _has_room(self, count):
+        """
+        Return a predicate that holds once `count` more values fit within `maxsize`.
+        """
+        if not self.maxsize:
+            return lambda: True
+        if count > self.maxsize:
+            raise ValueError(f"Cannot insert {count} values into heap with maxsize {self.maxsize}")
+        return lambda: len(self.heap) + count <= self.maxsize
+
+    def insert(self, value, *, count = 1, priority = None, block = True, timeout = None):
+        """
+        Insert a value into the heap and wake one waiting consumer.
+
+        Parameters:
+        value : Any
+            The value to insert.
+        count : int, optional
+            Number of occurrences to add. Defaults to 1.
+        priority : Any, optional
+            The priority the value is ordered by. Defaults to the value itself.
+        block : bool, default True
+            If the heap is full, wait for room instead of raising `queue.Full`.
+        timeout : float, optional
+            Maximum number of seconds to wait for room.
+
+        Raises:
+        queue.Full
+            If the heap is full and no room became available in time.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        with self.not_full:
+            self._wait(self.not_full, self._has_room(count), block, timeout, Full)
+            self.heap.insert(value, count = count, priority = priority)
+            self.not_empty.notify(count)
+
+    def put(self, value, block = True, timeout = None, *, count = 1, priority = None):
+        """
+        Alias of `insert` with the `queue.Queue.put` signature.
+        """
+        self.insert(value, count = count, priority = priority, block = block, timeout = timeout)
+
+    def put_nowait(self, value, *, count = 1, priority = None):
+        """
+        Insert a value without blocking, raising `queue.Full` if there is no room.
+        """
+        self.insert(value, count = count, priority = priority, block = False)
+
+    def insert_many(self, values, *, block = True, timeout = None):
+        """
+        Insert every value of an iterable under a single acquisition of the mutex.
+
+        Parameters:
+        values : iterable
+            The values to insert.
+        block : bool, default True
+            If the batch does not fit, wait for room instead of raising `queue.Full`.
+        timeout : float, optional
+            Maximum number of seconds to wait for room.
+
+        Raises:
+        queue.Full
+            If the batch did not fit in time.
+        ValueError
+            If the batch is larger than `maxsize`.
+
+        Time Complexity:
+        O(K * log(N)), or O(N + K) when re-heapifying.
+
+        """
+        batch = list(values)
+        with self.not_full:
+            self._wait(self.not_full, self._has_room(len(batch)), block, timeout, Full)
+            self.heap.insert_many(batch)
+            self.not_empty.notify(len(batch))
+
+    def pop(self, block = True, timeout = None):
+        """
+        Remove and return the root value, waiting for one to arrive if the heap is empty.
+
+        Parameters:
+        block : bool, default True
+            If the heap is empty, wait instead of raising `queue.Empty`.
+        timeout : float, optional
+            Maximum number of seconds to wait.
+
+        Returns:
+        Any
+            The smallest (ConcurrentMinHeap) or largest (ConcurrentMaxHeap) value.
+
+        Raises:
+        queue.Empty
+            If no value became available in time.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        with self.not_empty:
+            self._wait(self.not_empty, self.heap.__bool__, block, timeout, Empty)
+            value = self.heap.pop()
+            self._notify_producers()
+            return value
+
+    get = pop
+
+    def get_nowait(self):
+        """
+        Remove and return the root value without blocking, raising `queue.Empty` if there is none.
+        """
+        return self.pop(block = False)
+
+    def pop_many(self, k, *, block = True, timeout = None):
+        """
+        Wait until the heap is non-empty, then remove and return up to `k` values at once.
+
+        Parameters:
+        k : int
+            The maximum number of values to pop. Must be at least 1.
+        block : bool, default True
+            If the heap is empty, wait instead of raising `queue.Empty`.
+        timeout : float, optional
+            Maximum number of seconds to wait.
+
+        Returns:
+        list
+            Between 1 and `k` values in heap order.
+
+        Raises:
+        ValueError
+            If `k` is not a positive integer.
+        queue.Empty
+            If no value became available in time.
+
+        Time Complexity:
+        O(K * log(N))
+
+        """
+        if not isinstance(k, int) or k < 1:
+            raise ValueError("k must be a positive integer")
+        with self.not_empty:
+            self._wait(self.not_empty, self.heap.__bool__, block, timeout, Empty)
+            values = self.heap.pop_many(k, strict = False)
+            self._notify_producers()
+            return values
+
+    def pushpop(self, value, *, priority = None):
+        """
+        Insert a value and then pop the root, as `IndexedHeap.pushpop`, under a single lock.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        with self.mutex:
+            return self.heap.pushpop(value, priority = priority)
+
+    def replace(self, value, *, priority = None):
+        """
+        Pop the root and then insert a value, as `IndexedHeap.replace`, under a single lock.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        with self.mutex:
+            return self.heap.replace(value, priority = priority)
+
+    def remove(self, value, *, count = 1, strict = True):
+        """
+        Remove occurrences of a value, as `IndexedHeap.remove`, and wake waiting producers.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        with self.mutex:
+            size_before = len(self.heap)
+            removed = self.heap.remove(value, count = count, strict = strict)
+            if len(self.heap) < size_before:
+                self._notify_producers()
+            return removed
+
+    def remove_many(self, values, *, strict = True):
+        """
+        Remove one occurrence of every value of an iterable under a single acquisition of the mutex.
+
+        Time Complexity:
+        O(K * log(N)), or O(N + K) when the heap is rebuilt.
+
+        """
+        batch = list(values)
+        with self.mutex:
+            removed = self.heap.remove_many(batch, strict = strict)
+            if removed:
+                self._notify_producers()
+            return removed
+
+    def update_priority(self, value, priority):
+        """
+        Change the priority of a value, as `IndexedHeap.update_priority`.
+        """
+        with self.mutex:
+            self.heap.update_priority(value, priority)
+
+    def decrease_key(self, value, priority):
+        """
+        Lower the priority of a value, as `IndexedHeap.decrease_key`.
+        """
+        with self.mutex:
+            self.heap.decrease_key(value, priority)
+
+    def increase_key(self, value, priority):
+        """
+        Raise the priority of a value, as `IndexedHeap.increase_key`.
+        """
+        with self.mutex:
+            self.heap.increase_key(value, priority)
+
+    def peek(self):
+        """
+        Return the root value without removing it, or None if the heap is empty.
+        """
+        with self.mutex:
+            return self.heap.peek()
+
+    def priority(self, value):
+        """
+        Return the priority of a value, as `IndexedHeap.priority`.
+        """
+        with self.mutex:
+            return self.heap.priority(value)
+
+    def count(self, value):
+        """
+        Return the frequency of a value in the heap.
+        """
+        with self.mutex:
+            return self.heap.count(value)
+
+    def to_sorted_list(self):
+        """
+        Return a sorted snapshot of all values in the heap.
+        """
+        with self.mutex:
+            return self.heap.to_sorted_list()
+
+    def __iter__(self):
+        """
+        Iterate over a sorted snapshot of the heap, so other threads may modify it meanwhile.
+        """
+        return iter(self.to_sorted_list())
+
+    def __contains__(self, value):
+        with self.mutex:
+            return value in self.heap
+
+    def __len__(self):
+        with self.mutex:
+            return len(self.heap)
+
+    def __bool__(self):
+        with self.mutex:
+            return bool(self.heap)
+
+    def empty(self):
+        """
+        Return True if the heap is empty. The answer may be stale by the time it is used.
+        """
+        return not self
+
+    def full(self):
+        """
+        Return True if the heap holds `maxsize` values. Always False when unbounded.
+        """
+        with self.mutex:
+            return 0 < self.maxsize <= len(self.heap)
+
+    def __str__(self):
+        with self.mutex:
+            return str(self.heap)
+
+class ConcurrentMinHeap(ConcurrentIndexedHeap):
+    """
+    Thread-safe `MinHeap`: `pop` returns the smallest value, blocking while the heap is empty.
+    """
+    _heap_class = MinHeap
+
+class ConcurrentMaxHeap(ConcurrentIndexedHeap):
+    """
+    Thread-safe `MaxHeap`: `pop` returns the largest value, blocking while the heap is empty.
+    """
+    _heap_class = MaxHeap
@@ -0,0 +1,462 @@
+import dbm
+import heapq
+import os
+import pickle
+import tempfile
+from .indexed_heap import MinHeap
+
+class _Run:
+    """
+    A sorted run of `(value, priority, frequency)` records spilled to a file, read back one
+    record at a time.
+    """
+    __slots__ = ("path", "file", "head")
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.head = None
+        self.advance()
+
+    def advance(self):
+        """
+        Read the next record into `head`, or set it to None and delete the file at the end.
+        """
+        try:
+            self.head = list(pickle.load(self.file))
+        except EOFError:
+            self.head = None
+            self.close()
+
+    def records(self):
+        """
+        Yield the remaining records, starting with the head, then delete the file.
+        """
+        while self.head is not None:
+            yield tuple(self.head)
+            self.advance()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            os.remove(self.path)
+
+class ExternalHeap:
+    """
+    Heap for more values than fit in memory, holding the best values in an in-memory heap and
+    spilling the rest to sorted runs in temporary files.
+
+    Whenever the in-memory buffer grows beyond `buffer_size` unique values, it is sorted, the
+    better half is kept, and the worse half is written to a new run file. `pop` compares the
+    buffer's root with the head record of each run, kept in a small indexed heap of run ids, and
+    reads runs back lazily one record at a time. When there are more than `max_runs` runs, they
+    are merged into a single run to bound the number of open files.
+
+    Values in the buffer can be removed directly. Removing a value that has been spilled first
+    counts its remaining occurrences by reading the runs, then records a tombstone in an on-disk
+    `dbm` database, and the value is skipped when it is read back. Tombstones are matched by the
+    pickled form of the value, so removed values should pickle consistently (as ints, strings
+    and tuples of them do).
+
+    Unlike `IndexedHeap`, membership, `count` and reprioritising only see the buffer, and values
+    must be picklable.
+
+    Time Complexity Overview (B = buffer_size, R = number of runs):
+    - insert: O(log(B)) amortised, plus O(log(B)) per value written to disk when spilling
+    - pop: O(log(B) + log(R)), plus one record read from disk when taken from a run
+    - peek: O(1)
+    - remove: O(log(B)) for buffered values, otherwise a read of every spilled record and one `dbm` write
+    - remove_many: one read of every spilled record for the whole batch
+
+    """
+
+    def __init__(self, buffer_size = 1_000_000, *, heap_class = MinHeap, max_runs = 64, directory = None, **heap_options):
+        """
+        Initialize an empty external heap.
+
+        Parameters:
+        buffer_size : int, optional
+            The maximum number of unique values held in memory. Defaults to 1,000,000.
+        heap_class : type, optional
+            `MinHeap` (default) or `MaxHeap`, used for the buffer and to order runs.
+        max_runs : int, optional
+            The number of runs above which all runs are merged into one. Defaults to 64.
+        directory : str, optional
+            Where to create the temporary directory for runs and tombstones. Defaults to
+            the system temporary directory.
+        **heap_options
+            Passed to `heap_class` for the buffer, e.g. `arity` or `typecode`.
+
+        Raises:
+        ValueError
+            If `buffer_size` is not an integer of at least 2, or `max_runs` is not a
+            positive integer.
+
+        """
+        if not isinstance(buffer_size, int) or buffer_size < 2:
+            raise ValueError("buffer_size must be an integer of at least 2")
+        if not isinstance(max_runs, int) or max_runs < 1:
+            raise ValueError("max_runs must be a positive integer")
+        self.buffer_size = buffer_size
+        self.max_runs = max_runs
+        self.heap_class = heap_class
+        self.buffer = heap_class(**heap_options)
+        self.size = 0
+        self._directory = tempfile.TemporaryDirectory(prefix = "indexedheap-", dir = directory)
+        self._runs = {}
+        self._heads = heap_class()
+        self._next_run_id = 0
+        self._tombstones = None
+        self._tombstone_count = 0
+
+    def insert(self, value, *, count = 1, priority = None):
+        """
+        Insert a value, spilling part of the buffer to disk if it grows beyond `buffer_size`.
+
+        Parameters are as for `IndexedHeap.insert`. A value already in the buffer with a
+        given priority is reprioritised; spilled occurrences keep their priority.
+
+        Time Complexity:
+        O(log(B)) amortised
+
+        """
+        self.buffer.insert(value, count = count, priority = priority)
+        self.size += count
+        if len(self.buffer.values) > self.buffer_size:
+            self._spill()
+
+    def insert_many(self, values):
+        """
+        Insert every value of an iterable.
+
+        Time Complexity:
+        O(K * log(B)) amortised
+
+        """
+        for value in values:
+            self.insert(value)
+
+    def _spill(self):
+        """
+        Keep the better half of the buffer in memory and write the rest to a new sorted run.
+
+        Time Complexity:
+        O(B * log(B))
+
+        """
+        buffer = self.buffer
+        if buffer.dead:
+            buffer.compact()
+        values, priorities, frequencies = buffer.values, buffer.priorities, buffer.frequencies
+        order = sorted(range(len(values)), key = priorities.__getitem__, reverse = buffer._descending)
+        keep = order[:self.buffer_size // 2]
+        path = os.path.join(self._directory.name, f"run-{self._next_run_id}")
+        with open(path, "wb") as file:
+            for idx in order[len(keep):]:
+                pickle.dump((values[idx], priorities[idx], frequencies[idx]), file, protocol = pickle.HIGHEST_PROTOCOL)
+        spilled = sum(frequencies[idx] for idx in order[len(keep):])
+        buffer._assign_slots([values[idx] for idx in keep], [priorities[idx] for idx in keep], [frequencies[idx] for idx in keep])
+        buffer.size -= spilled
+        self._add_run(_Run(path))
+        if len(self._runs) > self.max_runs:
+            self._merge_runs()
+
+    def _add_run(self, run):
+        """
+        Register a run and index its head record by priority.
+        """
+        if run.head is None:
+            return
+        run_id = self._next_run_id
+        self._next_run_id += 1
+        self._runs[run_id] = run
+        self._heads.insert(run_id, priority = run.head[1])
+
+    def _merge_runs(self):
+        """
+        Merge every run into a single run.
+
+        Time Complexity:
+        O(M * log(R)) for M spilled records.
+
+        """
+        runs = [self._runs[run_id] for run_id in self._heads.values]
+        path = os.path.join(self._directory.name, f"run-{self._next_run_id}")
+        merged = heapq.merge(*(run.records() for run in runs), key = lambda record: record[1], reverse = self.buffer._descending)
+        with open(path, "wb") as file:
+            for record in merged:
+                pickle.dump(record, file, protocol = pickle.HIGHEST_PROTOCOL)
+        self._runs.clear()
+        self._heads = self.heap_class()
+        self._add_run(_Run(path))
+
+    def _skip_tombstones(self, run):
+        """
+        Advance a run past head records whose value has been removed.
+
+        Returns:
+        bool
+            True if the run's head changed.
+
+        """
+        skipped_any = False
+        while run.head is not None:
+            key = pickle.dumps(run.head[0], protocol = 4)
+            pending = int(self._tombstones.get(key, 0))
+            if not pending:
+                break
+            skipped = min(pending, run.head[2])
+            self._tombstone_count -= skipped
+            # Spent tombstones are zeroed rather than deleted: deleting rewrites the whole
+            # index of the `dbm.dumb` fallback.
+            self._tombstones[key] = str(pending - skipped)
+            run.head[2] -= skipped
+            skipped_any = True
+            if run.head[2]:
+                break
+            run.advance()
+        return skipped_any
+
+    def _update_head(self, run_id):
+        """
+        Re-index a run after its head record changed, dropping the run once it is exhausted.
+        """
+        run = self._runs[run_id]
+        if run.head is None:
+            del self._runs[run_id]
+            self._heads.remove(run_id)
+        else:
+            self._heads.update_priority(run_id, run.head[1])
+
+    def _best_run(self):
+        """
+        Return the id of the run whose head comes first, if it comes before the buffer's root.
+
+        Removed values are skipped here, once they reach the front of their run.
+        """
+        heads, buffer = self._heads, self.buffer
+        while heads and self._tombstone_count:
+            run_id = heads.values[0]
+            if not self._skip_tombstones(self._runs[run_id]):
+                break
+            self._update_head(run_id)
+        if not heads:
+            return None
+        if buffer and not buffer._comes_before(heads.priorities[0], buffer.priorities[0]):
+            return None
+        return heads.values[0]
+
+    def peek(self):
+        """
+        Return the root value without removing it, or None if the heap is empty.
+
+        Time Complexity:
+        O(1)
+
+        """
+        run_id = self._best_run()
+        if run_id is None:
+            return self.buffer.peek()
+        return self._runs[run_id].head[0]
+
+    def pop(self):
+        """
+        Remove and return the root value, reading the next record of a run if it came from disk.
+
+        Raises:
+        IndexError
+            If called on an empty heap.
+
+        Time Complexity:
+        O(log(B) + log(R))
+
+        """
+        run_id = self._best_run()
+        if run_id is None:
+            if not self.buffer:
+                raise IndexError("Pop from empty heap")
+            self.size -= 1
+            return self.buffer.pop()
+        run = self._runs[run_id]
+        value = run.head[0]
+        run.head[2] -= 1
+        if not run.head[2]:
+            run.advance()
+            self._update_head(run_id)
+        self.size -= 1
+        return value
+
+    def _spilled_counts(self, values):
+        """
+        Return the number of occurrences of each of `values` in the runs that are neither popped
+        nor tombstoned, reading every run's remaining records from disk once.
+
+        Returns:
+        dict
+            Maps each value to its number of spilled occurrences.
+
+        Time Complexity:
+        O(M + K) for M spilled records and K values.
+
+        """
+        totals = dict.fromkeys(values, 0)
+        for run in self._runs.values():
+            if run.head[0] in totals:
+                totals[run.head[0]] += run.head[2]
+            with open(run.path, "rb") as file:
+                file.seek(run.file.tell())
+                while True:
+                    try:
+                        value, _, frequency = pickle.load(file)
+                    except EOFError:
+                        break
+                    if value in totals:
+                        totals[value] += frequency
+        if self._tombstones is not None:
+            for value, total in totals.items():
+                if total:
+                    totals[value] = total - int(self._tombstones.get(pickle.dumps(value, protocol = 4), 0))
+        return totals
+
+    def _remove_occurrences(self, value, count, buffered):
+        """
+        Remove `count` occurrences of a value known to be in the heap, `buffered` of them from
+        the buffer and the rest by tombstone.
+        """
+        buffered = min(count, buffered)
+        if buffered:
+            self.buffer.remove(value, count = buffered)
+        spilled = count - buffered
+        if spilled:
+            if self._tombstones is None:
+                self._tombstones = dbm.open(os.path.join(self._directory.name, "tombstones"), "n")
+            key = pickle.dumps(value, protocol = 4)
+            self._tombstones[key] = str(int(self._tombstones.get(key, 0)) + spilled)
+            self._tombstone_count += spilled
+        self.size -= count
+
+    def remove(self, value, *, count = 1, strict = True):
+        """
+        Remove occurrences of a value, from the buffer where possible and otherwise by tombstone.
+
+        Occurrences not found in the buffer are counted in the runs on disk before anything is
+        removed, and are then skipped when read back. To remove many spilled values, use
+        `remove_many`, which reads the runs once for the whole batch.
+
+        Parameters:
+        value : Any
+            The value to remove.
+        count : int, optional
+            Number of occurrences to remove. Defaults to 1.
+        strict : bool, default True
+            If True, raise when the value is missing or `count` exceeds its frequency. If
+            False, remove as many occurrences as possible.
+
+        Returns:
+        bool
+            True if the value was present, False if it was not and `strict=False`.
+
+        Raises:
+        KeyError
+            If `strict=True` and the value is not in the heap.
+        ValueError
+            If `count` is not a positive integer, or exceeds the value's frequency with `strict=True`.
+
+        Time Complexity:
+        O(log(B)) for buffered values, otherwise O(M) to read the M spilled records and one `dbm` write.
+
+        """
+        if not isinstance(count, int) or count < 1:
+            raise ValueError("Count must be a positive integer")
+        buffered = self.buffer.count(value)
+        available = buffered
+        if count > buffered and self._runs:
+            available += self._spilled_counts((value,))[value]
+        if not available:
+            if strict:
+                raise KeyError(f"{value} not in heap")
+            return False
+        if count > available:
+            if strict:
+                raise ValueError(f"Count must be less than or equal to the value's frequency ({available})")
+            count = available
+        self._remove_occurrences(value, count, buffered)
+        return True
+
+    def remove_many(self, values, *, strict = True):
+        """
+        Remove one occurrence of every value of an iterable, reading the runs on disk at most once.
+
+        Parameters:
+        values : iterable
+            The values to remove. Repeated values remove that many occurrences.
+        strict : bool, default True
+            If True, raise before modifying the heap if any value is missing or would be
+            removed more times than its frequency. If False, remove as many occurrences as
+            possible and ignore missing values.
+
+        Returns:
+        int
+            The total number of occurrences removed.
+
+        Raises:
+        KeyError
+            If `strict=True` and a value is not in the heap.
+        ValueError
+            If `strict=True` and a value would be removed more times than its frequency.
+
+        Time Complexity:
+        O(K * log(B)), plus O(M) to read the M spilled records if any value is not buffered.
+
+        """
+        counts = {}
+        for value in values:
+            counts[value] = counts.get(value, 0) + 1
+        buffered = {value: self.buffer.count(value) for value in counts}
+        missing = [value for value, count in counts.items() if count > buffered[value]]
+        spilled = self._spilled_counts(missing) if missing and self._runs else {}
+        removals = []
+        for value, count in counts.items():
+            available = buffered[value] + spilled.get(value, 0)
+            if not available:
+                if strict:
+                    raise KeyError(f"{value} not in heap")
+                continue
+            if count > available:
+                if strict:
+                    raise ValueError(f"Cannot remove {count} occurrences of {value!r}; its frequency is {available}")
+                count = available
+            removals.append((value, count))
+        for value, count in removals:
+            self._remove_occurrences(value, count, buffered[value])
+        return sum(count for _, count in removals)
+
+    def run_count(self):
+        """
+        Return the number of runs currently spilled to disk.
+        """
+        return len(self._runs)
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.size > 0
+
+    def close(self):
+        """
+        Close and delete every run and the tombstone database. The heap must not be used afterwards.
+        """
+        for run in self._runs.values():
+            run.close()
+        self._runs.clear()
+        if self._tombstones is not None:
+            self._tombstones.close()
+            self._tombstones = None
+        self._directory.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,53 @@
+from .indexed_heap import MinHeap, MaxHeap
+from .pairing_heap import PairingMinHeap, PairingMaxHeap
+from .instrumented import InstrumentedMinHeap, InstrumentedMaxHeap
+
+HEAP_BACKENDS = {
+    ("array", "min"): MinHeap,
+    ("array", "max"): MaxHeap,
+    ("pairing", "min"): PairingMinHeap,
+    ("pairing", "max"): PairingMaxHeap,
+}
+
+INSTRUMENTED_HEAPS = {
+    MinHeap: InstrumentedMinHeap,
+    MaxHeap: InstrumentedMaxHeap,
+}
+
+def create_heap(arr = None, *, order = "min", backend = "array", instrumented = False, **options):
+    """
+    Create a heap with the requested ordering and storage backend.
+
+    Parameters:
+    arr : list, optional
+        Initial values to populate the heap.
+    order : str, optional
+        `"min"` (default) for the smallest priority at the root, `"max"` for the largest.
+    backend : str, optional
+        `"array"` (default) for the array-backed `MinHeap`/`MaxHeap`, or `"pairing"` for the
+        pairing-heap backend with O(1) insert, meld and amortised decrease-key.
+    instrumented : bool, optional
+        If True, return an `InstrumentedMinHeap`/`InstrumentedMaxHeap` recording operation
+        counters and latencies. Only supported by the array backend. Defaults to False.
+    **options
+        Passed to the heap class, e.g. `arity` for the array backend.
+
+    Returns:
+    MinHeap | MaxHeap | PairingMinHeap | PairingMaxHeap | InstrumentedMinHeap | InstrumentedMaxHeap
+
+    Raises:
+    ValueError
+        If `order` or `backend` is not recognised, or `instrumented` is set for a backend
+        other than `"array"`.
+
+    """
+    try:
+        heap_class = HEAP_BACKENDS[(backend, order)]
+    except KeyError:
+        backends = sorted({key[0] for key in HEAP_BACKENDS})
+        raise ValueError(f"Unknown heap backend/order {backend!r}/{order!r}; backends: {backends}, orders: ['max', 'min']")
+    if instrumented:
+        if heap_class not in INSTRUMENTED_HEAPS:
+            raise ValueError(f"Instrumentation is not supported by the {backend!r} backend")
+        heap_class = INSTRUMENTED_HEAPS[heap_class]
+    return heap_class(arr, **options)
\ No newline at end of file
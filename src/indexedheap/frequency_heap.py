@@ -0,0 +1,401 @@
+from .indexed_heap import MinHeap, MaxHeap
+
+def _validate_count(count):
+    """
+    Raise a ValueError unless `count` is a positive integer.
+    """
+    if not isinstance(count, int):
+        raise ValueError("The count must be an integer")
+    if count < 1:
+        raise ValueError("Count must be at least 1")
+
+class FrequencyHeap:
+    """
+    Counter of hashable keys kept in a `MaxHeap` ordered by count, for heavy-hitter queries.
+
+    Each key is stored once in the heap with its count as its priority, so `insert` increments
+    the count and sifts the key towards the root in O(log(N)), and `most_common(k)` walks the
+    top of the heap in O(K * log(K)) rather than sorting every key.
+
+    Every distinct key is kept. For unbounded streams of keys, use `SpaceSavingHeap`.
+
+    Time Complexity Overview (N = number of distinct keys):
+    - insert: O(log(N))
+    - remove: O(log(N))
+    - count: O(1)
+    - most_common(k): O(K * log(K))
+    - pop: O(log(N))
+
+    """
+
+    def __init__(self, arr = None):
+        """
+        Initialize the counter with an optional list of keys.
+
+        Parameters:
+        arr : list, optional
+            Keys to count. Repeated keys are counted once per occurrence.
+
+        Raises:
+        TypeError
+            If `arr` is not a list, or holds an unhashable key.
+
+        Time Complexity:
+        O(N * log(N))
+
+        """
+        if arr == None:
+            arr = []
+        if not isinstance(arr, list):
+            raise TypeError("arr must be a list")
+        self.heap = MaxHeap(priority_type = int)
+        self._total = 0
+        self.insert_many(arr)
+
+    def insert(self, value, *, count = 1):
+        """
+        Count `count` more occurrences of a key.
+
+        Parameters:
+        value : Any
+            The hashable key.
+        count : int, optional
+            Number of occurrences to add. Defaults to 1.
+
+        Raises:
+        ValueError
+            If `count` is not a positive integer.
+        TypeError
+            If `value` is not hashable.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        _validate_count(count)
+        heap = self.heap
+        idx = heap.value_to_index.get(value) if heap._is_hashable(value) else None
+        if idx is None:
+            heap.insert(value, priority = count)
+        else:
+            heap._set_priority(idx, heap.priorities[idx] + count)
+        self._total += count
+
+    def insert_many(self, values):
+        """
+        Count one occurrence of every key of an iterable.
+
+        Repeated keys in the batch are tallied first, so each distinct key is sifted once.
+
+        Time Complexity:
+        O(K + D * log(N)) for K keys of which D are distinct.
+
+        """
+        tally = {}
+        for value in values:
+            if not self.heap._is_hashable(value):
+                raise TypeError(f"Cannot insert value into heap: {value!r} is not hashable.")
+            tally[value] = tally.get(value, 0) + 1
+        for value, count in tally.items():
+            self.insert(value, count = count)
+
+    def remove(self, value, *, count = 1, strict = True):
+        """
+        Subtract occurrences of a key, dropping it once its count reaches 0.
+
+        Parameters:
+        value : Any
+            The key to decrement.
+        count : int, optional
+            Number of occurrences to remove. Defaults to 1.
+        strict : bool, default True
+            If True, raise when the key is missing or `count` exceeds its count. If False,
+            remove as many occurrences as possible.
+
+        Returns:
+        bool
+            True if the key was present, False if it was not and `strict=False`.
+
+        Raises:
+        KeyError
+            If `strict=True` and the key is not counted.
+        ValueError
+            If `count` is invalid, or exceeds the key's count with `strict=True`.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        _validate_count(count)
+        heap = self.heap
+        idx = heap.value_to_index.get(value)
+        if idx is None:
+            if strict:
+                raise KeyError(f"{value} not counted")
+            return False
+        current = heap.priorities[idx]
+        if count > current:
+            if strict:
+                raise ValueError(f"Count must be less than or equal to the key's count ({current})")
+            count = current
+        if count == current:
+            heap.remove(value)
+        else:
+            heap._set_priority(idx, current - count)
+        self._total -= count
+        return True
+
+    def count(self, value):
+        """
+        Return the count of a key, or 0 if it is not counted.
+
+        Time Complexity:
+        O(1)
+
+        """
+        idx = self.heap.value_to_index.get(value)
+        return 0 if idx is None else self.heap.priorities[idx]
+
+    def most_common(self, k = None):
+        """
+        Return the `k` most frequent keys with their counts, most frequent first.
+
+        Parameters:
+        k : int, optional
+            The number of keys to return. Defaults to all keys.
+
+        Returns:
+        list
+            `(value, count)` tuples. Keys with equal counts are in no particular order.
+
+        Raises:
+        ValueError
+            If `k` is not a non-negative integer.
+
+        Time Complexity:
+        O(K * log(K)), or O(N * log(N)) for all keys.
+
+        """
+        heap = self.heap
+        values = heap.to_sorted_list() if k is None else heap.top(k)
+        return [(value, heap.priorities[heap.value_to_index[value]]) for value in values]
+
+    def peek(self):
+        """
+        Return the most frequent key and its count without removing it, or None if empty.
+
+        Time Complexity:
+        O(1)
+
+        """
+        heap = self.heap
+        if not heap:
+            return None
+        return (heap.values[0], heap.priorities[0])
+
+    def pop(self):
+        """
+        Remove the most frequent key and return it with its count.
+
+        Raises:
+        IndexError
+            If called on an empty counter.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        heap = self.heap
+        if not heap:
+            raise IndexError("Pop from empty heap")
+        count = heap.priorities[0]
+        self._total -= count
+        return (heap.pop(), count)
+
+    def total(self):
+        """
+        Return the sum of all counts.
+
+        Time Complexity:
+        O(1)
+
+        """
+        return self._total
+
+    def __contains__(self, value):
+        return value in self.heap
+
+    def __len__(self):
+        """
+        Return the number of distinct keys.
+        """
+        return len(self.heap)
+
+    def __bool__(self):
+        return bool(self.heap)
+
+class SpaceSavingHeap:
+    """
+    Approximate heavy-hitter counter using at most `capacity` counters (the Space-Saving algorithm).
+
+    Counters live in a `MinHeap` ordered by count. A key that is already tracked has its count
+    incremented; a new key takes a free counter while there is one, and otherwise replaces
+    the key with the smallest count in a single sift, inheriting that count plus its own.
+    Memory is bounded by `capacity` regardless of the length of the stream.
+
+    Reported counts never underestimate: a tracked key's true count lies between
+    `count(value) - error(value)` and `count(value)`, and any key whose true count exceeds
+    `total() / capacity` is guaranteed to be tracked.
+
+    Time Complexity Overview (M = capacity):
+    - insert: O(log(M))
+    - count / error: O(1)
+    - most_common(k): O(M * log(K))
+
+    """
+
+    def __init__(self, capacity):
+        """
+        Initialize an empty counter.
+
+        Parameters:
+        capacity : int
+            The maximum number of keys tracked at once.
+
+        Raises:
+        ValueError
+            If `capacity` is not a positive integer.
+
+        """
+        if not isinstance(capacity, int) or capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+        self.capacity = capacity
+        self.heap = MinHeap(priority_type = int)
+        self._errors = {}
+        self._total = 0
+
+    def insert(self, value, *, count = 1):
+        """
+        Count `count` more occurrences of a key.
+
+        Parameters:
+        value : Any
+            The hashable key.
+        count : int, optional
+            Number of occurrences to add. Defaults to 1.
+
+        Returns:
+        Any or None
+            The key whose counter was taken over, or None if no key was evicted.
+
+        Raises:
+        ValueError
+            If `count` is not a positive integer.
+        TypeError
+            If `value` is not hashable.
+
+        Time Complexity:
+        O(log(M))
+
+        """
+        _validate_count(count)
+        heap = self.heap
+        evicted = None
+        idx = heap.value_to_index.get(value) if heap._is_hashable(value) else None
+        if idx is not None:
+            heap._set_priority(idx, heap.priorities[idx] + count)
+        elif len(heap.values) < self.capacity:
+            heap.insert(value, priority = count)
+            self._errors[value] = 0
+        else:
+            min_count = heap.priorities[0]
+            evicted = heap.replace(value, priority = min_count + count)
+            del self._errors[evicted]
+            self._errors[value] = min_count
+        # Counted once the key is accepted, so a rejected key does not inflate `total`.
+        self._total += count
+        return evicted
+
+    def insert_many(self, values):
+        """
+        Count one occurrence of every key of an iterable.
+
+        Time Complexity:
+        O(K * log(M))
+
+        """
+        for value in values:
+            self.insert(value)
+
+    def count(self, value):
+        """
+        Return the estimated count of a key, or 0 if it is not tracked.
+
+        The estimate may exceed the true count by up to `error(value)`.
+
+        Time Complexity:
+        O(1)
+
+        """
+        idx = self.heap.value_to_index.get(value)
+        return 0 if idx is None else self.heap.priorities[idx]
+
+    def error(self, value):
+        """
+        Return the maximum overestimation of a tracked key's count.
+
+        Raises:
+        KeyError
+            If the key is not tracked.
+
+        Time Complexity:
+        O(1)
+
+        """
+        return self._errors[value]
+
+    def most_common(self, k = None):
+        """
+        Return the `k` keys with the highest estimated counts, with those counts, highest first.
+
+        Parameters:
+        k : int, optional
+            The number of keys to return. Defaults to all tracked keys.
+
+        Returns:
+        list
+            `(value, count)` tuples.
+
+        Raises:
+        ValueError
+            If `k` is not a non-negative integer.
+
+        Time Complexity:
+        O(M * log(K))
+
+        """
+        heap = self.heap
+        values = heap.nlargest(len(heap) if k is None else k)
+        return [(value, heap.priorities[heap.value_to_index[value]]) for value in values]
+
+    def total(self):
+        """
+        Return the number of occurrences counted so far.
+
+        Time Complexity:
+        O(1)
+
+        """
+        return self._total
+
+    def __contains__(self, value):
+        return value in self.heap
+
+    def __len__(self):
+        """
+        Return the number of tracked keys.
+        """
+        return len(self.heap)
+
+    def __bool__(self):
+        return bool(self.heap)
@@ -1,27 +1,57 @@
 from abc import ABC, abstractmethod
-from .heap_item import HeapItem
+from array import array
+from collections import Counter
+from itertools import groupby, islice
+import heapq
+from operator import lt, gt
+from . import persistence
+
+NUMERIC_TYPECODES = "bBhHiIlLqQfd"
+
+class _Tombstone:
+    """
+    Placeholder value for a slot removed from a `lazy_remove` heap. Each instance is a
+    distinct key in `value_to_index`, so dead slots can be moved by the sift loops as usual.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<removed>"
     
 class IndexedHeap(ABC):
     """
     Abstract base class for a heap with indexed access.
 
-    Elements are stored in as as `HeapItem` objects in a list to maintain heap order, alongside a dictionary
-    that maps values to the index of their corresponding `HeapItem`. This enables efficient removal of 
-    `HeapItem` objects, in addition to standard operations like insert, pop, and peek.
+    Elements are stored as parallel slot sequences kept in heap order: `values`, their
+    `priorities` and their `frequencies`. A dictionary maps each value to its slot index.
+    This enables efficient removal of arbitrary values, in addition to standard operations
+    like insert, pop, and peek.
+
+    By default the slot sequences are lists and can hold any values. For numeric priorities,
+    a `typecode` may be given at construction to store priorities and frequencies in compact
+    `array.array` buffers instead. The heap is binary unless another `arity` is given.
+
+    By default a value is ordered by itself. A value may instead be inserted with a separate
+    `priority`, in which case the value only needs to be hashable and the heap is ordered by
+    priority. Priorities can later be changed in place with `update_priority`, `decrease_key`
+    and `increase_key`.
 
     Use `MinHeap` for a min-heap or `MaxHeap` for a max-heap.
 
     Time Complexity Overview (N = number of unique items in the heap):
     - insert: O(log(N))
     - pop: O(log(N))
+    - pushpop / replace: O(log(N))
     - peek: O(1)
     - remove: O(log(N))
     - count: O(1)
+    - update_priority: O(log(N))
     - to_sorted_list: O(N * log(N))
 
     """
 
-    def __init__(self, arr = None):
+    def __init__(self, arr = None, *, arity = 2, typecode = None, value_type = None, priority_type = None,
+                 lazy_remove = False, compact_threshold = 0.5):
         """
         Initialize the heap with an optional list of values.
 
@@ -30,6 +60,37 @@ class IndexedHeap(ABC):
             Initial values to populate the heap. Duplicate values are merged
             and tracked via an internal frequency counter. All values must be
             mutually comparable according to the heap's ordering rules.
+        arity : int, optional
+            The number of children per node. Defaults to 2 (a binary heap). Wider
+            heaps are shallower, so sifting up (insert, decrease-key in a MinHeap)
+            touches fewer levels, while sifting down compares more children per level.
+        typecode : str, optional
+            A numeric `array` typecode (e.g. `"d"` or `"q"`). If given, priorities are
+            stored in an `array.array` of that type and frequencies in an `array("q")`,
+            rather than in lists. All priorities must then be numbers representable
+            by the typecode.
+        value_type : type, optional
+            If given, the type is validated once here, and each inserted value is then
+            only checked with `isinstance` instead of the full per-value validation
+            (hashability, self-equality and a trial comparison).
+        priority_type : type, optional
+            As `value_type`, for priorities given separately from their values.
+        lazy_remove : bool, optional
+            If True, removing the last occurrence of a value only marks its slot dead in
+            O(1), leaving a tombstone in place. `pop` and `peek` discard dead slots when
+            they reach the root, and the heap is compacted once dead slots exceed
+            `compact_threshold` of all slots. Defaults to False.
+        compact_threshold : float, optional
+            The fraction of dead slots, between 0 and 1, above which a lazy heap is
+            compacted. Defaults to 0.5.
+
+        Raises:
+        TypeError
+            If `arr` is not a list, or if `value_type` or `priority_type` is not a
+            hashable (for values) and orderable type.
+        ValueError
+            If `arity` is not an integer of at least 2, `typecode` is not a numeric
+            `array` typecode, or `compact_threshold` is not between 0 and 1.
 
         Comparison Requirements:
         - In `MinHeap`, values must support the `<` operator.
@@ -38,6 +99,9 @@ class IndexedHeap(ABC):
         and `int` is invalid unless custom comparison logic is provided.
         - To use custom comparison logic, implement `__lt__` (for `MinHeap`) or `__gt__`
         (for `MaxHeap`) so that values can be ordered.
+        - With `value_type` or `priority_type`, instances of the type are trusted to be
+        mutually comparable. Types such as `tuple` whose instances may hold
+        incomparable contents are not checked further.
 
         Time Complexity:
         O(N)
@@ -47,38 +111,185 @@ class IndexedHeap(ABC):
         
         if not isinstance(arr, list):
             raise TypeError("arr must be a list")
+        if not isinstance(arity, int) or arity < 2:
+            raise ValueError(f"arity must be an integer of at least 2, got {arity!r}")
+        if typecode is not None and (not isinstance(typecode, str) or typecode not in NUMERIC_TYPECODES):
+            raise ValueError(f"typecode must be one of {NUMERIC_TYPECODES!r}, got {typecode!r}")
+        if not 0 < compact_threshold <= 1:
+            raise ValueError(f"compact_threshold must be greater than 0 and at most 1, got {compact_threshold!r}")
+        if value_type is not None:
+            self._validate_type(value_type, hashable = True)
+        if priority_type is not None:
+            self._validate_type(priority_type, hashable = False)
         
-        self.heap = []
+        self.arity = arity
+        self.typecode = typecode
+        self.value_type = value_type
+        self.priority_type = priority_type
+        self.values = []
+        self.priorities = [] if typecode is None else array(typecode)
+        self.frequencies = [] if typecode is None else array("q")
         self.value_to_index = {}
         self.size = 0
+        self.lazy_remove = lazy_remove
+        self.compact_threshold = compact_threshold
+        self.dead = 0
         if len(arr) > 0:
-            for value in arr:
-                self._validate_value(value)
-                if value in self.value_to_index:
-                    idx = self.value_to_index[value]
-                    self.heap[idx].frequency +=1
-                else:
-                    heap_item = HeapItem(value)
-                    self.heap.append(heap_item)
-                    self.value_to_index[value] = len(self.heap) - 1
-                self.size += 1
+            self.insert_many(arr)
+
+    @classmethod
+    def from_counts(cls, counts, **heap_options):
+        """
+        Build a heap from pre-aggregated values and their frequencies.
+
+        Values are validated as a batch (see `_validate_batch`) and the heap is built with a
+        single bottom-up heapify, without per-value insertion.
+
+        Parameters:
+        counts : Mapping
+            Maps each value to its frequency, e.g. a `collections.Counter`.
+        **heap_options
+            Passed to the constructor, e.g. `arity`, `typecode` or `value_type`.
+
+        Returns:
+        IndexedHeap
+            A heap of this class.
+
+        Raises:
+        ValueError
+            If a frequency is not a positive integer.
+        TypeError
+            If the values are not hashable and mutually comparable.
+
+        Time Complexity:
+        O(N)
 
-            for i in range((len(self.heap)//2)-1, -1, -1):
-                self._sift_down(i)
+        """
+        values = list(counts)
+        frequencies = list(counts.values())
+        for frequency in frequencies:
+            if not isinstance(frequency, int) or frequency < 1:
+                raise ValueError(f"Counts must be positive integers, got {frequency!r}")
+        return cls._from_slots(values, frequencies, heapify = True, **heap_options)
+
+    @classmethod
+    def from_sorted(cls, iterable, **heap_options):
+        """
+        Build a heap from values already sorted in heap order, without heapifying.
+
+        An array sorted from root to leaves (ascending for `MinHeap`, descending for `MaxHeap`)
+        already satisfies the heap property for any arity, so the slots are used as they are.
+        The order is checked in one pass of C-level comparisons over the distinct values, and
+        equal values, which must be adjacent, are merged into the frequency counter.
+
+        Parameters:
+        iterable : iterable
+            The sorted values, e.g. a list, generator or `array.array`.
+        **heap_options
+            Passed to the constructor, e.g. `arity`, `typecode` or `value_type`.
+
+        Returns:
+        IndexedHeap
+            A heap of this class.
+
+        Raises:
+        ValueError
+            If the values are not sorted in heap order.
+        TypeError
+            If the values are not hashable and mutually comparable.
+
+        Time Complexity:
+        O(N)
+
+        """
+        values = list(iterable)
+        # `Counter` keeps first occurrences in order, so the distinct values stay sorted.
+        counts = Counter(values)
+        heap = cls._from_slots(list(counts), list(counts.values()), heapify = False, **heap_options)
+        # The distinct values can be sorted while repeats are not, as in [1, 2, 1].
+        if len(counts) != sum(1 for _ in groupby(values)):
+            raise ValueError("Values are not sorted in heap order")
+        return heap
+
+    @classmethod
+    def from_iterable(cls, iterable, **heap_options):
+        """
+        Build a heap from any iterable of values, e.g. a generator or `array.array`.
+
+        Duplicates are tallied with `collections.Counter`, values are validated as a batch
+        (see `_validate_batch`) and the heap is built with a single bottom-up heapify.
+
+        Parameters:
+        iterable : iterable
+            The values. Repeated values are merged into the frequency counter.
+        **heap_options
+            Passed to the constructor, e.g. `arity`, `typecode` or `value_type`.
+
+        Returns:
+        IndexedHeap
+            A heap of this class.
+
+        Raises:
+        TypeError
+            If the values are not hashable and mutually comparable.
+
+        Time Complexity:
+        O(N)
+
+        """
+        values = list(iterable)
+        try:
+            counts = Counter(values)
+        except TypeError:
+            # Find the unhashable value to report it as `insert` would.
+            cls(**heap_options)._validate_batch(values)
+            raise
+        return cls._from_slots(list(counts), list(counts.values()), heapify = True, **heap_options)
+
+    @classmethod
+    def _from_slots(cls, values, frequencies, *, heapify, **heap_options):
+        """
+        Create a heap holding unique `values` with their `frequencies`, for the bulk constructors.
+
+        Parameters:
+        values : list
+            The unique values.
+        frequencies : list
+            The frequency of each value.
+        heapify : bool
+            If False, the values must already be sorted in heap order, which is checked
+            instead of heapifying.
+
+        Raises:
+        ValueError
+            If `heapify` is False and the values are not sorted in heap order.
+
+        Time Complexity:
+        O(N)
+
+        """
+        heap = cls(**heap_options)
+        heap._validate_batch(values)
+        if not heapify and any(map(heap._comes_before, values[1:], values)):
+            raise ValueError("Values are not sorted in heap order")
+        heap._assign_slots(values, values, frequencies, heapify = heapify)
+        heap.size = sum(frequencies)
+        return heap
 
     @abstractmethod
     def _comes_before(self, a, b):
         """
-        Determine the ordering between two `HeapItem` objects.
+        Determine the ordering between two priorities.
 
         This method is implemented by `MinHeap` and `MaxHeap` to define
-        the heap's ordering rule.
+        the heap's ordering rule. It is called with raw priority slots, so
+        subclasses bind it directly to a C-level comparison operator.
 
         Parameters:
-        a : HeapItem
-            The first heap item to compare.
-        b : HeapItem
-            The second heap item to compare.
+        a : Any
+            The first priority to compare.
+        b : Any
+            The second priority to compare.
 
         Returns:
         bool
@@ -93,79 +304,298 @@ class IndexedHeap(ABC):
         
     def _sift_up(self, idx = None):
         """
-        Move the `HeapItem` at `idx` upward in the heap until the heap property is restored.
+        Move the slot at `idx` upward in the heap until the heap property is restored.
+
+        Parents that come after the moving slot are shifted down into the hole it leaves,
+        so each level costs one slot write and one index dictionary write.
 
         Parameters:
         idx : int, optional
-            Index of the `HeapItem` to sift up. Defaults to the last element.
+            Index of the slot to sift up. Defaults to the last element.
 
         Returns:
         int
-            The final index of the `HeapItem` after sifting.
+            The final index of the slot after sifting.
 
 
         Time Complexity:
         O(log(N))
 
         """
-
-        n = len(self.heap)
+        values, priorities, frequencies = self.values, self.priorities, self.frequencies
+        value_to_index = self.value_to_index
+        comes_before = self._comes_before
+        arity = self.arity
+        n = len(values)
         if idx == None:
             idx = n-1
         if idx < 0 or idx >= n:
-            raise ValueError(f"idx out of range, idx: {idx}, heap size: {len(self.heap)}")
+            raise ValueError(f"idx out of range, idx: {idx}, heap size: {n}")
+        value, priority, frequency = values[idx], priorities[idx], frequencies[idx]
         while idx > 0:
-            parent_idx = (idx - 1) // 2
-            parent_heap_item = self.heap[parent_idx]
-            curr_heap_item = self.heap[idx]
-            if self._comes_before(curr_heap_item, parent_heap_item):
-                self.heap[idx], self.heap[parent_idx] = self.heap[parent_idx], self.heap[idx]
-                self.value_to_index[curr_heap_item.value] = parent_idx
-                self.value_to_index[parent_heap_item.value] = idx
-                idx = parent_idx
-            else:
+            parent_idx = (idx - 1) // arity
+            parent_priority = priorities[parent_idx]
+            if not comes_before(priority, parent_priority):
                 break
+            parent_value = values[parent_idx]
+            values[idx] = parent_value
+            priorities[idx] = parent_priority
+            frequencies[idx] = frequencies[parent_idx]
+            value_to_index[parent_value] = idx
+            idx = parent_idx
+        values[idx], priorities[idx], frequencies[idx] = value, priority, frequency
+        value_to_index[value] = idx
         return idx
     
     def _sift_down(self, idx = None):
         """
-        Move the `HeapItem` at `idx` downward in the heap until the heap property is restored.
+        Move the slot at `idx` downward in the heap until the heap property is restored.
+
+        The preferred child is shifted up into the hole left by the moving slot at each level,
+        so each level costs one slot write and one index dictionary write, plus `arity - 1`
+        comparisons to pick the child.
 
         Parameters:
         idx : int, optional
-            Index of the `HeapItem` to sift down. Defaults to the first element.
+            Index of the slot to sift down. Defaults to the first element.
 
         Returns:
         int
-            The final index of the `HeapItem` after sifting.
+            The final index of the slot after sifting.
 
         Time Complexity:
         O(log(N))
 
         """
-        n = len(self.heap)
+        values, priorities, frequencies = self.values, self.priorities, self.frequencies
+        value_to_index = self.value_to_index
+        comes_before = self._comes_before
+        arity = self.arity
+        n = len(values)
         if idx == None:
             idx = 0
         if idx < 0 or idx >= n:
-            raise ValueError(f"idx out of range, idx: {idx}, heap size: {len(self.heap)}")
-        child1_idx, child2_idx = (2 * idx + 1), (2 * idx + 2)    
-        while child1_idx < n and \
-            (self._comes_before(self.heap[child1_idx], self.heap[idx]) \
-            or (child2_idx < n and self._comes_before(self.heap[child2_idx], self.heap[idx]))    
-            ):
-            child_idx = child1_idx
-            child_heap_item = self.heap[child1_idx]
-            if child2_idx < n and self._comes_before(self.heap[child2_idx], child_heap_item):
-                child_idx = child2_idx
-                child_heap_item = self.heap[child2_idx]
-            curr_heap_item = self.heap[idx]
-            self.heap[idx], self.heap[child_idx] = self.heap[child_idx], self.heap[idx]
-            self.value_to_index[child_heap_item.value] = idx
-            self.value_to_index[curr_heap_item.value] = child_idx
-            idx = child_idx
-            child1_idx, child2_idx = (2 * idx + 1), (2 * idx + 2)
+            raise ValueError(f"idx out of range, idx: {idx}, heap size: {n}")
+        value, priority, frequency = values[idx], priorities[idx], frequencies[idx]
+        if arity == 2:
+            child_idx = 2 * idx + 1
+            while child_idx < n:
+                child_priority = priorities[child_idx]
+                sibling_idx = child_idx + 1
+                if sibling_idx < n and comes_before(priorities[sibling_idx], child_priority):
+                    child_idx = sibling_idx
+                    child_priority = priorities[sibling_idx]
+                if not comes_before(child_priority, priority):
+                    break
+                child_value = values[child_idx]
+                values[idx] = child_value
+                priorities[idx] = child_priority
+                frequencies[idx] = frequencies[child_idx]
+                value_to_index[child_value] = idx
+                idx = child_idx
+                child_idx = 2 * idx + 1
+        else:
+            first_child_idx = arity * idx + 1
+            while first_child_idx < n:
+                child_idx = first_child_idx
+                child_priority = priorities[child_idx]
+                for sibling_idx in range(first_child_idx + 1, min(first_child_idx + arity, n)):
+                    sibling_priority = priorities[sibling_idx]
+                    if comes_before(sibling_priority, child_priority):
+                        child_idx = sibling_idx
+                        child_priority = sibling_priority
+                if not comes_before(child_priority, priority):
+                    break
+                child_value = values[child_idx]
+                values[idx] = child_value
+                priorities[idx] = child_priority
+                frequencies[idx] = frequencies[child_idx]
+                value_to_index[child_value] = idx
+                idx = child_idx
+                first_child_idx = arity * idx + 1
+        values[idx], priorities[idx], frequencies[idx] = value, priority, frequency
+        value_to_index[value] = idx
         return idx
+
+    def _heapify(self):
+        """
+        Restore the heap property over all slots with a bottom-up pass of `_sift_down`.
+
+        Time Complexity:
+        O(N)
+
+        """
+        for i in range((len(self.values) - 2) // self.arity, -1, -1):
+            self._sift_down(i)
+
+    def _assign_slots(self, values, priorities, frequencies, *, heapify = True):
+        """
+        Replace the slot sequences wholesale, rebuild the index dictionary and re-heapify.
+
+        Parameters:
+        values : iterable
+            The values of the new slots. Must be unique.
+        priorities : iterable
+            The priority of each value, in the same order.
+        frequencies : iterable
+            The frequency of each value, in the same order.
+        heapify : bool, optional
+            If False, the slots are trusted to already be in heap order. Defaults to True.
+
+        Notes:
+        The caller is responsible for setting `self.size`.
+
+        Time Complexity:
+        O(N)
+
+        """
+        self.values = list(values)
+        if self.typecode is None:
+            self.priorities = list(priorities)
+            self.frequencies = list(frequencies)
+        else:
+            self.priorities = array(self.typecode, priorities)
+            self.frequencies = array("q", frequencies)
+        self.value_to_index = dict(zip(self.values, range(len(self.values))))
+        if heapify:
+            self._heapify()
+
+    def _restore(self, idx):
+        """
+        Sift the slot at `idx` in whichever direction restores the heap property.
+
+        Parameters:
+        idx : int
+            Index of a slot whose value or priority was replaced.
+
+        Returns:
+        int
+            The final index of the slot after sifting.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        new_idx = self._sift_down(idx)
+        if new_idx == idx:
+            new_idx = self._sift_up(idx)
+        return new_idx
+
+    def _delete_at(self, idx):
+        """
+        Remove the slot at `idx` entirely, regardless of its frequency.
+
+        The last slot is moved into the vacated position and sifted in whichever
+        direction restores the heap property. The caller is responsible for
+        adjusting `self.size`.
+
+        Parameters:
+        idx : int
+            Index of the slot to remove.
+
+        Returns:
+        tuple
+            The `(value, priority, frequency)` of the removed slot.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        values, priorities, frequencies = self.values, self.priorities, self.frequencies
+        removed = (values[idx], priorities[idx], frequencies[idx])
+        last_value, last_priority, last_frequency = values.pop(), priorities.pop(), frequencies.pop()
+        del self.value_to_index[removed[0]]
+        if idx < len(values):
+            values[idx], priorities[idx], frequencies[idx] = last_value, last_priority, last_frequency
+            self.value_to_index[last_value] = idx
+            self._restore(idx)
+        return removed
     
+    def _replace_root(self, value, priority):
+        """
+        Replace the root slot with a new value in a single sift.
+
+        The root must have a frequency of 1 and `value` must not already be in the heap.
+        The caller is responsible for validation; `self.size` is unchanged.
+
+        Parameters:
+        value : Any
+            The new value.
+        priority : Any
+            The priority of the new value.
+
+        Returns:
+        Any
+            The value that was at the root.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        value_to_index = self.value_to_index
+        root_value = self.values[0]
+        self.priorities[0] = priority
+        self.values[0] = value
+        del value_to_index[root_value]
+        value_to_index[value] = 0
+        self._sift_down(0)
+        return root_value
+
+    def _bury(self, idx):
+        """
+        Mark the slot at `idx` dead instead of deleting it, for `lazy_remove` heaps.
+
+        The value is dropped from the index dictionary and replaced by a unique `_Tombstone`
+        with a frequency of 0, which keeps its place (and priority) in the heap until it
+        reaches the root or the heap is compacted. The caller is responsible for adjusting
+        `self.size`.
+
+        Time Complexity:
+        O(1), or O(N) when the dead slots cross `compact_threshold` and the heap is compacted.
+
+        """
+        value_to_index = self.value_to_index
+        del value_to_index[self.values[idx]]
+        tombstone = _Tombstone()
+        self.values[idx] = tombstone
+        self.frequencies[idx] = 0
+        value_to_index[tombstone] = idx
+        self.dead += 1
+        if self.dead > self.compact_threshold * len(self.values):
+            self.compact()
+
+    def _discard_dead_root(self):
+        """
+        Delete dead slots from the root until the root holds a live value or the heap is empty.
+
+        Time Complexity:
+        O(D * log(N)) for D dead slots reaching the root.
+
+        """
+        frequencies = self.frequencies
+        while self.dead and frequencies and frequencies[0] == 0:
+            self._delete_at(0)
+            self.dead -= 1
+
+    def compact(self):
+        """
+        Drop every dead slot left by `lazy_remove` and rebuild the heap in a single pass.
+
+        Time Complexity:
+        O(N)
+
+        """
+        if not self.dead:
+            return
+        values, priorities, frequencies = self.values, self.priorities, self.frequencies
+        kept = [idx for idx in range(len(values)) if frequencies[idx]]
+        self._assign_slots(
+            [values[idx] for idx in kept],
+            [priorities[idx] for idx in kept],
+            [frequencies[idx] for idx in kept],
+        )
+        self.dead = 0
+
     def peek(self):
         """
         Return the root value of the heap without removing it.
@@ -175,14 +605,16 @@ class IndexedHeap(ABC):
             The smallest/largest value depending on heap type, or None if the heap is empty.
 
         Time Complexity:
-        O(1)
+        O(1), plus the cost of discarding dead slots at the root in a `lazy_remove` heap.
         """
-        if self.heap:
-            return self.heap[0].value
+        if self.dead:
+            self._discard_dead_root()
+        if self.values:
+            return self.values[0]
         else:
             return None
         
-    def insert(self, value,*, count = 1):
+    def insert(self, value, *, count = 1, priority = None):
         """
         Insert a value into the heap.
 
@@ -191,168 +623,720 @@ class IndexedHeap(ABC):
 
         Parameters:
         value : Any
-            The value to insert. Must be comparable with existing values in the heap.
+            The value to insert. Must be comparable with existing values in the heap,
+            unless a separate `priority` is given.
         count : int, optional
             Number of occurrences to add. Defaults to 1.
+        priority : Any, optional
+            The priority the value is ordered by. Defaults to the value itself.
+            If the value already exists and a priority is given, the value is
+            reprioritised as by `update_priority`.
 
         Raises:
+        ValueError
+            If `count` is not a positive integer.
         TypeError
-            If the value is not comparable with existing values.
+            If the value (or priority) is not comparable with existing priorities, or not
+            representable by the heap's `typecode`.
 
         Notes:
         Comparison depends on the heap type:
         - `MinHeap` uses `<`; values inserted into MinHeap must support `__lt__`.
         - `MaxHeap` uses `>`; values inserted into MaxHeap must support `__gt__`.
         - All inserted values must support `__eq__` and `__hash__` so they can be stored as keys in `self.value_to_index`.
+        - When a `priority` is given, the ordering requirements apply to the priority instead of the value.
 
         Time Complexity:
         O(log(N))
 
         """
-        self._validate_value(value)
-        self.size += count
-        heap_item = HeapItem(value, count)
+        if not isinstance(count, int) or count < 1:
+            raise ValueError("Count must be a positive integer")
+        self._validate_value(value, priority)
         if value in self.value_to_index:
             idx = self.value_to_index[value]
-            self.heap[idx].frequency += count
+            self.frequencies[idx] += count
+            if priority is not None:
+                self._set_priority(idx, priority)
         else:
-            self.heap.append(heap_item)
-            self.value_to_index[value] = len(self.heap) - 1
+            self.priorities.append(value if priority is None else priority)
+            self.values.append(value)
+            self.frequencies.append(count)
+            self.value_to_index[value] = len(self.values) - 1
             self._sift_up()
+        self.size += count
+
+    def insert_many(self, values):
+        """
+        Insert every value of an iterable into the heap.
+
+        All values are validated before the heap is modified, so a failed batch leaves the
+        heap unchanged. New slots are then appended in one pass and the heap property is
+        restored either by sifting each new slot up, or, when the batch is large relative
+        to the heap, by a single bottom-up re-heapify.
+
+        Parameters:
+        values : iterable
+            The values to insert. Repeated values are merged into the frequency counter.
+
+        Raises:
+        TypeError
+            If any value is not hashable, not equatable, or not comparable with the
+            other values.
+
+        Time Complexity:
+        O(K * log(N)) for a batch of K values, or O(N + K) when re-heapifying.
+
+        """
+        batch = list(values)
+        for i, value in enumerate(batch):
+            self._validate_value(value)
+            if i > 0 and self.value_type is None:
+                self._ensure_comparable(value, batch[i - 1])
+        if self.typecode is not None:
+            array(self.typecode, batch)
+
+        value_to_index = self.value_to_index
+        values_, priorities, frequencies = self.values, self.priorities, self.frequencies
+        first_new_idx = len(values_)
+        for value in batch:
+            idx = value_to_index.get(value)
+            if idx is None:
+                priorities.append(value)
+                values_.append(value)
+                frequencies.append(1)
+                value_to_index[value] = len(values_) - 1
+            else:
+                frequencies[idx] += 1
+        self.size += len(batch)
+        self._restore_appended(first_new_idx)
+
+    def _restore_appended(self, first_new_idx):
+        """
+        Restore the heap property after slots were appended from `first_new_idx` onwards.
+
+        Either sifts each appended slot up, or re-heapifies everything once when the appended
+        slots make up more than half of the heap.
+
+        Parameters:
+        first_new_idx : int
+            Index of the first appended slot.
+
+        Time Complexity:
+        O(K * log(N)) for K appended slots, or O(N) when re-heapifying.
+
+        """
+        n = len(self.values)
+        # Sifting up costs one call per new slot, re-heapifying one call per internal node.
+        if n - first_new_idx > n // 2:
+            self._heapify()
+        else:
+            for idx in range(first_new_idx, n):
+                self._sift_up(idx)
+
+    def update(self, other):
+        """
+        Add every value of another heap, or of an iterable, to this heap in place.
+
+        Values already in this heap have the other heap's frequency added to theirs. Their
+        priority becomes whichever of the two priorities comes first. Values new to this heap
+        are appended with their frequency and priority. The heap property is then restored
+        once for the whole batch rather than once per value.
+
+        Parameters:
+        other : IndexedHeap or iterable
+            The heap (of any heap class) or values to add. An iterable is added as by `insert_many`.
+
+        Raises:
+        TypeError
+            If the other heap's priorities are not comparable with this heap's.
+
+        Time Complexity:
+        O(N + M) for a heap of M unique values when re-heapifying, otherwise O(M * log(N + M)).
+
+        """
+        if not isinstance(other, IndexedHeap):
+            self.insert_many(other)
+            return
+        if other is self:
+            other = other._copy()
+        if self.values and other.values:
+            self._ensure_comparable(other.priorities[0], self.priorities[0])
+        if (self.value_type is not None and not issubclass(other.value_type or object, self.value_type)) or \
+            (self.priority_type is not None and not issubclass(other.priority_type or object, self.priority_type)):
+            for idx in range(len(other.values)):
+                self._validate_value(other.values[idx], other.priorities[idx])
+        if self.typecode is not None and other.typecode != self.typecode:
+            array(self.typecode, other.priorities)
+
+        value_to_index, comes_before = self.value_to_index, self._comes_before
+        values, priorities, frequencies = self.values, self.priorities, self.frequencies
+        first_new_idx = len(values)
+        reprioritised = False
+        for value, priority, frequency in zip(other.values, other.priorities, other.frequencies):
+            if not frequency:
+                continue
+            idx = value_to_index.get(value)
+            if idx is None:
+                priorities.append(priority)
+                values.append(value)
+                frequencies.append(frequency)
+                value_to_index[value] = len(values) - 1
+            else:
+                frequencies[idx] += frequency
+                if comes_before(priority, priorities[idx]):
+                    priorities[idx] = priority
+                    reprioritised = True
+        self.size += other.size
+        if reprioritised:
+            self._heapify()
+        else:
+            self._restore_appended(first_new_idx)
+
+    def merge(self, other):
+        """
+        Return a new heap holding the values of this heap and of `other`.
+
+        Parameters:
+        other : IndexedHeap or iterable
+            The heap or values to merge, combined as by `update`.
+
+        Returns:
+        MinHeap | MaxHeap
+            A new heap of this heap's type. Neither input is modified.
+
+        Time Complexity:
+        O(N + M)
+
+        """
+        merged = self._copy()
+        merged.update(other)
+        return merged
+
+    def __or__(self, other):
+        """
+        Return `self.merge(other)` for another heap of the same type, e.g. `heap1 | heap2`.
+
+        Time Complexity:
+        O(N + M)
+
+        """
+        if not self._is_class(other):
+            return NotImplemented
+        return self.merge(other)
+
+    def __ior__(self, other):
+        """
+        Merge another heap of the same type into this one in place, e.g. `heap1 |= heap2`.
+
+        Time Complexity:
+        O(N + M)
+
+        """
+        if not self._is_class(other):
+            return NotImplemented
+        self.update(other)
+        return self
 
     def pop(self):
         """
-        Remove and return the root value of the heap.
+        Remove and return the root value of the heap.
+
+        If the root value has a frequency greater than 1, its frequency is
+        decremented instead of removing its slot entirely.
+
+        Returns:
+        Any
+            The smallest (in MinHeap) or largest (in MaxHeap) value in the heap.
+
+        Raises:
+        IndexError
+            If called on an empty heap.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        
+        if self.dead:
+            self._discard_dead_root()
+        if not self.values:
+            raise IndexError("Pop from empty heap")
+        self.size -= 1
+        frequency = self.frequencies[0]
+        if frequency > 1:
+            self.frequencies[0] = frequency - 1
+            return self.values[0]
+        else:
+            return self._delete_at(0)[0]
+    
+    def pushpop(self, value, *, priority = None):
+        """
+        Insert a value and then remove and return the root value, as `heapq.heappushpop`.
+
+        If the new value would itself be the root, it is returned straight away and the heap
+        is not modified. Otherwise the root is replaced by the new value in a single sift.
+
+        Parameters:
+        value : Any
+            The value to insert.
+        priority : Any, optional
+            The priority the value is ordered by. Defaults to the value itself.
+
+        Returns:
+        Any
+            The root value after inserting `value`, which may be `value` itself.
+
+        Raises:
+        TypeError
+            If the value (or priority) is not valid for the heap.
+
+        Time Complexity:
+        O(1) if `value` would be the root, otherwise O(log(N))
+
+        """
+        self._validate_value(value, priority)
+        if value in self.value_to_index:
+            self.insert(value, priority = priority)
+            return self.pop()
+        if self.dead:
+            self._discard_dead_root()
+        key = value if priority is None else priority
+        if not self.values or not self._comes_before(self.priorities[0], key):
+            return value
+        return self._swap_root(value, key)
+
+    def replace(self, value, *, priority = None):
+        """
+        Remove and return the root value and then insert a value, as `heapq.heapreplace`.
+
+        The root is replaced by the new value in a single sift, so the returned value may
+        come after the new value in heap order.
+
+        Parameters:
+        value : Any
+            The value to insert.
+        priority : Any, optional
+            The priority the value is ordered by. Defaults to the value itself.
+
+        Returns:
+        Any
+            The root value before `value` was inserted.
+
+        Raises:
+        IndexError
+            If called on an empty heap.
+        TypeError
+            If the value (or priority) is not valid for the heap.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        if self.dead:
+            self._discard_dead_root()
+        if not self.values:
+            raise IndexError("Replace on empty heap")
+        self._validate_value(value, priority)
+        if value in self.value_to_index:
+            if priority is None:
+                # Read before popping, which may remove the value's slot if it is the root.
+                priority = self.priorities[self.value_to_index[value]]
+            root_value = self.pop()
+            self.insert(value, priority = priority)
+            return root_value
+        return self._swap_root(value, value if priority is None else priority)
+
+    def _swap_root(self, value, key):
+        """
+        Pop one occurrence of the root and insert a new value with priority `key` in a single sift.
+
+        `value` must already be validated and not be in the heap, and the heap must not be empty.
+
+        Returns:
+        Any
+            The popped root value.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        frequency = self.frequencies[0]
+        if frequency == 1:
+            return self._replace_root(value, key)
+        root_value = self.values[0]
+        self.priorities.append(key)
+        self.values.append(value)
+        self.frequencies.append(1)
+        self.frequencies[0] = frequency - 1
+        self.value_to_index[value] = len(self.values) - 1
+        self._sift_up()
+        return root_value
+
+    def pop_many(self, k, *, strict = True):
+        """
+        Remove and return the first `k` values of the heap, in heap order.
+
+        Equivalent to calling `pop` `k` times, but a root value whose whole frequency
+        is taken is removed with a single sift, however many occurrences it has.
+
+        Parameters:
+        k : int
+            The number of values to pop. Must be at least 0.
+        strict : bool, default True
+            If True, raises an IndexError when the heap holds fewer than `k` values.
+            If False, pops as many values as are available.
+
+        Returns:
+        list
+            The popped values, smallest first for MinHeap and largest first for MaxHeap.
+            Duplicates are repeated according to their frequency.
+
+        Raises:
+        ValueError
+            If `k` is not a non-negative integer.
+        IndexError
+            If `strict=True` and the heap holds fewer than `k` values.
+
+        Time Complexity:
+        O(K * log(N)) for K unique values popped.
+
+        """
+        self._validate_k(k)
+        if k > self.size:
+            if strict == False:
+                k = self.size
+            else:
+                raise IndexError(f"Cannot pop {k} values from heap of size {self.size}")
+        result = []
+        remaining = k
+        while remaining > 0:
+            if self.dead:
+                self._discard_dead_root()
+            frequency = self.frequencies[0]
+            if frequency > remaining:
+                self.frequencies[0] = frequency - remaining
+                result.extend([self.values[0]] * remaining)
+                break
+            value = self._delete_at(0)[0]
+            result.extend([value] * frequency)
+            remaining -= frequency
+        self.size -= k
+        return result
+
+    def _value_in_heap(self, value):
+        """
+        Check if an value exists in the heap.
+
+        Returns a tuple of (found, index):
+            found (bool): True if the value is in the heap and its index points to a valid slot.
+            index (int or None): The index of the value's slot if found, else None.
+
+        Notes:
+        Under normal operation, the index dictionary (`self.value_to_index`) and slot sequences
+        should always be in sync. This method defensively removes any stale entries that may occur,
+        for example if a user manually modifies `self.values` or `self.value_to_index`, or in the event of
+        an unexpected interruption during heap operations.
+
+        Time Complexity: O(1)
+
+        """
+        if value not in self.value_to_index:
+            return (False, None)
+        idx = self.value_to_index[value]
+        if 0 <= idx < len(self.values):
+            return (True, idx)
+        else:
+            del self.value_to_index[value]
+            return (False, None)
+    
+    def remove(self, value, *, count = 1, strict = True):
+        """
+        Remove a specified number of occurrences of a value from the heap.
+
+        Parameters:
+        value : Any
+            The value to remove from the heap.
+        count : int, optional
+            The number of occurrences to remove. Defaults to 1. Must be at least 1.
+        strict : bool, default True
+            If True, raises a ValueError when the value is not in the heap or
+            if the requested count exceeds the value's frequency.
+            If False, removes as many occurrences as possible (up to `count`) without
+            raising an error. Returns False only if the value was not found.
+
+        Returns:
+        bool
+            True if the removal was successful. False only if the value was not found
+            and `strict=False`.
+
+        Raises:
+        ValueError
+            If `strict=True` and the value is not in the heap, or if `count` is invalid.
+
+        Notes:
+        - If the values current frequencny is greater than the removal count, its frequency
+        is decremented.
+        - If the frequency equals the removal count, the value's slot is removed
+        and the heap property is restored via `_sift_down` or `_sift_up`.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+
+        found_in_heap, idx = self._value_in_heap(value)
+        if not found_in_heap:
+            if strict == False:
+                return False
+            else:
+                raise KeyError(f"{value} not in heap")
+            
+        if not isinstance(count, int):
+            raise ValueError("The count must be an integer")
+        if count < 1:
+            raise ValueError("Count must be at least 1")
+        frequency = self.frequencies[idx]
+        if count > frequency:
+            if strict == False:
+                count = frequency
+            else: 
+                raise ValueError(f"Count must be less than or equal to value frequency ({frequency})")
+        if count < frequency:
+            self.frequencies[idx] = frequency - count
+        elif self.lazy_remove:
+            self._bury(idx)
+        else:
+            self._delete_at(idx)
+        self.size -= count
+        return True
+
+    def remove_many(self, values, *, strict = True):
+        """
+        Remove one occurrence of every value of an iterable from the heap.
+
+        Removals are aggregated per value first, so repeated values in the iterable remove
+        that many occurrences. Slots whose whole frequency is removed are deleted either one
+        at a time, or, when many are deleted relative to the heap size, by filtering the slot
+        arrays and re-heapifying once.
+
+        Parameters:
+        values : iterable
+            The values to remove.
+        strict : bool, default True
+            If True, raises before modifying the heap if any value is missing or would be
+            removed more times than its frequency.
+            If False, removes as many occurrences as possible and ignores missing values.
+
+        Returns:
+        int
+            The total number of occurrences removed.
+
+        Raises:
+        KeyError
+            If `strict=True` and a value is not in the heap.
+        ValueError
+            If `strict=True` and a value would be removed more times than its frequency.
+
+        Time Complexity:
+        O(K * log(N)) for K values, or O(N + K) when re-heapifying.
+
+        """
+        counts = {}
+        for value in values:
+            counts[value] = counts.get(value, 0) + 1
+
+        removals = []
+        for value, count in counts.items():
+            found_in_heap, idx = self._value_in_heap(value)
+            if not found_in_heap:
+                if strict == False:
+                    continue
+                raise KeyError(f"{value} not in heap")
+            frequency = self.frequencies[idx]
+            if count > frequency:
+                if strict == False:
+                    count = frequency
+                else:
+                    raise ValueError(f"Count must be less than or equal to value frequency ({frequency})")
+            removals.append((value, count))
+
+        emptied = []
+        removed = 0
+        for value, count in removals:
+            idx = self.value_to_index[value]
+            frequency = self.frequencies[idx]
+            if count < frequency:
+                self.frequencies[idx] = frequency - count
+            else:
+                emptied.append(value)
+            removed += count
+        self.size -= removed
+
+        # Deleting a slot costs up to two sifts, rebuilding costs one pass over every slot.
+        if self.lazy_remove:
+            for value in emptied:
+                self._bury(self.value_to_index[value])
+        elif len(emptied) > len(self.values) // 4:
+            emptied = set(emptied)
+            kept = [idx for idx, value in enumerate(self.values) if value not in emptied]
+            self._assign_slots(
+                [self.values[idx] for idx in kept],
+                [self.priorities[idx] for idx in kept],
+                [self.frequencies[idx] for idx in kept],
+            )
+        else:
+            for value in emptied:
+                self._delete_at(self.value_to_index[value])
+        return removed
+
+    def priority(self, value):
+        """
+        Return the priority of a value in the heap.
+
+        Parameters:
+        value : Any
+            The value to look up.
+
+        Returns:
+        Any
+            The priority the value is ordered by. This is the value itself unless
+            it was inserted with a separate priority.
+
+        Raises:
+        KeyError
+            If the value is not in the heap.
+
+        Time Complexity:
+        O(1)
+
+        """
+        found_in_heap, idx = self._value_in_heap(value)
+        if not found_in_heap:
+            raise KeyError(f"{value} not in heap")
+        return self.priorities[idx]
+
+    def _set_priority(self, idx, priority):
+        """
+        Replace the priority of the slot at `idx` and restore the heap property.
+
+        Only a single sift is performed, in the direction implied by the change:
+        upward if the new priority comes before the old one, downward otherwise.
+
+        Parameters:
+        idx : int
+            Index of the slot to reprioritise.
+        priority : Any
+            The new priority.
+
+        Returns:
+        int
+            The final index of the slot after sifting.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        old_priority = self.priorities[idx]
+        self.priorities[idx] = priority
+        if self._comes_before(priority, old_priority):
+            return self._sift_up(idx)
+        elif self._comes_before(old_priority, priority):
+            return self._sift_down(idx)
+        return idx
+
+    def update_priority(self, value, priority):
+        """
+        Change the priority of a value already in the heap.
 
-        If the root value has a frequency greater than 1, its frequency is
-        decremented instead of removing the `HeapItem` entirely.
+        The value keeps its frequency and its slot is moved in place, so this
+        is cheaper than a `remove` followed by an `insert`.
 
-        Returns:
-        Any
-            The smallest (in MinHeap) or largest (in MaxHeap) value in the heap.
+        Parameters:
+        value : Any
+            The value to reprioritise.
+        priority : Any
+            The new priority. Must be comparable with existing priorities.
 
         Raises:
-        IndexError
-            If called on an empty heap.
+        KeyError
+            If the value is not in the heap.
+        TypeError
+            If the priority is not comparable with existing priorities.
 
         Time Complexity:
         O(log(N))
 
         """
-        
-        n = len(self.heap)
-        if n == 0:
-            raise IndexError("Pop from empty heap")
-        self.size -= 1
-        root: HeapItem = self.heap[0]
-        if root.frequency > 1:
-            root.frequency -= 1
-            return root.value
-        else:
-            if n > 1:
-                last_heap_item = self.heap[n-1]
-                self.heap[0], self.heap[n-1] = self.heap[n-1], self.heap[0]
-                self.value_to_index[last_heap_item.value] = 0
-            res = self.heap.pop()
-            del self.value_to_index[res.value]
-            if len(self.heap) > 1:
-                self._sift_down()
-            return res.value
-    
-    def _value_in_heap(self, value):
+        found_in_heap, idx = self._value_in_heap(value)
+        if not found_in_heap:
+            raise KeyError(f"{value} not in heap")
+        self._validate_priority(priority)
+        self._set_priority(idx, priority)
+
+    def decrease_key(self, value, priority):
         """
-        Check if an value exists in the heap.
+        Lower the priority of a value already in the heap.
 
-        Returns a tuple of (found, heap_item, index):
-            found (bool): True if the value is in the heap and there is a corresponding `HeapItem` with a valid index in self.heap.
-            heap_item (HeapItem or None): The `HeapItem` object if found, else None.
-            index (int or None): The index of the `HeapItem` in self.heap if found, else None.
+        Parameters:
+        value : Any
+            The value to reprioritise.
+        priority : Any
+            The new priority. Must not be greater than the current priority.
+
+        Raises:
+        KeyError
+            If the value is not in the heap.
+        ValueError
+            If the new priority is greater than the current priority.
 
         Notes:
-        Under normal operation, the index dictionary (`self.value_to_index`) and heap list (`self.heap`)
-        should always be in sync. This method defensively removes any stale entries that may occur,
-        for example if a user manually modifies `self.heap` or `self.value_to_index`, or in the event of
-        an unexpected interruption during heap operations.
+        In a `MinHeap` the value moves towards the root, in a `MaxHeap` away from it.
 
-        Time Complexity: O(1)
+        Time Complexity:
+        O(log(N))
 
         """
-        if value not in self.value_to_index:
-            return (False, None, None)
-        idx = self.value_to_index[value]
-        if 0 <= idx < len(self.heap):
-            return (True, self.heap[idx], idx)
-        else:
-            del self.value_to_index[value]
-            return (False, None, None)
-    
-    def remove(self, value, *, count = 1, strict = True):
+        found_in_heap, idx = self._value_in_heap(value)
+        if not found_in_heap:
+            raise KeyError(f"{value} not in heap")
+        self._validate_priority(priority)
+        current_priority = self.priorities[idx]
+        if current_priority < priority:
+            raise ValueError(f"New priority {priority!r} is greater than current priority {current_priority!r}")
+        self._set_priority(idx, priority)
+
+    def increase_key(self, value, priority):
         """
-        Remove a specified number of occurrences of a value from the heap.
+        Raise the priority of a value already in the heap.
 
         Parameters:
         value : Any
-            The value to remove from the heap.
-        count : int, optional
-            The number of occurrences to remove. Defaults to 1. Must be at least 1.
-        strict : bool, default True
-            If True, raises a ValueError when the value is not in the heap or
-            if the requested count exceeds the value's frequency.
-            If False, removes as many occurrences as possible (up to `count`) without
-            raising an error. Returns False only if the value was not found.
-
-        Returns:
-        bool
-            True if the removal was successful. False only if the value was not found
-            and `strict=False`.
+            The value to reprioritise.
+        priority : Any
+            The new priority. Must not be less than the current priority.
 
         Raises:
+        KeyError
+            If the value is not in the heap.
         ValueError
-            If `strict=True` and the value is not in the heap, or if `count` is invalid.
+            If the new priority is less than the current priority.
 
         Notes:
-        - If the values current frequencny is greater than the removal count, its frequency
-        is decremented.
-        - If the frequency equals the removal count, the associated `HeapItem` is removed
-        and the heap property is restored via `_sift_down` and `_sift_up`.
+        In a `MaxHeap` the value moves towards the root, in a `MinHeap` away from it.
 
         Time Complexity:
         O(log(N))
 
         """
-
-        found_in_heap, heap_item, idx = self._value_in_heap(value)
+        found_in_heap, idx = self._value_in_heap(value)
         if not found_in_heap:
-            if strict == False:
-                return False
-            else:
-                raise KeyError(f"{value} not in heap")
-            
-        if not isinstance(count, int):
-            raise ValueError("The count must be an integer")
-        if count < 1:
-            raise ValueError("Count must be at least 1")
-        if count > heap_item.frequency:
-            if strict == False:
-                count = heap_item.frequency
-            else: 
-                raise ValueError(f"Count must be less than or equal to value frequency ({heap_item.frequency})")
-        if count < heap_item.frequency:
-            heap_item.frequency -= count
-            self.size -= count
-        else:
-            last_idx = len(self.heap) -1
-            if idx != last_idx:
-                last_heap_item = self.heap[last_idx]
-                self.heap[idx], self.heap[last_idx] = self.heap[last_idx], self.heap[idx]
-                self.value_to_index[last_heap_item.value] = idx
-            self.heap.pop()
-            del self.value_to_index[heap_item.value]
-            self.size -= heap_item.frequency
-            if idx != last_idx:
-                new_idx = self._sift_down(idx)
-                self._sift_up(new_idx)
-        return True
+            raise KeyError(f"{value} not in heap")
+        self._validate_priority(priority)
+        current_priority = self.priorities[idx]
+        if current_priority > priority:
+            raise ValueError(f"New priority {priority!r} is less than current priority {current_priority!r}")
+        self._set_priority(idx, priority)
 
     def __len__(self):
         """
@@ -380,7 +1364,7 @@ class IndexedHeap(ABC):
         O(1)
 
         """
-        return bool(self.heap)
+        return self.size > 0
     
     def count(self, value):
         """
@@ -398,9 +1382,9 @@ class IndexedHeap(ABC):
         O(1)
              
         """
-        found_in_heap, heap_item, _ = self._value_in_heap(value)
+        found_in_heap, idx = self._value_in_heap(value)
         if found_in_heap:
-            return heap_item.frequency
+            return self.frequencies[idx]
         else:
             return 0
 
@@ -419,7 +1403,7 @@ class IndexedHeap(ABC):
         O(N)
 
         """
-        return [(heap_item.value, heap_item.frequency) for heap_item in self.heap]
+        return list(zip(self.values, self.frequencies))
     
     def _copy(self):
         """
@@ -433,20 +1417,150 @@ class IndexedHeap(ABC):
 
         Notes
         -----
-        This is primarily used for iteration or internal operations
-        where a temporary copy of the heap is needed.
+        This is primarily used for internal operations where a temporary,
+        independently modifiable copy of the heap is needed.
 
         Time Complexity:
         O(N)
 
         """
-        heap_copy = [HeapItem(heap_item.value, heap_item.frequency) for heap_item in self.heap]
-        item_to_index_copy = {heap_copy[index].value: index for index in range(len(heap_copy))}
-        size_copy = self.size
-        new_heap = self.__class__()
-        new_heap.heap, new_heap.value_to_index, new_heap.size = heap_copy, item_to_index_copy, size_copy
+        new_heap = self.__class__.__new__(self.__class__)
+        new_heap.__dict__.update(self.__dict__)
+        new_heap.values, new_heap.priorities, new_heap.frequencies = self.values[:], self.priorities[:], self.frequencies[:]
+        new_heap.value_to_index = self.value_to_index.copy()
         return new_heap
     
+    def __reduce_ex__(self, protocol):
+        """
+        Support pickling by writing the slot sequences in heap order.
+
+        Unpickling restores the slots as they are and rebuilds the index dictionary in one
+        linear pass, without validating or sifting. With pickle protocol 5 and a numeric
+        `typecode`, the priority and frequency arrays are handed to pickle as out-of-band
+        `pickle.PickleBuffer` objects.
+
+        Time Complexity:
+        O(N)
+
+        """
+        return persistence.reduce_heap(self, protocol)
+
+    def dump(self, path):
+        """
+        Write the heap to a file in heap order, for `load` to read back without re-sifting.
+
+        Numeric heaps (with a `typecode`) are written as raw arrays, and can also be opened
+        read-only through `mmap` by `load(path, mmap=True)`.
+
+        Parameters:
+        path : str or path-like
+            The file to write.
+
+        Time Complexity:
+        O(N)
+
+        """
+        persistence.dump(self, path)
+
+    @classmethod
+    def load(cls, path, *, mmap = False):
+        """
+        Read a heap written by `dump`.
+
+        Parameters:
+        path : str or path-like
+            The file to read.
+        mmap : bool, optional
+            If True, return a read-only `HeapSnapshot` that maps the file instead of
+            reading it, so several processes can peek and iterate it without copying.
+            Only numeric heaps whose values are their own priorities can be mapped.
+
+        Returns:
+        IndexedHeap or HeapSnapshot
+            A heap of the class that was dumped, or a snapshot of it.
+
+        Raises:
+        ValueError
+            If the file was not written by `dump`, or cannot be mapped.
+        TypeError
+            If the stored heap is not an instance of this class.
+
+        Time Complexity:
+        O(N), or O(1) with `mmap=True`.
+
+        """
+        if not mmap:
+            return persistence.load(path, heap_class = cls)
+        snapshot = persistence.HeapSnapshot(path)
+        if not issubclass(snapshot.heap_class, cls):
+            snapshot.close()
+            raise TypeError(f"{path!r} holds a {snapshot.heap_class.__name__}, not a {cls.__name__}")
+        return snapshot
+
+    def _frontier_push(self, frontier, idx):
+        """
+        Push a slot index onto an auxiliary frontier heap ordered by slot priority.
+
+        Parameters:
+        frontier : list of int
+            The frontier heap of slot indices.
+        idx : int
+            The slot index to push.
+
+        Time Complexity:
+        O(log(K)) for a frontier of K indices.
+
+        """
+        priorities, comes_before = self.priorities, self._comes_before
+        priority = priorities[idx]
+        pos = len(frontier)
+        frontier.append(idx)
+        while pos > 0:
+            parent_pos = (pos - 1) // 2
+            parent_idx = frontier[parent_pos]
+            if not comes_before(priority, priorities[parent_idx]):
+                break
+            frontier[pos] = parent_idx
+            pos = parent_pos
+        frontier[pos] = idx
+
+    def _frontier_pop(self, frontier):
+        """
+        Pop the slot index with the highest-priority slot from an auxiliary frontier heap.
+
+        Parameters:
+        frontier : list of int
+            A non-empty frontier heap of slot indices.
+
+        Returns:
+        int
+            The popped slot index.
+
+        Time Complexity:
+        O(log(K)) for a frontier of K indices.
+
+        """
+        priorities, comes_before = self.priorities, self._comes_before
+        top_idx = frontier[0]
+        idx = frontier.pop()
+        n = len(frontier)
+        if n == 0:
+            return top_idx
+        priority = priorities[idx]
+        pos = 0
+        child_pos = 1
+        while child_pos < n:
+            sibling_pos = child_pos + 1
+            if sibling_pos < n and comes_before(priorities[frontier[sibling_pos]], priorities[frontier[child_pos]]):
+                child_pos = sibling_pos
+            if not comes_before(priorities[frontier[child_pos]], priority):
+                break
+            frontier[pos] = frontier[child_pos]
+            pos = child_pos
+            child_pos = 2 * pos + 1
+        frontier[pos] = idx
+        return top_idx
+
     def __iter__(self):
         """
         Iterate over the heap's values in sorted order.
@@ -457,17 +1571,151 @@ class IndexedHeap(ABC):
             by the heap type (smallest to largest for MinHeap, largest
             to smallest for MaxHeap).
 
+        Raises:
+        RuntimeError
+            If values are added to or removed from the heap during iteration.
+
         Notes:
-        Iteration is performed on a copy of the heap by repeatedly popping
-        the root `HeapItem` object's value, so the original heap remains unchanged.
+        Iteration walks the heap arrays in place without copying them. A small
+        auxiliary frontier heap holds the indices of the slots that may come next:
+        the root to begin with, then the children of every slot already yielded.
+        The heap must not be modified while it is being iterated.
 
         Time Complexity:
-        O(N)
+        O(K * log(K)) to yield the first K unique values; O(N * log(N)) for a full pass.
+
+        """
+        values, frequencies = self.values, self.frequencies
+        n = len(values)
+        frontier = [0] if n > 0 else []
+        while frontier:
+            idx = self._frontier_pop(frontier)
+            value = values[idx]
+            for _ in range(frequencies[idx]):
+                yield value
+            if self.values is not values or len(values) != n:
+                raise RuntimeError("heap changed size during iteration")
+            first_child_idx = self.arity * idx + 1
+            for child_idx in range(first_child_idx, min(first_child_idx + self.arity, n)):
+                self._frontier_push(frontier, child_idx)
+
+    def top(self, k):
+        """
+        Return the first `k` values in heap order without modifying the heap.
+
+        Parameters:
+        k : int
+            The number of values to return. Must be at least 0.
+
+        Returns:
+        list
+            Up to `k` values, smallest first for MinHeap and largest first for MaxHeap.
+            Duplicates are repeated according to their frequency.
+
+        Raises:
+        ValueError
+            If `k` is not a non-negative integer.
+
+        Time Complexity:
+        O(K * log(K))
+
+        """
+        self._validate_k(k)
+        return list(islice(self, k))
+
+    def nsmallest(self, k):
+        """
+        Return the `k` smallest values, smallest first, without modifying the heap.
+
+        Parameters:
+        k : int
+            The number of values to return. Must be at least 0.
+
+        Returns:
+        list
+            Up to `k` values in ascending order of priority.
+
+        Raises:
+        ValueError
+            If `k` is not a non-negative integer.
+
+        Time Complexity:
+        O(K * log(K)) for MinHeap, which walks from the root; O(N * log(K)) for MaxHeap.
+
+        """
+        if not self._descending:
+            return self.top(k)
+        self._validate_k(k)
+        return self._select(k, heapq.nsmallest)
+
+    def nlargest(self, k):
+        """
+        Return the `k` largest values, largest first, without modifying the heap.
+
+        Parameters:
+        k : int
+            The number of values to return. Must be at least 0.
+
+        Returns:
+        list
+            Up to `k` values in descending order of priority.
+
+        Raises:
+        ValueError
+            If `k` is not a non-negative integer.
+
+        Time Complexity:
+        O(K * log(K)) for MaxHeap, which walks from the root; O(N * log(K)) for MinHeap.
+
+        """
+        if self._descending:
+            return self.top(k)
+        self._validate_k(k)
+        return self._select(k, heapq.nlargest)
+
+    def _select(self, k, selector):
+        """
+        Select the `k` values furthest from the root with a bounded `heapq` scan over all live slots.
+
+        Parameters:
+        k : int
+            The number of values to return.
+        selector : callable
+            `heapq.nsmallest` or `heapq.nlargest`.
+
+        Returns:
+        list
+            Up to `k` values in the order produced by `selector`, with duplicates
+            repeated according to their frequency.
+
+        Time Complexity:
+        O(N * log(K))
 
         """
-        copy = self._copy()
-        while len(copy) > 0:
-            yield copy.pop()
+        values, frequencies = self.values, self.frequencies
+        slots = range(len(values))
+        if self.dead:
+            # Lazily removed slots have frequency 0 and must not take a place in the selection.
+            slots = [idx for idx in slots if frequencies[idx]]
+        result = []
+        for idx in selector(k, slots, key=self.priorities.__getitem__):
+            result.extend([values[idx]] * min(frequencies[idx], k - len(result)))
+            if len(result) >= k:
+                break
+        return result
+
+    def _validate_k(self, k):
+        """
+        Raise a ValueError unless `k` is a non-negative integer.
+
+        Time Complexity:
+        O(1)
+
+        """
+        if not isinstance(k, int):
+            raise ValueError("k must be an integer")
+        if k < 0:
+            raise ValueError("k must be at least 0")
 
     def to_sorted_list(self):
         """
@@ -479,13 +1727,23 @@ class IndexedHeap(ABC):
             (MinHeap: ascending, MaxHeap: descending).
 
         Notes:
-        Internally uses the `__iter__` method.
+        The slot indices are sorted by priority in a single `sorted` call and then
+        expanded by frequency, rather than popping from a copy of the heap.
 
         Time Complexity:
         O(N * log(N))
 
         """
-        return list(self)
+        values, frequencies = self.values, self.frequencies
+        order = sorted(range(len(values)), key=self.priorities.__getitem__, reverse=self._descending)
+        result = []
+        for idx in order:
+            frequency = frequencies[idx]
+            if frequency == 1:
+                result.append(values[idx])
+            else:
+                result.extend([values[idx]] * frequency)
+        return result
     
     def __str__(self):
         """
@@ -524,7 +1782,7 @@ class IndexedHeap(ABC):
         O(1)
 
         """
-        found, _, _ = self._value_in_heap(value)
+        found, _ = self._value_in_heap(value)
         return found
         
     @abstractmethod
@@ -556,8 +1814,8 @@ class IndexedHeap(ABC):
 
             - `other` is an instance of the same heap subclass (e.g. both MinHeap),
             - Both heaps contain the same number of items,
-            - Each position `i` in the internal heap array contains a `HeapItem` with
-            the same value and frequency,
+            - Each slot `i` in the internal heap arrays holds the same value,
+            frequency and priority,
             - And the internal `value_to_index` mappings agree for all values.
 
         Notes:
@@ -572,18 +1830,20 @@ class IndexedHeap(ABC):
         """
         if not self._is_class(other):
             return False
-        elif len(self.heap) != len(other.heap):
+        elif len(self.values) != len(other.values):
             return False
-        for i in range(len(self.heap)):
-            if self.heap[i] != other.heap[i]:
+        for i in range(len(self.values)):
+            if self.values[i] != other.values[i]:
                 return False
             try:
-                if self.value_to_index[self.heap[i].value] != other.value_to_index[other.heap[i].value]:
+                if self.value_to_index[self.values[i]] != other.value_to_index[other.values[i]]:
                     return False
             except KeyError:
                 return False
             
-            if self.heap[i].frequency != other.heap[i].frequency:
+            if self.frequencies[i] != other.frequencies[i]:
+                return False
+            if self.priorities[i] != other.priorities[i]:
                 return False
         return True
     
@@ -663,7 +1923,7 @@ class IndexedHeap(ABC):
         except Exception:
             return False
     
-    def _validate_value(self, value):
+    def _validate_value(self, value, priority = None):
         """
         Validate whether a value can be inserted into the heap.
 
@@ -671,27 +1931,42 @@ class IndexedHeap(ABC):
         1. Hashability: Values must be hashable to support dictionary-based indexing.
         2. Self-equatability: Values must be equatable to themselves (`value == value`) to ensure
         consistent behaviour in frequency tracking and equality comparisons.
-        3. Comparability: Values must be comparable with existing heap elements according to
-        the heap's ordering rules (`<` for MinHeap, `>` for MaxHeap).
+        3. Comparability: The priority (the value itself unless given) must be comparable with
+        existing heap priorities according to the heap's ordering rules (`<` for MinHeap, `>` for MaxHeap).
+        A value already in the heap inserted without a priority keeps its stored priority, so
+        this check is skipped for it.
 
         Parameters:
         value : Any
             The value to validate for insertion into the heap.
+        priority : Any, optional
+            The priority the value will be ordered by. Defaults to the value itself.
 
         Raises:
         TypeError
             - If the value is not hashable.
             - If the value is not equatable to itself.
-            - If the value cannot be compared with existing heap elements.
+            - If the priority cannot be compared with existing heap priorities.
 
         Notes:
         - This method ensures that all heap operations relying on value comparison, hashing, and
         equality tracking will behave correctly.
+        - If the heap was created with a `value_type`, checks 1 to 3 were performed once on the
+        type and only an `isinstance` check is made here (for the value's own priority too).
         
         Time complexity:
         O(1)
 
         """
+        value_type = self.value_type
+        if value_type is not None:
+            if type(value) is not value_type and not isinstance(value, value_type):
+                raise TypeError(f"Cannot insert value into heap: {value!r} is not an instance of {value_type}.")
+            if priority is not None:
+                self._validate_priority(priority)
+            elif self.typecode is not None and value not in self.value_to_index:
+                array(self.typecode, (value,))
+            return
         is_hashable = self._is_hashable(value)
         if not is_hashable:
             raise TypeError(
@@ -704,38 +1979,145 @@ class IndexedHeap(ABC):
                 f"Cannot insert value into heap: {value!r} is not equatable to itself. "
                 "All values must implement __eq__ consistently."
             )
-        if len(self.heap) > 0:
-            is_comparable, type1, type2 = self._is_comparable(value, self.heap[-1].value)
-            if not is_comparable:
-                raise TypeError(f"All values in the heap must be comparable. {type1} and {type2} are not comparable.")
-    
-class MinHeap(IndexedHeap):
+        if priority is None:
+            if value in self.value_to_index:
+                # A value already in the heap keeps its stored priority.
+                return
+            priority = value
+        self._validate_priority(priority)
+
+    def _validate_batch(self, values):
+        """
+        Validate a batch of values for the bulk constructors, checking their types once.
 
-    """
-    Min-heap implementation of the IndexedHeap class.
+        If every value has the same type, that type is validated once as for `value_type`
+        (hashable and orderable) and the first two values are compared. Otherwise, or if an
+        instance does not match the heap's `value_type`, each value is validated individually
+        as by `insert_many`. With a `typecode`, the values are also converted to an array once.
 
-    Elements are ordered such that the smallest element is at the root.
+        Parameters:
+        values : list
+            The values to validate.
 
-    """
-    def _comes_before(self, a, b):
+        Raises:
+        TypeError
+            If the values are not hashable and mutually comparable.
+
+        Notes:
+        As with `value_type`, instances of a single validated type are trusted to be
+        hashable, equatable to themselves and mutually comparable.
+
+        Time complexity:
+        O(N), mostly in C for a single type.
+
+        """
+        types = set(map(type, values))
+        value_type = self.value_type
+        if value_type is None and len(types) == 1:
+            self._validate_type(types.pop(), hashable = True)
+            if len(values) > 1:
+                self._ensure_comparable(values[0], values[1])
+        elif value_type is None or not all(issubclass(type_, value_type) for type_ in types):
+            for i, value in enumerate(values):
+                self._validate_value(value)
+                if i > 0 and value_type is None:
+                    self._ensure_comparable(value, values[i - 1])
+        if self.typecode is not None:
+            array(self.typecode, values)
+
+    def _validate_priority(self, priority):
         """
-        Determine the ordering between two `HeapItem` objects for a min-heap.
+        Validate whether a priority can be compared with the priorities already in the heap.
 
         Parameters:
-        a : HeapItem
-            The first heap item to compare.
-        b : HeapItem
-            The second heap item to compare.
+        priority : Any
+            The priority to validate.
 
-        Returns:
-        bool
-            True if `a` should come before `b` in the min-heap (i.e. a < b).
+        Raises:
+        TypeError
+            If the priority cannot be compared with existing heap priorities, is not an
+            instance of the heap's `priority_type`, or is not representable by its `typecode`.
 
-        Time Complexity:
+        Time complexity:
+        O(1)
+
+        """
+        if self.typecode is not None:
+            # Converted here, before any slot is modified, so a rejected priority cannot
+            # leave the parallel slot arrays out of step.
+            array(self.typecode, (priority,))
+        priority_type = self.priority_type
+        if priority_type is not None:
+            if type(priority) is not priority_type and not isinstance(priority, priority_type):
+                raise TypeError(f"Cannot insert priority into heap: {priority!r} is not an instance of {priority_type}.")
+            return
+        if len(self.values) > 0:
+            self._ensure_comparable(priority, self.priorities[-1])
+
+    def _validate_type(self, value_type, *, hashable):
+        """
+        Validate once, at construction, that instances of a type can be stored in the heap.
+
+        Parameters:
+        value_type : type
+            The type to validate.
+        hashable : bool
+            Whether instances must be hashable, i.e. whether the type is used for values
+            (which key the index dictionary) rather than for separate priorities.
+
+        Raises:
+        TypeError
+            - If `value_type` is not a type.
+            - If `hashable` is True and the type is not hashable.
+            - If the type defines neither `__lt__` nor `__gt__`.
+
+        Time complexity:
+        O(1)
+
+        """
+        if not isinstance(value_type, type):
+            raise TypeError(f"Expected a type, got {value_type!r}")
+        if hashable and value_type.__hash__ is None:
+            raise TypeError(f"{value_type} is not hashable. All values must implement __hash__.")
+        if value_type.__lt__ is object.__lt__ and value_type.__gt__ is object.__gt__:
+            raise TypeError(f"{value_type} is not comparable. Values must implement __lt__ or __gt__.")
+
+    def _ensure_comparable(self, a, b):
+        """
+        Raise if two priorities cannot be compared according to the heap's ordering rules.
+
+        Parameters:
+        a : Any
+            The first priority.
+        b : Any
+            The second priority.
+
+        Raises:
+        TypeError
+            If `a` and `b` are not comparable.
+
+        Time complexity:
         O(1)
 
         """
-        return a < b
+        is_comparable, type1, type2 = self._is_comparable(a, b)
+        if not is_comparable:
+            raise TypeError(f"All values in the heap must be comparable. {type1} and {type2} are not comparable.")
+    
+class MinHeap(IndexedHeap):
+
+    """
+    Min-heap implementation of the IndexedHeap class.
+
+    Elements are ordered such that the smallest element is at the root.
+
+    """
+    # Sorted order runs from smallest to largest.
+    _descending = False
+
+    # Priority `a` comes before priority `b` in the min-heap if a < b. Bound directly to
+    # `operator.lt` so the sift loops compare raw priority slots without a Python-level call.
+    _comes_before = staticmethod(lt)
     
     def _is_comparable(self, a, b):
         """
@@ -791,25 +2173,12 @@ class MaxHeap(IndexedHeap):
     Elements are ordered such that the greatest element is at the root.
 
     """
-    def _comes_before(self, a, b):
-        """
-        Determine the ordering between two `HeapItem` objects for a max-heap.
-
-        Parameters:
-        a : HeapItem
-            The first heap item to compare.
-        b : HeapItem
-            The second heap item to compare.
-
-        Returns:
-        bool
-            True if `a` should come before `b` in the max-heap (i.e. a > b).
-        
-        Time Complexity:
-        O(1)
+    # Sorted order runs from largest to smallest.
+    _descending = True
 
-        """
-        return a > b
+    # Priority `a` comes before priority `b` in the max-heap if a > b. Bound directly to
+    # `operator.gt` so the sift loops compare raw priority slots without a Python-level call.
+    _comes_before = staticmethod(gt)
     
     def _is_comparable(self, a, b):
         """
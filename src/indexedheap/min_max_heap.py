@@ -0,0 +1,318 @@
+from operator import lt, gt
+from .indexed_heap import IndexedHeap
+
+class IndexedMinMaxHeap(IndexedHeap):
+    """
+    Double-ended indexed heap with O(1) access to both the smallest and the largest value.
+
+    Uses the min-max heap layout over the same `values`/`priorities`/`frequencies` slots and
+    `value_to_index` mapping as `IndexedHeap`: nodes on even levels (the root's level) are no
+    greater than all of their descendants, nodes on odd levels no smaller. The smallest value is
+    therefore the root and the largest one of its children.
+
+    All `IndexedHeap` operations are available, with `peek`/`pop` acting on the minimum.
+    Priorities must support both `<` and `>`.
+
+    Time Complexity Overview (N = number of unique items in the heap):
+    - insert: O(log(N))
+    - peek_min / peek_max: O(1)
+    - pop_min / pop_max: O(log(N))
+    - remove: O(log(N))
+    - count: O(1)
+    - update_priority: O(log(N))
+    - to_sorted_list / iteration: O(N * log(N))
+
+    """
+    # The root holds the minimum, so `_comes_before` is the min-level ordering.
+    _comes_before = staticmethod(lt)
+    _descending = False
+
+    def __init__(self, arr = None, *, typecode = None, value_type = None, priority_type = None):
+        """
+        Initialize the heap with an optional list of values.
+
+        Parameters are as for `IndexedHeap`, except that the layout is always binary.
+
+        Time Complexity:
+        O(N)
+
+        """
+        super().__init__(arr, typecode = typecode, value_type = value_type, priority_type = priority_type)
+
+    def _is_min_level(self, idx):
+        """
+        Return True if the slot at `idx` is on a min level (even depth).
+        """
+        return (idx + 1).bit_length() % 2 == 1
+
+    def _swap(self, i, j):
+        """
+        Swap two slots and update the index dictionary.
+        """
+        values, priorities, frequencies = self.values, self.priorities, self.frequencies
+        values[i], values[j] = values[j], values[i]
+        priorities[i], priorities[j] = priorities[j], priorities[i]
+        frequencies[i], frequencies[j] = frequencies[j], frequencies[i]
+        self.value_to_index[values[i]] = i
+        self.value_to_index[values[j]] = j
+
+    def _bubble_up(self, idx, min_level):
+        """
+        Move the slot at `idx` up through its grandparents on levels of the same kind.
+
+        Returns:
+        int
+            The final index of the slot.
+
+        """
+        priorities = self.priorities
+        while idx > 2:
+            grandparent_idx = ((idx - 1) // 2 - 1) // 2
+            if min_level:
+                moves = priorities[idx] < priorities[grandparent_idx]
+            else:
+                moves = priorities[idx] > priorities[grandparent_idx]
+            if not moves:
+                break
+            self._swap(idx, grandparent_idx)
+            idx = grandparent_idx
+        return idx
+
+    def _sift_up(self, idx = None):
+        """
+        Move the slot at `idx` toward the root until the min-max property is restored.
+
+        If the slot belongs on the opposite kind of level, it is swapped with its parent, the
+        displaced parent is sifted down into the subtree, and the slot continues upward through
+        grandparents on the parent's level kind.
+
+        Parameters:
+        idx : int, optional
+            Index of the slot to sift up. Defaults to the last element.
+
+        Returns:
+        int
+            The final index of the slot after sifting.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        n = len(self.values)
+        if idx == None:
+            idx = n-1
+        if idx < 0 or idx >= n:
+            raise ValueError(f"idx out of range, idx: {idx}, heap size: {n}")
+        if idx == 0:
+            return idx
+        priorities = self.priorities
+        parent_idx = (idx - 1) // 2
+        min_level = self._is_min_level(idx)
+        # On a min level the parent is a max node, so a larger priority belongs above it.
+        outranks_parent = gt if min_level else lt
+        if outranks_parent(priorities[idx], priorities[parent_idx]):
+            self._swap(idx, parent_idx)
+            self._sift_down(idx)
+            return self._bubble_up(parent_idx, not min_level)
+        return self._bubble_up(idx, min_level)
+
+    def _sift_down(self, idx = None):
+        """
+        Move the slot at `idx` away from the root until the min-max property is restored.
+
+        At each step the slot is compared with the best of its children and grandchildren
+        for its level kind, and swapped with it if that one should be above it.
+
+        Parameters:
+        idx : int, optional
+            Index of the slot to sift down. Defaults to the first element.
+
+        Returns:
+        int
+            The final index of the slot after sifting.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        n = len(self.values)
+        if idx == None:
+            idx = 0
+        if idx < 0 or idx >= n:
+            raise ValueError(f"idx out of range, idx: {idx}, heap size: {n}")
+        priorities = self.priorities
+        comes_before = lt if self._is_min_level(idx) else gt
+        position = idx
+        while 2 * idx + 1 < n:
+            first_child = 2 * idx + 1
+            first_grandchild = 2 * first_child + 1
+            best_idx = first_child
+            for candidate in (first_child + 1, first_grandchild, first_grandchild + 1,
+                              first_grandchild + 2, first_grandchild + 3):
+                if candidate >= n:
+                    break
+                if comes_before(priorities[candidate], priorities[best_idx]):
+                    best_idx = candidate
+            if not comes_before(priorities[best_idx], priorities[idx]):
+                break
+            self._swap(best_idx, idx)
+            if position == idx:
+                position = best_idx
+            if best_idx < first_grandchild:
+                break
+            parent_idx = (best_idx - 1) // 2
+            if comes_before(priorities[parent_idx], priorities[best_idx]):
+                self._swap(best_idx, parent_idx)
+                if position == best_idx:
+                    position = parent_idx
+            idx = best_idx
+        return position
+
+    def _restore(self, idx):
+        """
+        Restore the min-max property for a slot whose value or priority was replaced.
+
+        A slot that belongs above one of its ancestors also bounds its whole subtree, so it
+        only needs to move up; otherwise it is sifted down.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        new_idx = self._sift_up(idx)
+        if new_idx == idx:
+            new_idx = self._sift_down(idx)
+        return new_idx
+
+    def _set_priority(self, idx, priority):
+        """
+        Replace the priority of the slot at `idx` and restore the min-max property.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        self.priorities[idx] = priority
+        return self._restore(idx)
+
+    def _max_index(self):
+        """
+        Return the index of the slot with the largest priority, or None if the heap is empty.
+        """
+        n = len(self.values)
+        if n == 0:
+            return None
+        if n == 1:
+            return 0
+        if n == 2 or self.priorities[1] >= self.priorities[2]:
+            return 1
+        return 2
+
+    def peek_min(self):
+        """
+        Return the smallest value without removing it, or None if the heap is empty.
+
+        Time Complexity:
+        O(1)
+
+        """
+        return self.peek()
+
+    def peek_max(self):
+        """
+        Return the largest value without removing it, or None if the heap is empty.
+
+        Time Complexity:
+        O(1)
+
+        """
+        idx = self._max_index()
+        return None if idx is None else self.values[idx]
+
+    def pop_min(self):
+        """
+        Remove and return the smallest value.
+
+        Raises:
+        IndexError
+            If called on an empty heap.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        return self.pop()
+
+    def pop_max(self):
+        """
+        Remove and return the largest value.
+
+        If the largest value has a frequency greater than 1, its frequency is decremented instead.
+
+        Raises:
+        IndexError
+            If called on an empty heap.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        idx = self._max_index()
+        if idx is None:
+            raise IndexError("Pop from empty heap")
+        self.size -= 1
+        frequency = self.frequencies[idx]
+        if frequency > 1:
+            self.frequencies[idx] = frequency - 1
+            return self.values[idx]
+        return self._delete_at(idx)[0]
+
+    def __iter__(self):
+        """
+        Iterate over the heap's values from smallest to largest, without modifying the heap.
+
+        The min-max layout does not order children relative to their parent in a single
+        direction, so this iterates over `to_sorted_list()` rather than walking the tree.
+
+        Time Complexity:
+        O(N * log(N))
+
+        """
+        return iter(self.to_sorted_list())
+
+    @classmethod
+    def _from_slots(cls, values, frequencies, *, heapify, **heap_options):
+        """
+        Create a heap for the bulk constructors, always heapifying: a sorted array is not in
+        min-max order, so `from_sorted` builds the heap as `from_iterable` does.
+
+        Time Complexity:
+        O(N)
+
+        """
+        return super()._from_slots(values, frequencies, heapify = True, **heap_options)
+
+    def _is_comparable(self, a, b):
+        """
+        Check if two values can be compared using both `<` and `>`.
+
+        Returns:
+        tuple
+            (is_comparable, type(a), type(b))
+
+        Time Complexity:
+        O(1)
+
+        """
+        try:
+            a < b
+            a > b
+            return (True, type(a), type(b))
+        except TypeError:
+            return (False, type(a), type(b))
+
+    def _is_class(self, other):
+        """
+        Check if another object is an IndexedMinMaxHeap instance.
+        """
+        return isinstance(other, IndexedMinMaxHeap)
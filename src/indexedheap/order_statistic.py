@@ -0,0 +1,511 @@
+import itertools
+from random import random
+
+class _TreapNode:
+    """
+    A node of an order-statistic treap.
+
+    Nodes are in binary-search-tree order by `key`, a `(priority, sequence)` pair that keeps
+    equal priorities distinct, and in max-heap order by the random `weight`. `size` is the
+    number of values in the subtree, counting duplicates.
+
+    """
+    __slots__ = ("value", "key", "weight", "count", "size", "left", "right")
+
+    def __init__(self, value, key, count):
+        self.value = value
+        self.key = key
+        self.weight = random()
+        self.count = count
+        self.size = count
+        self.left = None
+        self.right = None
+
+def _size(node):
+    return node.size if node is not None else 0
+
+def _update(node):
+    """
+    Recompute a node's subtree size from its children.
+    """
+    node.size = node.count + _size(node.left) + _size(node.right)
+
+def _split(node, key):
+    """
+    Split a subtree into the nodes with keys before `key` and the rest.
+
+    Keys are `(priority, sequence)` pairs, so splitting at `(priority,)` separates the
+    priorities below `priority` from the others. Every comparison is made before any node
+    is modified, so an incomparable key leaves the tree intact.
+
+    Returns:
+    tuple
+        (left subtree, right subtree)
+
+    Time Complexity:
+    O(log(N)) expected
+
+    """
+    if node is None:
+        return (None, None)
+    if node.key < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        _update(node)
+        return (node, right)
+    left, right = _split(node.left, key)
+    node.left = right
+    _update(node)
+    return (left, node)
+
+def _merge(left, right):
+    """
+    Join two subtrees, where every key of `left` comes before every key of `right`.
+
+    Time Complexity:
+    O(log(N)) expected
+
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.weight > right.weight:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+def _build(nodes):
+    """
+    Build a treap from nodes already sorted by key, with a stack along the right spine.
+
+    Returns:
+    _TreapNode or None
+        The root.
+
+    Time Complexity:
+    O(N)
+
+    """
+    spine = []
+    for node in nodes:
+        last = None
+        while spine and spine[-1].weight < node.weight:
+            last = spine.pop()
+            _update(last)
+        node.left = last
+        if spine:
+            spine[-1].right = node
+        spine.append(node)
+    root = spine[0] if spine else None
+    while spine:
+        _update(spine.pop())
+    return root
+
+class OrderStatisticHeap:
+    """
+    Indexed min-priority collection answering order-statistic queries without draining.
+
+    Values are kept in a treap (a binary search tree balanced by random node weights) ordered
+    by priority, where each node stores its value's frequency and the number of values in its
+    subtree. A dictionary maps each value to its node, as `value_to_index` does in
+    `IndexedHeap`. This supports the usual indexed-heap operations alongside:
+
+    - `rank(priority)`: the number of values with a lower priority.
+    - `kth(k)`: the value at position `k` in sorted order.
+    - `count_range(lo, hi)`: the number of values with `lo <= priority < hi`.
+    - `pop_range(lo, hi)`: remove and return those values in sorted order.
+
+    Duplicates count once per occurrence in every query. Values with equal priorities are
+    ordered by insertion.
+
+    Time Complexity Overview (N = number of unique items, all expected):
+    - insert: O(log(N))
+    - pop: O(log(N))
+    - peek: O(log(N))
+    - remove: O(log(N))
+    - count: O(1)
+    - rank / kth / count_range: O(log(N))
+    - pop_range: O(log(N) + K) for K removed values
+
+    """
+
+    def __init__(self, arr = None):
+        """
+        Initialize the collection with an optional list of values.
+
+        Parameters:
+        arr : list, optional
+            Initial values. Duplicate values are merged and tracked via a frequency counter.
+
+        Raises:
+        TypeError
+            If `arr` is not a list, or its values are not hashable and comparable.
+
+        Time Complexity:
+        O(N * log(N)) to sort the values, then O(N) to build the tree.
+
+        """
+        if arr == None:
+            arr = []
+        if not isinstance(arr, list):
+            raise TypeError("arr must be a list")
+        self.root = None
+        self._sequence = itertools.count()
+        tally = {}
+        for value in arr:
+            self._validate(value, value)
+            tally[value] = tally.get(value, 0) + 1
+        try:
+            ordered = sorted(tally)
+        except TypeError:
+            raise TypeError("All values in the heap must be comparable.")
+        sequence = self._sequence
+        nodes = [_TreapNode(value, (value, next(sequence)), tally[value]) for value in ordered]
+        self.root = _build(nodes)
+        self.value_to_node = {node.value: node for node in nodes}
+        self.size = len(arr)
+
+    def _validate(self, value, priority):
+        """
+        Raise a TypeError unless the value is hashable and its priority comparable with the root's.
+        A priority of None is not checked.
+        """
+        try:
+            hash(value)
+        except TypeError:
+            raise TypeError(
+                f"Cannot insert value into heap: {value!r} is not hashable. "
+                "All values must implement __hash__."
+            )
+        if priority is not None and self.root is not None:
+            existing = self.root.key[0]
+            try:
+                existing < priority
+                priority < existing
+            except TypeError:
+                raise TypeError(f"All values in the heap must be comparable. {type(existing)} and {type(priority)} are not comparable.")
+
+    def _adjust_path(self, node, delta):
+        """
+        Add `delta` to a node's count and to the size of every subtree containing it.
+
+        Time Complexity:
+        O(log(N)) expected
+
+        """
+        key = node.key
+        current = self.root
+        while current is not node:
+            current.size += delta
+            current = current.left if key < current.key else current.right
+        node.count += delta
+        node.size += delta
+        self.size += delta
+
+    def _delete_node(self, node):
+        """
+        Remove a node and all occurrences of its value.
+
+        Time Complexity:
+        O(log(N)) expected
+
+        """
+        left, rest = _split(self.root, node.key)
+        # `rest` starts with `node`, whose key is the smallest in it.
+        middle, right = _split(rest, (node.key[0], node.key[1] + 1))
+        self.root = _merge(left, right)
+        del self.value_to_node[node.value]
+        self.size -= node.count
+
+    def insert(self, value, *, count = 1, priority = None):
+        """
+        Insert a value, or add occurrences of a value already present.
+
+        Parameters:
+        value : Any
+            The value to insert. Must be hashable.
+        count : int, optional
+            Number of occurrences to add. Defaults to 1.
+        priority : Any, optional
+            The priority the value is ordered by. Defaults to the value itself, or to the
+            stored priority for a value already present. Giving a different priority for a
+            value already present moves all of its occurrences.
+
+        Raises:
+        ValueError
+            If `count` is not a positive integer.
+        TypeError
+            If the value is not hashable or its priority is not comparable.
+
+        Time Complexity:
+        O(log(N)) expected
+
+        """
+        if not isinstance(count, int) or count < 1:
+            raise ValueError("Count must be a positive integer")
+        self._validate(value, priority)
+        node = self.value_to_node.get(value)
+        if node is not None:
+            if priority is None or node.key[0] == priority:
+                self._adjust_path(node, count)
+                return
+            count += node.count
+            self._delete_node(node)
+        elif priority is None:
+            priority = value
+            self._validate(value, priority)
+        node = _TreapNode(value, (priority, next(self._sequence)), count)
+        left, right = _split(self.root, node.key)
+        self.root = _merge(_merge(left, node), right)
+        self.value_to_node[value] = node
+        self.size += count
+
+    def insert_many(self, values):
+        """
+        Insert every value of an iterable.
+
+        Time Complexity:
+        O(K * log(N)) expected
+
+        """
+        for value in values:
+            self.insert(value)
+
+    def remove(self, value, *, count = 1, strict = True):
+        """
+        Remove occurrences of a value.
+
+        Parameters:
+        value : Any
+            The value to remove.
+        count : int, optional
+            Number of occurrences to remove. Defaults to 1.
+        strict : bool, default True
+            If True, raise when the value is missing or `count` exceeds its frequency. If
+            False, remove as many occurrences as possible.
+
+        Returns:
+        bool
+            True if the value was present, False if it was not and `strict=False`.
+
+        Raises:
+        KeyError
+            If `strict=True` and the value is not present.
+        ValueError
+            If `count` is invalid, or exceeds the value's frequency with `strict=True`.
+
+        Time Complexity:
+        O(log(N)) expected
+
+        """
+        if not isinstance(count, int) or count < 1:
+            raise ValueError("Count must be a positive integer")
+        node = self.value_to_node.get(value)
+        if node is None:
+            if strict:
+                raise KeyError(f"{value} not in heap")
+            return False
+        if count > node.count:
+            if strict:
+                raise ValueError(f"Count must be less than or equal to the value's frequency ({node.count})")
+            count = node.count
+        if count == node.count:
+            self._delete_node(node)
+        else:
+            self._adjust_path(node, -count)
+        return True
+
+    def _first(self):
+        node = self.root
+        while node.left is not None:
+            node = node.left
+        return node
+
+    def peek(self):
+        """
+        Return the value with the lowest priority without removing it, or None if empty.
+
+        Time Complexity:
+        O(log(N)) expected
+
+        """
+        if self.root is None:
+            return None
+        return self._first().value
+
+    def pop(self):
+        """
+        Remove and return one occurrence of the value with the lowest priority.
+
+        Raises:
+        IndexError
+            If called on an empty heap.
+
+        Time Complexity:
+        O(log(N)) expected
+
+        """
+        if self.root is None:
+            raise IndexError("Pop from empty heap")
+        node = self._first()
+        if node.count == 1:
+            self._delete_node(node)
+        else:
+            self._adjust_path(node, -1)
+        return node.value
+
+    def count(self, value):
+        """
+        Return the frequency of a value, or 0 if it is not present.
+
+        Time Complexity:
+        O(1)
+
+        """
+        node = self.value_to_node.get(value)
+        return 0 if node is None else node.count
+
+    def priority(self, value):
+        """
+        Return the priority of a value.
+
+        Raises:
+        KeyError
+            If the value is not present.
+
+        Time Complexity:
+        O(1)
+
+        """
+        node = self.value_to_node.get(value)
+        if node is None:
+            raise KeyError(f"{value} not in heap")
+        return node.key[0]
+
+    def rank(self, priority):
+        """
+        Return the number of values (counting duplicates) with a priority lower than `priority`.
+
+        Time Complexity:
+        O(log(N)) expected
+
+        """
+        key = (priority,)
+        node = self.root
+        rank = 0
+        while node is not None:
+            if node.key < key:
+                rank += _size(node.left) + node.count
+                node = node.right
+            else:
+                node = node.left
+        return rank
+
+    def kth(self, k):
+        """
+        Return the value at position `k` (from 0) in sorted order, counting duplicates.
+
+        Raises:
+        IndexError
+            If `k` is not between 0 and `len(self) - 1`.
+
+        Time Complexity:
+        O(log(N)) expected
+
+        """
+        if not isinstance(k, int) or not 0 <= k < self.size:
+            raise IndexError(f"k must be an integer between 0 and {self.size - 1}, got {k!r}")
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k < left_size + node.count:
+                return node.value
+            else:
+                k -= left_size + node.count
+                node = node.right
+
+    def count_range(self, lo, hi):
+        """
+        Return the number of values (counting duplicates) with `lo <= priority < hi`.
+
+        Time Complexity:
+        O(log(N)) expected
+
+        """
+        return max(0, self.rank(hi) - self.rank(lo))
+
+    def pop_range(self, lo, hi):
+        """
+        Remove and return every value with `lo <= priority < hi`, in sorted order.
+
+        Returns:
+        list
+            The removed values, each repeated by its frequency.
+
+        Time Complexity:
+        O(log(N) + K) expected for K removed values
+
+        """
+        left, rest = _split(self.root, (lo,))
+        try:
+            middle, right = _split(rest, (hi,))
+        except TypeError:
+            # The first split already relinked the tree, so join it back before raising.
+            self.root = _merge(left, rest)
+            raise
+        self.root = _merge(left, right)
+        result = list(self._in_order(middle))
+        for value in result:
+            self.value_to_node.pop(value, None)
+        self.size -= _size(middle)
+        return result
+
+    def _in_order(self, node):
+        """
+        Yield the values of a subtree in sorted order, each repeated by its frequency.
+        """
+        stack = []
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+                continue
+            node = stack.pop()
+            for _ in range(node.count):
+                yield node.value
+            node = node.right
+
+    def __iter__(self):
+        """
+        Iterate over the values in sorted order, each repeated by its frequency.
+
+        Time Complexity:
+        O(N)
+
+        """
+        return self._in_order(self.root)
+
+    def to_sorted_list(self):
+        """
+        Return the values in sorted order, each repeated by its frequency.
+
+        Time Complexity:
+        O(N)
+
+        """
+        return list(self)
+
+    def __contains__(self, value):
+        return value in self.value_to_node
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.size > 0
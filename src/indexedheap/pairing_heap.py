@@ -0,0 +1,576 @@
+from operator import lt, gt
+
+class _PairingNode:
+    """
+    A node of a pairing heap.
+
+    `prev` points to the parent if the node is its parent's leftmost child, otherwise
+    to the node's left sibling. `child` is the leftmost child and `sibling` the right sibling.
+
+    """
+    __slots__ = ("value", "priority", "frequency", "child", "sibling", "prev")
+
+    def __init__(self, value, priority, frequency):
+        self.value = value
+        self.priority = priority
+        self.frequency = frequency
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+def _rebuild_pairing_heap(heap_class, entries):
+    """
+    Recreate a pairing heap from `(value, priority, frequency)` entries, as pickled by
+    `PairingHeap.__reduce__`, linking each entry under the root without validation.
+
+    Time Complexity:
+    O(N)
+
+    """
+    heap = heap_class()
+    value_to_node = heap.value_to_node
+    root, size = None, 0
+    for value, priority, frequency in entries:
+        node = _PairingNode(value, priority, frequency)
+        value_to_node[value] = node
+        root = heap._link(root, node)
+        size += frequency
+    heap.root, heap.size = root, size
+    return heap
+
+class PairingHeap:
+    """
+    Base class for an indexed pairing heap, an alternative backend to `IndexedHeap`.
+
+    Values are stored in a multi-way tree of nodes, alongside a dictionary that maps each value to
+    its node. It shares the public API of `IndexedHeap` (insert, pop, peek, remove, count, priorities
+    and frequency tracking), but trades the compact array layout for cheaper restructuring: inserting,
+    melding two trees and moving a value towards the root are O(1), with the deferred work paid for by
+    the two-pass pairing performed on pop.
+
+    Use `PairingMinHeap` or `PairingMaxHeap`, or `create_heap(backend="pairing")`.
+
+    Time Complexity Overview (N = number of unique items in the heap):
+    - insert: O(1)
+    - pop: O(log(N)) amortised
+    - peek: O(1)
+    - remove: O(log(N)) amortised
+    - count: O(1)
+    - decrease_key (MinHeap) / increase_key (MaxHeap): O(1) amortised
+    - meld: O(min(N, M)) to combine the index dictionaries, O(1) to link the trees
+    - to_sorted_list: O(N * log(N))
+
+    """
+    _comes_before = None
+
+    def __init__(self, arr = None):
+        """
+        Initialize the heap with an optional list of values.
+
+        Parameters:
+        arr : list, optional
+            Initial values to populate the heap. Duplicate values are merged
+            and tracked via an internal frequency counter.
+
+        Raises:
+        TypeError
+            If `arr` is not a list, or its values are not hashable, equatable and comparable.
+
+        Time Complexity:
+        O(N)
+
+        """
+        if arr == None:
+            arr = []
+        if not isinstance(arr, list):
+            raise TypeError("arr must be a list")
+        self.root = None
+        self.value_to_node = {}
+        self.size = 0
+        for value in arr:
+            self.insert(value)
+
+    def _link(self, a, b):
+        """
+        Link two tree roots, making the one that comes after a child of the other.
+
+        Returns:
+        _PairingNode or None
+            The root of the linked tree.
+
+        Time Complexity:
+        O(1)
+
+        """
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if self._comes_before(b.priority, a.priority):
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        return a
+
+    def _detach(self, node):
+        """
+        Cut the subtree rooted at a non-root node out of the tree.
+
+        Time Complexity:
+        O(1)
+
+        """
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.prev = node.sibling = None
+
+    def _combine(self, first):
+        """
+        Combine a list of sibling subtrees into one tree with the standard two-pass pairing.
+
+        Parameters:
+        first : _PairingNode or None
+            The leftmost sibling.
+
+        Returns:
+        _PairingNode or None
+            The root of the combined tree.
+
+        Time Complexity:
+        O(log(N)) amortised
+
+        """
+        pairs = []
+        node = first
+        while node is not None:
+            second = node.sibling
+            following = second.sibling if second is not None else None
+            node.prev = node.sibling = None
+            if second is not None:
+                second.prev = second.sibling = None
+            pairs.append(self._link(node, second))
+            node = following
+        root = None
+        for tree in reversed(pairs):
+            root = self._link(tree, root)
+        return root
+
+    def _delete_node(self, node):
+        """
+        Remove a node from the tree entirely, regardless of its frequency.
+
+        The caller is responsible for `self.value_to_node` and `self.size`.
+
+        Time Complexity:
+        O(log(N)) amortised
+
+        """
+        children = self._combine(node.child)
+        node.child = None
+        if node is self.root:
+            self.root = children
+        else:
+            self._detach(node)
+            self.root = self._link(self.root, children)
+
+    def _validate_value(self, value, priority):
+        """
+        Validate that a value is hashable and equatable, and its priority comparable with the heap's.
+
+        A priority of None stands for the value itself, unless the value is already in the heap,
+        in which case it keeps its stored priority and the comparability check is skipped.
+
+        Raises:
+        TypeError
+            If any of the checks fails.
+
+        Time Complexity:
+        O(1)
+
+        """
+        try:
+            hash(value)
+        except TypeError:
+            raise TypeError(
+                f"Cannot insert value into heap: {value!r} is not hashable. "
+                "All values must implement __hash__."
+            )
+        try:
+            is_self_equatable = value == value
+        except Exception:
+            is_self_equatable = False
+        if not is_self_equatable:
+            raise TypeError(
+                f"Cannot insert value into heap: {value!r} is not equatable to itself. "
+                "All values must implement __eq__ consistently."
+            )
+        if priority is None:
+            if value in self.value_to_node:
+                return
+            priority = value
+        self._validate_priority(priority)
+
+    def _validate_priority(self, priority):
+        """
+        Validate that a priority is comparable with the root's priority.
+
+        Raises:
+        TypeError
+            If the priorities are not comparable.
+
+        Time Complexity:
+        O(1)
+
+        """
+        if self.root is None:
+            return
+        try:
+            self._comes_before(priority, self.root.priority)
+            self._comes_before(self.root.priority, priority)
+        except TypeError:
+            raise TypeError(
+                f"All values in the heap must be comparable. {type(priority)} and "
+                f"{type(self.root.priority)} are not comparable."
+            )
+
+    def peek(self):
+        """
+        Return the root value of the heap without removing it, or None if the heap is empty.
+
+        Time Complexity:
+        O(1)
+
+        """
+        return None if self.root is None else self.root.value
+
+    def insert(self, value, *, count = 1, priority = None):
+        """
+        Insert a value into the heap.
+
+        If the value already exists, its frequency is incremented, and it is reprioritised
+        if a priority is given.
+
+        Parameters:
+        value : Any
+            The value to insert.
+        count : int, optional
+            Number of occurrences to add. Defaults to 1.
+        priority : Any, optional
+            The priority the value is ordered by. Defaults to the value itself.
+
+        Raises:
+        ValueError
+            If `count` is not a positive integer.
+        TypeError
+            If the value is not hashable or equatable, or its priority is not comparable.
+
+        Time Complexity:
+        O(1)
+
+        """
+        if not isinstance(count, int) or count < 1:
+            raise ValueError("Count must be a positive integer")
+        self._validate_value(value, priority)
+        node = self.value_to_node.get(value)
+        if node is not None:
+            node.frequency += count
+            if priority is not None:
+                self._set_priority(node, priority)
+        else:
+            node = _PairingNode(value, value if priority is None else priority, count)
+            self.value_to_node[value] = node
+            self.root = self._link(self.root, node)
+        self.size += count
+
+    def pop(self):
+        """
+        Remove and return the root value of the heap.
+
+        If the root value has a frequency greater than 1, its frequency is decremented instead.
+
+        Raises:
+        IndexError
+            If called on an empty heap.
+
+        Time Complexity:
+        O(log(N)) amortised
+
+        """
+        root = self.root
+        if root is None:
+            raise IndexError("Pop from empty heap")
+        self.size -= 1
+        if root.frequency > 1:
+            root.frequency -= 1
+            return root.value
+        del self.value_to_node[root.value]
+        self._delete_node(root)
+        return root.value
+
+    def remove(self, value, *, count = 1, strict = True):
+        """
+        Remove a specified number of occurrences of a value from the heap.
+
+        Parameters, return value and errors are as for `IndexedHeap.remove`.
+
+        Time Complexity:
+        O(1) if occurrences remain, otherwise O(log(N)) amortised.
+
+        """
+        node = self.value_to_node.get(value)
+        if node is None:
+            if strict == False:
+                return False
+            raise KeyError(f"{value} not in heap")
+        if not isinstance(count, int):
+            raise ValueError("The count must be an integer")
+        if count < 1:
+            raise ValueError("Count must be at least 1")
+        if count > node.frequency:
+            if strict == False:
+                count = node.frequency
+            else:
+                raise ValueError(f"Count must be less than or equal to value frequency ({node.frequency})")
+        if count < node.frequency:
+            node.frequency -= count
+        else:
+            del self.value_to_node[value]
+            self._delete_node(node)
+        self.size -= count
+        return True
+
+    def _set_priority(self, node, priority):
+        """
+        Replace a node's priority and restore the heap order.
+
+        Moving towards the root cuts the node's subtree and links it to the root in O(1).
+        Moving away from the root deletes the node and links it back in as a new leaf.
+
+        Time Complexity:
+        O(1) towards the root, O(log(N)) amortised otherwise.
+
+        """
+        old_priority = node.priority
+        node.priority = priority
+        if self._comes_before(priority, old_priority):
+            if node is not self.root:
+                self._detach(node)
+                self.root = self._link(self.root, node)
+        elif self._comes_before(old_priority, priority):
+            self._delete_node(node)
+            self.root = self._link(self.root, node)
+
+    def _node(self, value):
+        """
+        Return the node of a value, raising KeyError if it is not in the heap.
+        """
+        node = self.value_to_node.get(value)
+        if node is None:
+            raise KeyError(f"{value} not in heap")
+        return node
+
+    def priority(self, value):
+        """
+        Return the priority of a value in the heap.
+
+        Raises:
+        KeyError
+            If the value is not in the heap.
+
+        Time Complexity:
+        O(1)
+
+        """
+        return self._node(value).priority
+
+    def update_priority(self, value, priority):
+        """
+        Change the priority of a value already in the heap.
+
+        Raises:
+        KeyError
+            If the value is not in the heap.
+        TypeError
+            If the priority is not comparable with existing priorities.
+
+        Time Complexity:
+        O(1) towards the root, O(log(N)) amortised otherwise.
+
+        """
+        node = self._node(value)
+        self._validate_priority(priority)
+        self._set_priority(node, priority)
+
+    def decrease_key(self, value, priority):
+        """
+        Lower the priority of a value already in the heap.
+
+        Raises:
+        KeyError
+            If the value is not in the heap.
+        ValueError
+            If the new priority is greater than the current priority.
+
+        Time Complexity:
+        O(1) amortised for PairingMinHeap.
+
+        """
+        node = self._node(value)
+        self._validate_priority(priority)
+        if node.priority < priority:
+            raise ValueError(f"New priority {priority!r} is greater than current priority {node.priority!r}")
+        self._set_priority(node, priority)
+
+    def increase_key(self, value, priority):
+        """
+        Raise the priority of a value already in the heap.
+
+        Raises:
+        KeyError
+            If the value is not in the heap.
+        ValueError
+            If the new priority is less than the current priority.
+
+        Time Complexity:
+        O(1) amortised for PairingMaxHeap.
+
+        """
+        node = self._node(value)
+        self._validate_priority(priority)
+        if node.priority > priority:
+            raise ValueError(f"New priority {priority!r} is less than current priority {node.priority!r}")
+        self._set_priority(node, priority)
+
+    def meld(self, other):
+        """
+        Move every value of another pairing heap of the same type into this one.
+
+        Values present in both heaps have their frequencies added and keep whichever
+        priority comes first. `other` is left empty.
+
+        Parameters:
+        other : PairingHeap
+            A heap of the same class.
+
+        Raises:
+        TypeError
+            If `other` is not of the same class, or its priorities are not comparable.
+
+        Time Complexity:
+        O(min(N, M)) to combine the index dictionaries, plus O(log(N)) amortised per shared value.
+
+        """
+        if type(other) is not type(self):
+            raise TypeError(f"Cannot meld {type(other).__name__} into {type(self).__name__}")
+        if other is self or other.root is None:
+            return
+        if self.root is not None:
+            self._validate_priority(other.root.priority)
+        if len(other.value_to_node) > len(self.value_to_node):
+            self.root, other.root = other.root, self.root
+            self.value_to_node, other.value_to_node = other.value_to_node, self.value_to_node
+            self.size, other.size = other.size, self.size
+        for value, node in list(other.value_to_node.items()):
+            existing = self.value_to_node.get(value)
+            if existing is None:
+                continue
+            other._delete_node(node)
+            del other.value_to_node[value]
+            existing.frequency += node.frequency
+            if self._comes_before(node.priority, existing.priority):
+                self._set_priority(existing, node.priority)
+        self.value_to_node.update(other.value_to_node)
+        self.root = self._link(self.root, other.root)
+        self.size += other.size
+        other.root, other.value_to_node, other.size = None, {}, 0
+
+    def count(self, value):
+        """
+        Return the frequency of a value in the heap, or 0 if it is not present.
+
+        Time Complexity:
+        O(1)
+
+        """
+        node = self.value_to_node.get(value)
+        return 0 if node is None else node.frequency
+
+    def _nodes(self):
+        """
+        Yield every node of the tree in no particular order.
+        """
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.sibling is not None:
+                stack.append(node.sibling)
+            if node.child is not None:
+                stack.append(node.child)
+
+    def to_sorted_list(self):
+        """
+        Return a list of all values in sorted order (MinHeap: ascending, MaxHeap: descending).
+
+        Time Complexity:
+        O(N * log(N))
+
+        """
+        nodes = sorted(self._nodes(), key = lambda node: node.priority, reverse = self._descending)
+        result = []
+        for node in nodes:
+            result.extend([node.value] * node.frequency)
+        return result
+
+    def __iter__(self):
+        """
+        Iterate over the heap's values in sorted order, without modifying the heap.
+        """
+        return iter(self.to_sorted_list())
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.root is not None
+
+    def __contains__(self, value):
+        return value in self.value_to_node
+
+    def __str__(self):
+        return str([(node.value, node.frequency) for node in self._nodes()])
+
+    def __reduce__(self):
+        """
+        Pickle the heap as a flat list of `(value, priority, frequency)` entries.
+
+        Pickling the node tree itself would recurse once per level of nesting, which exceeds the
+        recursion limit for large heaps.
+
+        Time Complexity:
+        O(N)
+
+        """
+        entries = [(node.value, node.priority, node.frequency) for node in self._nodes()]
+        return (_rebuild_pairing_heap, (type(self), entries))
+
+class PairingMinHeap(PairingHeap):
+    """
+    Pairing-heap implementation with the smallest priority at the root.
+    """
+    _descending = False
+    _comes_before = staticmethod(lt)
+
+class PairingMaxHeap(PairingHeap):
+    """
+    Pairing-heap implementation with the largest priority at the root.
+    """
+    _descending = True
+    _comes_before = staticmethod(gt)
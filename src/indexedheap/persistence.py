@@ -0,0 +1,398 @@
+import heapq
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from itertools import islice
+
+_MAGIC = b"IDXHEAP\x01"
+_LENGTH = struct.Struct("<Q")
+_ALIGNMENT = 8
+# Typecodes whose items are read back as floats rather than ints.
+_FLOAT_TYPECODES = "fd"
+
+def _padding(offset):
+    """
+    Return the number of bytes needed to align `offset` to `_ALIGNMENT`.
+    """
+    return -offset % _ALIGNMENT
+
+def _heap_state(heap):
+    """
+    Return the attributes of a heap other than its slot sequences and index dictionary.
+    """
+    return {key: value for key, value in heap.__dict__.items()
+            if key not in ("values", "priorities", "frequencies", "value_to_index")}
+
+def _values_are_priorities(heap):
+    """
+    Return True if every value of a numeric heap is its own priority, of the type the
+    typecode stores, so the values can be restored from the priority array alone.
+    """
+    if heap.typecode is None:
+        return False
+    number_type = float if heap.typecode in _FLOAT_TYPECODES else int
+    values, priorities = heap.values, heap.priorities
+    return all(type(values[idx]) is number_type and values[idx] == priorities[idx] for idx in range(len(values)))
+
+def _live_heap(heap):
+    """
+    Return the heap itself, or a compacted copy if it holds dead slots left by `lazy_remove`.
+    """
+    if not heap.dead:
+        return heap
+    live = heap._copy()
+    live.compact()
+    return live
+
+def rebuild_heap(heap_class, state, values, priorities, frequencies):
+    """
+    Recreate a heap from its slot sequences, which must already be in heap order.
+
+    Used by `IndexedHeap.__reduce_ex__` and `load`. The index dictionary is rebuilt in a single
+    linear pass; nothing is validated or sifted.
+
+    Parameters:
+    heap_class : type
+        The heap class to instantiate.
+    state : dict
+        The heap's other attributes, e.g. `arity`, `typecode` and `size`.
+    values : list or None
+        The values in heap order, or None if every value is its own priority.
+    priorities : list, array or bytes-like
+        The priorities in heap order. Bytes-like objects are read into an `array` of the
+        heap's typecode.
+    frequencies : list, array or bytes-like
+        The frequencies in heap order, read into an `array("q")` if bytes-like.
+
+    Returns:
+    IndexedHeap
+
+    Time Complexity:
+    O(N)
+
+    """
+    heap = heap_class.__new__(heap_class)
+    heap.__dict__.update(state)
+    typecode = state["typecode"]
+    if typecode is not None:
+        if not isinstance(priorities, array):
+            priorities = _read_array(typecode, priorities)
+        if not isinstance(frequencies, array):
+            frequencies = _read_array("q", frequencies)
+    heap.priorities = priorities
+    heap.frequencies = frequencies
+    heap.values = priorities.tolist() if values is None else values
+    heap.value_to_index = {value: idx for idx, value in enumerate(heap.values)}
+    return heap
+
+def _read_array(typecode, buffer):
+    """
+    Copy a bytes-like object into a new `array` of the given typecode.
+    """
+    result = array(typecode)
+    result.frombytes(memoryview(buffer).cast("B"))
+    return result
+
+def reduce_heap(heap, protocol):
+    """
+    Return the `__reduce_ex__` tuple for a heap.
+
+    With pickle protocol 5 and a numeric `typecode`, the priority and frequency arrays are
+    passed as `pickle.PickleBuffer` objects, so they can be transferred out-of-band with no
+    intermediate copy (see `pickle.dumps(..., buffer_callback=...)`).
+
+    """
+    heap = _live_heap(heap)
+    state = _heap_state(heap)
+    pickle_buffer = getattr(pickle, "PickleBuffer", None)
+    if protocol >= 5 and pickle_buffer is not None and heap.typecode is not None:
+        values = None if _values_are_priorities(heap) else heap.values
+        return (rebuild_heap, (type(heap), state, values, pickle_buffer(heap.priorities), pickle_buffer(heap.frequencies)))
+    return (rebuild_heap, (type(heap), state, heap.values, heap.priorities, heap.frequencies))
+
+def dump(heap, path):
+    """
+    Write a heap to a file in heap order, so `load` can restore it without re-sifting.
+
+    The file holds a small pickled header, then, for heaps with a numeric `typecode`, the raw
+    priority and frequency arrays at 8-byte aligned offsets. Values are only pickled if they
+    differ from their priorities, and any other slot sequences are pickled after the header.
+    Dead slots left by `lazy_remove` are not written.
+
+    Parameters:
+    heap : IndexedHeap
+        The heap to write.
+    path : str or path-like
+        The file to write.
+
+    Time Complexity:
+    O(N)
+
+    """
+    heap = _live_heap(heap)
+    numeric = heap.typecode is not None
+    values_are_priorities = _values_are_priorities(heap)
+    header = {
+        "heap_class": type(heap),
+        "state": _heap_state(heap),
+        "length": len(heap.values),
+        "byteorder": sys.byteorder,
+        "values_are_priorities": values_are_priorities,
+    }
+    header_bytes = pickle.dumps(header, protocol = pickle.HIGHEST_PROTOCOL)
+    with open(path, "wb") as file:
+        file.write(_MAGIC)
+        file.write(_LENGTH.pack(len(header_bytes)))
+        file.write(header_bytes)
+        offset = len(_MAGIC) + _LENGTH.size + len(header_bytes)
+        if numeric:
+            for sequence in (heap.priorities, heap.frequencies):
+                file.write(b"\0" * _padding(offset))
+                offset += _padding(offset)
+                data = memoryview(sequence).cast("B")
+                file.write(data)
+                offset += data.nbytes
+            if not values_are_priorities:
+                pickle.dump(heap.values, file, protocol = pickle.HIGHEST_PROTOCOL)
+        else:
+            pickle.dump((heap.values, heap.priorities, heap.frequencies), file, protocol = pickle.HIGHEST_PROTOCOL)
+
+def _read_header(file):
+    """
+    Read and check the magic number and header of a file written by `dump`.
+
+    Returns:
+    tuple
+        The header dictionary and the offset of the first byte after it.
+
+    Raises:
+    ValueError
+        If the file was not written by `dump`.
+
+    """
+    if file.read(len(_MAGIC)) != _MAGIC:
+        raise ValueError("Not a heap file written by dump()")
+    (header_length,) = _LENGTH.unpack(file.read(_LENGTH.size))
+    header = pickle.loads(file.read(header_length))
+    return header, len(_MAGIC) + _LENGTH.size + header_length
+
+def _array_layout(header, offset):
+    """
+    Return the `(offset, nbytes)` of the priority and frequency arrays in a numeric heap file.
+    """
+    length = header["length"]
+    priorities_offset = offset + _padding(offset)
+    priorities_nbytes = length * array(header["state"]["typecode"]).itemsize
+    end = priorities_offset + priorities_nbytes
+    frequencies_offset = end + _padding(end)
+    frequencies_nbytes = length * array("q").itemsize
+    return (priorities_offset, priorities_nbytes), (frequencies_offset, frequencies_nbytes)
+
+def load(path, *, heap_class = None):
+    """
+    Read a heap written by `dump`.
+
+    The slots are read back in heap order and the index dictionary is rebuilt in one linear
+    pass, without validating or sifting.
+
+    Parameters:
+    path : str or path-like
+        The file to read.
+    heap_class : type, optional
+        If given, the stored heap must be an instance of this class.
+
+    Returns:
+    IndexedHeap
+        A heap of the class that was dumped.
+
+    Raises:
+    ValueError
+        If the file was not written by `dump`.
+    TypeError
+        If the stored heap is not an instance of `heap_class`.
+
+    Time Complexity:
+    O(N)
+
+    """
+    with open(path, "rb") as file:
+        header, offset = _read_header(file)
+        stored_class = header["heap_class"]
+        if heap_class is not None and not issubclass(stored_class, heap_class):
+            raise TypeError(f"{path!r} holds a {stored_class.__name__}, not a {heap_class.__name__}")
+        state = header["state"]
+        if state["typecode"] is None:
+            values, priorities, frequencies = pickle.load(file)
+            return rebuild_heap(stored_class, state, values, priorities, frequencies)
+        arrays = []
+        for (array_offset, nbytes), typecode in zip(_array_layout(header, offset), (state["typecode"], "q")):
+            file.seek(array_offset)
+            arrays.append(_read_array(typecode, file.read(nbytes)))
+            if header["byteorder"] != sys.byteorder:
+                arrays[-1].byteswap()
+        values = None if header["values_are_priorities"] else pickle.load(file)
+        return rebuild_heap(stored_class, state, values, arrays[0], arrays[1])
+
+class HeapSnapshot:
+    """
+    Read-only view of a numeric heap file written by `dump`, backed by `mmap`.
+
+    The priority and frequency arrays are used in place through the page cache, so any number
+    of processes can open the same snapshot and peek or iterate it without copying or parsing
+    the arrays. Only heaps with a numeric `typecode` whose values are their own priorities can
+    be mapped, and only in the plain d-ary layout, so not `IndexedMinMaxHeap`.
+
+    Lookups by value (`in`, `count`) build an index over the snapshot on first use.
+
+    Time Complexity Overview (N = number of unique items in the snapshot):
+    - open: O(1)
+    - peek: O(1)
+    - top(k): O(K * log(K))
+    - to_sorted_list: O(N * log(N))
+    - count / in: O(N) for the first lookup, then O(1)
+
+    """
+
+    def __init__(self, path):
+        """
+        Map a heap file read-only.
+
+        Parameters:
+        path : str or path-like
+            A file written by `dump` from a heap with a numeric `typecode`.
+
+        Raises:
+        ValueError
+            If the file was not written by `dump`, does not hold a numeric heap in the plain
+            d-ary layout whose values are its priorities, or was written on a machine of a
+            different byte order.
+
+        """
+        from .min_max_heap import IndexedMinMaxHeap
+        with open(path, "rb") as file:
+            header, offset = _read_header(file)
+            state = header["state"]
+            if state["typecode"] is None or not header["values_are_priorities"]:
+                raise ValueError("Only numeric heaps whose values are their priorities can be mapped")
+            if issubclass(header["heap_class"], IndexedMinMaxHeap):
+                raise ValueError("Only heaps in the plain d-ary layout can be mapped, not min-max heaps")
+            if header["byteorder"] != sys.byteorder:
+                raise ValueError("The snapshot was written with a different byte order")
+            self._mmap = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+        self.heap_class = header["heap_class"]
+        self._state = state
+        self.arity = state["arity"]
+        self.typecode = state["typecode"]
+        self.size = state["size"]
+        # BoundedHeap sets its direction per instance, so it is read from the saved state first.
+        self._descending = state.get("_descending", self.heap_class._descending)
+        self._index = None
+        self._buffer = memoryview(self._mmap)
+        (priorities_offset, priorities_nbytes), (frequencies_offset, frequencies_nbytes) = _array_layout(header, offset)
+        self.priorities = self._buffer[priorities_offset:priorities_offset + priorities_nbytes].cast(self.typecode)
+        self.frequencies = self._buffer[frequencies_offset:frequencies_offset + frequencies_nbytes].cast("q")
+
+    def peek(self):
+        """
+        Return the root value, or None if the snapshot is empty.
+
+        Time Complexity:
+        O(1)
+
+        """
+        return self.priorities[0] if self.size else None
+
+    def __iter__(self):
+        """
+        Iterate over the snapshot's values in heap order, walking the mapped arrays in place.
+
+        Time Complexity:
+        O(K * log(K)) to yield the first K unique values.
+
+        """
+        priorities, frequencies, arity = self.priorities, self.frequencies, self.arity
+        n = len(priorities)
+        sign = -1 if self._descending else 1
+        frontier = [(sign * priorities[0], 0)] if n else []
+        while frontier:
+            _, idx = heapq.heappop(frontier)
+            value = priorities[idx]
+            for _ in range(frequencies[idx]):
+                yield value
+            first_child_idx = arity * idx + 1
+            for child_idx in range(first_child_idx, min(first_child_idx + arity, n)):
+                heapq.heappush(frontier, (sign * priorities[child_idx], child_idx))
+
+    def top(self, k):
+        """
+        Return the first `k` values in heap order.
+
+        Time Complexity:
+        O(K * log(K))
+
+        """
+        if not isinstance(k, int) or k < 0:
+            raise ValueError("k must be a non-negative integer")
+        return list(islice(self, k))
+
+    def to_sorted_list(self):
+        """
+        Return all values in heap order.
+
+        Time Complexity:
+        O(N * log(N))
+
+        """
+        return list(self)
+
+    def to_heap(self):
+        """
+        Return an independent, modifiable heap holding the snapshot's values.
+
+        Time Complexity:
+        O(N)
+
+        """
+        return rebuild_heap(self.heap_class, dict(self._state), None,
+                            array(self.typecode, self.priorities), array("q", self.frequencies))
+
+    def count(self, value):
+        """
+        Return the frequency of a value in the snapshot, or 0 if it is absent.
+
+        Time Complexity:
+        O(N) for the first lookup, then O(1).
+
+        """
+        if self._index is None:
+            self._index = {value: idx for idx, value in enumerate(self.priorities)}
+        idx = self._index.get(value)
+        return 0 if idx is None else self.frequencies[idx]
+
+    def __contains__(self, value):
+        return self.count(value) > 0
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.size > 0
+
+    def close(self):
+        """
+        Release the mapping. The snapshot must not be used afterwards.
+        """
+        if self._mmap is not None:
+            self.priorities.release()
+            self.frequencies.release()
+            self._buffer.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,220 @@
+from math import floor
+from .indexed_heap import MinHeap
+
+class DeadlineScheduler:
+    """
+    Deadline scheduler for timers, built on a `MinHeap` keyed by timer and ordered by deadline.
+
+    Each timer is a hashable key with a numeric deadline. `pop_expired(now)` returns every key whose
+    deadline has passed, in deadline order, in a single call. Timers can be cancelled or rescheduled
+    in O(log(N)) through the heap's index.
+
+    Optionally, a hashed timing wheel fronts the heap: timers due more than `horizon` after the last
+    `pop_expired` are parked in per-tick buckets of width `resolution`, where scheduling and cancelling
+    are O(1). Buckets are promoted into the heap only once they come within `horizon` of `now`, so
+    timers that are cancelled long before they are due never touch the heap.
+
+    Time Complexity Overview (N = number of timers in the heap):
+    - schedule: O(log(N)), or O(1) when parked in the wheel
+    - cancel: O(log(N)), or O(1) when parked in the wheel
+    - reschedule: O(log(N))
+    - pop_expired: O(K * log(N)) for K expired timers, plus O(1) amortised per promoted timer
+
+    """
+
+    def __init__(self, *, horizon = None, resolution = 1.0):
+        """
+        Initialize an empty scheduler.
+
+        Parameters:
+        horizon : float, optional
+            If given, enables the timing wheel: timers due more than `horizon` after the
+            last `pop_expired` time are parked in the wheel until they come within range.
+        resolution : float, optional
+            Width of a timing wheel bucket, in the same unit as deadlines. Defaults to 1.0.
+
+        Raises:
+        ValueError
+            If `horizon` is negative or `resolution` is not positive.
+
+        """
+        if horizon is not None and horizon < 0:
+            raise ValueError("horizon must be non-negative")
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        self.horizon = horizon
+        self.resolution = resolution
+        self.heap = MinHeap()
+        self._buckets = {}
+        self._key_to_tick = {}
+        self._promoted_tick = None
+
+    def _tick(self, deadline):
+        """
+        Return the timing wheel bucket a deadline falls into.
+        """
+        return floor(deadline / self.resolution)
+
+    def _in_heap_range(self, deadline):
+        """
+        Return True if a timer due at `deadline` belongs in the heap rather than the wheel.
+        """
+        if self.horizon is None:
+            return True
+        return self._promoted_tick is not None and self._tick(deadline) <= self._promoted_tick
+
+    def schedule(self, key, deadline):
+        """
+        Schedule a timer.
+
+        Parameters:
+        key : Any
+            Hashable key identifying the timer.
+        deadline : float
+            The time at which the timer expires.
+
+        Raises:
+        ValueError
+            If `key` is already scheduled.
+
+        Time Complexity:
+        O(log(N)), or O(1) when parked in the wheel.
+
+        """
+        if key in self:
+            raise ValueError(f"{key!r} is already scheduled")
+        if self._in_heap_range(deadline):
+            self.heap.insert(key, priority = deadline)
+        else:
+            tick = self._tick(deadline)
+            self._buckets.setdefault(tick, {})[key] = deadline
+            self._key_to_tick[key] = tick
+
+    def cancel(self, key):
+        """
+        Cancel a timer.
+
+        Parameters:
+        key : Any
+            The timer to cancel.
+
+        Returns:
+        bool
+            True if the timer was scheduled, False otherwise.
+
+        Time Complexity:
+        O(log(N)), or O(1) when parked in the wheel.
+
+        """
+        tick = self._key_to_tick.pop(key, None)
+        if tick is not None:
+            bucket = self._buckets[tick]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[tick]
+            return True
+        return self.heap.remove(key, strict = False)
+
+    def reschedule(self, key, deadline):
+        """
+        Move a scheduled timer to a new deadline.
+
+        Parameters:
+        key : Any
+            The timer to reschedule.
+        deadline : float
+            The new deadline.
+
+        Raises:
+        KeyError
+            If `key` is not scheduled.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        if key in self.heap and self._in_heap_range(deadline):
+            self.heap.update_priority(key, deadline)
+            return
+        if not self.cancel(key):
+            raise KeyError(f"{key!r} is not scheduled")
+        self.schedule(key, deadline)
+
+    def deadline(self, key):
+        """
+        Return the deadline of a scheduled timer.
+
+        Raises:
+        KeyError
+            If `key` is not scheduled.
+
+        """
+        tick = self._key_to_tick.get(key)
+        if tick is not None:
+            return self._buckets[tick][key]
+        return self.heap.priority(key)
+
+    def _promote(self, now):
+        """
+        Move every wheel bucket within `horizon` of `now` into the heap.
+        """
+        target_tick = self._tick(now + self.horizon)
+        if self._promoted_tick is not None and target_tick <= self._promoted_tick:
+            return
+        if self._promoted_tick is None or target_tick - self._promoted_tick > len(self._buckets):
+            ticks = sorted(tick for tick in self._buckets if tick <= target_tick)
+        else:
+            ticks = [tick for tick in range(self._promoted_tick + 1, target_tick + 1) if tick in self._buckets]
+        for tick in ticks:
+            bucket = self._buckets.pop(tick)
+            for key, deadline in bucket.items():
+                del self._key_to_tick[key]
+                self.heap.insert(key, priority = deadline)
+        self._promoted_tick = target_tick
+
+    def pop_expired(self, now):
+        """
+        Remove and return every timer whose deadline is at or before `now`.
+
+        Parameters:
+        now : float
+            The current time.
+
+        Returns:
+        list
+            The expired keys, earliest deadline first.
+
+        Time Complexity:
+        O(K * log(N)) for K expired timers.
+
+        """
+        if self.horizon is not None:
+            self._promote(now)
+        heap = self.heap
+        expired = []
+        while heap and heap.priorities[0] <= now:
+            expired.append(heap.pop())
+        return expired
+
+    def next_deadline(self):
+        """
+        Return the earliest scheduled deadline, or None if nothing is scheduled.
+
+        Time Complexity:
+        O(1) when the heap is non-empty, otherwise O(B) for B wheel buckets.
+
+        """
+        if self.heap:
+            return self.heap.priorities[0]
+        if self._buckets:
+            return min(self._buckets[min(self._buckets)].values())
+        return None
+
+    def __contains__(self, key):
+        return key in self._key_to_tick or key in self.heap
+
+    def __len__(self):
+        return len(self.heap) + len(self._key_to_tick)
+
+    def __bool__(self):
+        return len(self) > 0
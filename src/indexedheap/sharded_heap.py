@@ -0,0 +1,449 @@
+import heapq
+import multiprocessing
+from operator import itemgetter
+from .indexed_heap import MinHeap
+
+def _root(heap):
+    """
+    Return `(value, priority)` of a heap's root, or None if it is empty.
+    """
+    if not heap:
+        return None
+    value = heap.peek()
+    return (value, heap.priorities[0])
+
+def _insert(heap, batch):
+    """
+    Insert a batch, carrying on past values that raise.
+
+    Returns:
+    tuple
+        (the number of occurrences the heap grew by, the first error raised or None)
+
+    """
+    size, error = heap.size, None
+    for value, count, priority in batch:
+        try:
+            heap.insert(value, count = count, priority = priority)
+        except Exception as exc:
+            if error is None:
+                error = exc
+    return (heap.size - size, error)
+
+def _remove(heap, args):
+    value, count, strict = args
+    size = heap.size
+    found = heap.remove(value, count = count, strict = strict)
+    return (found, size - heap.size)
+
+def _top_priorities(heap, k):
+    priorities, value_to_index = heap.priorities, heap.value_to_index
+    return [priorities[value_to_index[value]] for value in heap.top(k)]
+
+def _sorted_items(heap):
+    priorities, value_to_index = heap.priorities, heap.value_to_index
+    return [(priorities[value_to_index[value]], value) for value in heap]
+
+_COMMANDS = {
+    "insert": _insert,
+    "pop": lambda heap, args: heap.pop(),
+    "pop_many": lambda heap, k: heap.pop_many(k),
+    "remove": _remove,
+    "count": lambda heap, value: heap.count(value),
+    "top_priorities": _top_priorities,
+    "items": lambda heap, args: _sorted_items(heap),
+}
+
+def _serve(connection, heap_class, heap_options):
+    """
+    Worker process loop: own one heap and apply the commands received on `connection`.
+
+    Every command is answered with `(ok, result, root)`, where `ok` is False if the command
+    raised and `result` is then the exception, and `root` is the heap's root after the command.
+    """
+    heap = heap_class(**heap_options)
+    while True:
+        command, args = connection.recv()
+        if command == "close":
+            connection.close()
+            return
+        try:
+            result = _COMMANDS[command](heap, args)
+            ok = True
+        except Exception as error:
+            result, ok = error, False
+        connection.send((ok, result, _root(heap)))
+
+class ShardedHeap:
+    """
+    Indexed heap partitioned by value hash across worker processes, to spread heap work over
+    several cores.
+
+    Each of `shards` worker processes owns an `IndexedHeap` and serves commands over a pipe.
+    A value always lives in shard `hash(value) % shards`, so `insert`, `remove` and `count`
+    go to a single shard. The parent process keeps a small coordinator heap of each shard's
+    root, so `peek` needs no messages and `pop` one round trip to the shard holding the
+    global root. `pop_many(k)` asks every shard for its first `k` priorities in parallel,
+    picks the global first `k`, and pops them from each shard in a second parallel round.
+
+    Inserts are buffered per shard and sent in batches of `batch_size`, without waiting for
+    the reply, so routing in the parent overlaps with inserting in the workers. Pending
+    batches are flushed before any query that needs the shard's state.
+
+    Values and priorities must be picklable, and values must hash consistently within the
+    parent process. Inserts are validated in the parent against the first priority seen,
+    as `IndexedHeap.insert` does, so most invalid values are rejected immediately. Once a
+    value has been inserted with a separate priority, a later insert without one may just
+    add to an existing value's count, which only its shard knows, so such inserts are only
+    checked for hashability in the parent. A value rejected by its shard is skipped, the
+    rest of its batch is still inserted, `len` is corrected, and the error is raised by the
+    next call that syncs the shard.
+
+    Time Complexity Overview (N = values per shard, S = shards):
+    - insert: O(1) in the parent, O(log(N)) in the shard
+    - pop: one round trip, O(log(N)) in the shard and O(log(S)) in the parent
+    - peek: O(1)
+    - remove / count: one round trip to one shard
+    - pop_many(k): two parallel rounds, O(K * log(S)) in the parent
+
+    """
+
+    def __init__(self, shards = 4, *, heap_class = MinHeap, batch_size = 1024, context = None, **heap_options):
+        """
+        Start the worker processes, each with an empty heap.
+
+        Parameters:
+        shards : int, optional
+            The number of worker processes. Defaults to 4.
+        heap_class : type, optional
+            `MinHeap` (default) or `MaxHeap`, used by every shard and the coordinator.
+        batch_size : int, optional
+            The number of buffered inserts per shard that triggers sending a batch. Defaults to 1024.
+        context : str, optional
+            The `multiprocessing` start method, e.g. `"spawn"`. Defaults to the platform default.
+        **heap_options
+            Passed to `heap_class` in every shard, e.g. `arity` or `typecode`.
+
+        Raises:
+        ValueError
+            If `shards` or `batch_size` is not a positive integer.
+
+        """
+        if not isinstance(shards, int) or shards < 1:
+            raise ValueError("shards must be a positive integer")
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        self.shards = shards
+        self.batch_size = batch_size
+        self.heap_class = heap_class
+        self.size = 0
+        self._probe = heap_class(**heap_options)
+        self._roots = heap_class()
+        self._root_values = [None] * shards
+        self._pending = [[] for _ in range(shards)]
+        self._awaiting = [False] * shards
+        self._in_flight = [0] * shards
+        self._prioritised = False
+        self._connections = []
+        self._processes = []
+        multiprocessing_context = multiprocessing.get_context(context)
+        for _ in range(shards):
+            parent_end, child_end = multiprocessing_context.Pipe()
+            process = multiprocessing_context.Process(target = _serve, args = (child_end, heap_class, heap_options), daemon = True)
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+
+    def _send(self, shard, command, args = None):
+        """
+        Send a command to a shard. Its reply must be collected with `_receive`.
+        """
+        self._connections[shard].send((command, args))
+        self._awaiting[shard] = True
+
+    def _receive(self, shard):
+        """
+        Collect a shard's reply, update the coordinator with its root, and return the result.
+
+        Raises:
+        Exception
+            Whatever the command raised in the shard.
+
+        """
+        ok, result, root = self._connections[shard].recv()
+        self._awaiting[shard] = False
+        in_flight, self._in_flight[shard] = self._in_flight[shard], 0
+        roots = self._roots
+        if root is None:
+            roots.remove(shard, strict = False)
+        else:
+            self._root_values[shard] = root[0]
+            if shard in roots:
+                roots.update_priority(shard, root[1])
+            else:
+                roots.insert(shard, priority = root[1])
+        if not ok:
+            raise result
+        if in_flight:
+            # The reply to an insert batch, whose occurrences were already counted in `size`.
+            inserted, error = result
+            self.size -= in_flight - inserted
+            if error is not None:
+                raise error
+        return result
+
+    def _send_pending(self, shard):
+        """
+        Send a shard's buffered inserts, after collecting any reply it still owes.
+        """
+        if self._awaiting[shard]:
+            self._receive(shard)
+        batch = self._pending[shard]
+        if batch:
+            self._pending[shard] = []
+            self._send(shard, "insert", batch)
+            self._in_flight[shard] = sum(count for _, count, _ in batch)
+
+    def _sync(self, shards = None):
+        """
+        Flush buffered inserts to the given shards (default all) and wait for every reply,
+        so the coordinator reflects their roots.
+        """
+        shards = range(self.shards) if shards is None else shards
+        for shard in shards:
+            self._send_pending(shard)
+        for shard in shards:
+            if self._awaiting[shard]:
+                self._receive(shard)
+
+    def _call(self, shard, command, args = None):
+        """
+        Sync a shard, then run one command on it and return the result.
+        """
+        self._sync((shard,))
+        self._send(shard, command, args)
+        return self._receive(shard)
+
+    def _shard_of(self, value):
+        return hash(value) % self.shards
+
+    def _validate_hashable(self, value):
+        try:
+            hash(value)
+        except TypeError:
+            raise TypeError(
+                f"Cannot insert value into heap: {value!r} is not hashable. "
+                "All values must implement __hash__."
+            )
+
+    def insert(self, value, *, count = 1, priority = None):
+        """
+        Insert a value into its shard, buffering it until the shard's batch is full.
+
+        Parameters are as for `IndexedHeap.insert`.
+
+        Raises:
+        ValueError
+            If `count` is not a positive integer.
+        TypeError
+            If the value is not hashable, or its priority is not comparable with the first
+            priority inserted.
+
+        Time Complexity:
+        O(1) amortised in the parent
+
+        """
+        if not isinstance(count, int) or count < 1:
+            raise ValueError("Count must be a positive integer")
+        probe = self._probe
+        if priority is None and self._prioritised:
+            self._validate_hashable(value)
+        else:
+            probe._validate_value(value, priority)
+            if not probe:
+                probe.insert(value, priority = priority)
+            if priority is not None:
+                self._prioritised = True
+        shard = self._shard_of(value)
+        batch = self._pending[shard]
+        batch.append((value, count, priority))
+        self.size += count
+        if len(batch) >= self.batch_size:
+            self._send_pending(shard)
+
+    def insert_many(self, values):
+        """
+        Insert every value of an iterable, validating them as a batch and routing them in one pass.
+
+        Raises:
+        TypeError
+            If the values are not hashable and comparable with each other and the first
+            priority inserted. Nothing is inserted then.
+
+        Time Complexity:
+        O(K) amortised in the parent
+
+        """
+        batch = list(values)
+        if not batch:
+            return
+        probe = self._probe
+        if self._prioritised:
+            for value in batch:
+                self._validate_hashable(value)
+        else:
+            probe._validate_batch(batch)
+            probe._validate_value(batch[0])
+            if not probe:
+                probe.insert(batch[0])
+        shards, pending, batch_size = self.shards, self._pending, self.batch_size
+        for value in batch:
+            pending[hash(value) % shards].append((value, 1, None))
+        self.size += len(batch)
+        for shard in range(shards):
+            if len(pending[shard]) >= batch_size:
+                self._send_pending(shard)
+
+    def flush(self):
+        """
+        Send every buffered insert and wait until all shards have applied them.
+        """
+        self._sync()
+
+    def peek(self):
+        """
+        Return the root value across all shards without removing it, or None if empty.
+
+        Time Complexity:
+        O(1), after flushing buffered inserts.
+
+        """
+        self._sync()
+        shard = self._roots.peek()
+        return None if shard is None else self._root_values[shard]
+
+    def pop(self):
+        """
+        Remove and return the root value across all shards.
+
+        Raises:
+        IndexError
+            If called on an empty heap.
+
+        Time Complexity:
+        One round trip to the shard holding the root.
+
+        """
+        self._sync()
+        if not self._roots:
+            raise IndexError("Pop from empty heap")
+        value = self._call(self._roots.peek(), "pop")
+        self.size -= 1
+        return value
+
+    def pop_many(self, k, *, strict = True):
+        """
+        Remove and return the first `k` values across all shards, in heap order.
+
+        Parameters are as for `IndexedHeap.pop_many`.
+
+        Raises:
+        ValueError
+            If `k` is not a non-negative integer.
+        IndexError
+            If `strict=True` and the heap holds fewer than `k` values.
+
+        Time Complexity:
+        Two parallel rounds of messages, O(K * log(S)) in the parent.
+
+        """
+        if not isinstance(k, int) or k < 0:
+            raise ValueError("k must be a non-negative integer")
+        if k > self.size:
+            if strict:
+                raise IndexError(f"Cannot pop {k} values from heap of size {self.size}")
+            k = self.size
+        self._sync()
+        shards = list(self._roots.values)
+        for shard in shards:
+            self._send(shard, "top_priorities", k)
+        candidates = [[(priority, shard) for priority in self._receive(shard)] for shard in shards]
+        descending = self.heap_class._descending
+        chosen = [shard for _, shard in heapq.merge(*candidates, key = itemgetter(0), reverse = descending)][:k]
+        counts = {}
+        for shard in chosen:
+            counts[shard] = counts.get(shard, 0) + 1
+        for shard, count in counts.items():
+            self._send(shard, "pop_many", count)
+        popped = {shard: iter(self._receive(shard)) for shard in counts}
+        self.size -= k
+        return [next(popped[shard]) for shard in chosen]
+
+    def remove(self, value, *, count = 1, strict = True):
+        """
+        Remove occurrences of a value from its shard.
+
+        Parameters, return value and errors are as for `IndexedHeap.remove`.
+
+        Time Complexity:
+        One round trip to one shard.
+
+        """
+        found, removed = self._call(self._shard_of(value), "remove", (value, count, strict))
+        self.size -= removed
+        return found
+
+    def count(self, value):
+        """
+        Return the frequency of a value, or 0 if it is not in the heap.
+
+        Time Complexity:
+        One round trip to one shard.
+
+        """
+        return self._call(self._shard_of(value), "count", value)
+
+    def to_sorted_list(self):
+        """
+        Return every value in heap order, merging each shard's sorted values.
+
+        Time Complexity:
+        O(N * log(N)) in each shard, in parallel, then O(S * N * log(S)) to merge.
+
+        """
+        self._sync()
+        for shard in range(self.shards):
+            self._send(shard, "items")
+        items = [self._receive(shard) for shard in range(self.shards)]
+        merged = heapq.merge(*items, key = itemgetter(0), reverse = self.heap_class._descending)
+        return [value for _, value in merged]
+
+    def __contains__(self, value):
+        return self.count(value) > 0
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.size > 0
+
+    def close(self):
+        """
+        Stop the worker processes. The heap must not be used afterwards.
+        """
+        for shard, connection in enumerate(self._connections):
+            if connection.closed:
+                continue
+            if self._awaiting[shard]:
+                connection.recv()
+            connection.send(("close", None))
+            connection.close()
+        for process in self._processes:
+            process.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,558 @@
+import multiprocessing
+from array import array
+from operator import lt, gt
+from .indexed_heap import NUMERIC_TYPECODES
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+# Header fields, stored as int64: total size including duplicates, number of slots,
+# capacity, hash table size, ord(typecode) and whether the heap is a max-heap.
+_SIZE, _SLOTS, _CAPACITY, _TABLE_SIZE, _TYPECODE, _DESCENDING = range(6)
+_HEADER_FIELDS = 6
+
+# Fibonacci hashing multiplier. Hashes of floats in [0, 1) have mostly zero low bits, so
+# table positions are taken from the high bits of the mixed hash rather than by masking.
+_GOLDEN = 0x9E3779B97F4A7C15
+_BITS64 = (1 << 64) - 1
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+def _attach(heap_class, name, lock):
+    return heap_class.attach(name, lock)
+
+class SharedNumericHeap:
+    """
+    Indexed heap of numbers stored in a `multiprocessing.shared_memory` block, so several
+    processes can insert into and pop from one heap without pickling values through a queue.
+
+    The block holds a small header, the heap's slot arrays (the values, which are their own
+    priorities, and their frequencies), and an open-addressing hash table mapping each value
+    to its slot, which plays the part of `value_to_index`. The table uses linear probing with
+    backward-shift deletion, and each slot records its table position so sifting updates the
+    index in O(1) per level. Every operation holds a process-shared lock.
+
+    The semantics of `insert`, `pop`, `remove` and `count` follow `IndexedHeap`, including
+    frequencies, but the heap holds at most `capacity` unique values. Values are converted
+    to the `typecode` on the way in, so e.g. ints are stored as floats with `typecode="d"`.
+
+    To share a heap, pass it to a `multiprocessing.Process` as an argument: it is re-attached
+    to the same block and lock in the child. The creating process should `unlink` the block
+    once every process is done with it; using the heap as a context manager does so on exit.
+
+    Requires Python 3.8 or later. Use `SharedMinHeap` or `SharedMaxHeap`.
+
+    Time Complexity Overview (N = number of unique values):
+    - insert: O(log(N)), O(1) for an existing value
+    - pop: O(log(N))
+    - peek: O(1)
+    - remove: O(log(N))
+    - count: O(1)
+
+    """
+    _descending = None
+    _comes_before = None
+
+    def __init__(self, capacity, *, typecode = "d", lock = None):
+        """
+        Create a new shared heap.
+
+        Parameters:
+        capacity : int
+            The maximum number of unique values.
+        typecode : str, optional
+            The numeric `array` typecode of the values. Defaults to `"d"` (float).
+        lock : multiprocessing.Lock, optional
+            The process-shared lock guarding the heap. Defaults to a new `multiprocessing.Lock`.
+
+        Raises:
+        ImportError
+            If `multiprocessing.shared_memory` is not available (Python < 3.8).
+        ValueError
+            If `capacity` is not a positive integer or `typecode` is not a numeric typecode.
+
+        """
+        if shared_memory is None:
+            raise ImportError("Shared heaps require multiprocessing.shared_memory (Python 3.8+)")
+        if not isinstance(capacity, int) or capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+        if not isinstance(typecode, str) or typecode not in NUMERIC_TYPECODES:
+            raise ValueError(f"typecode must be one of {NUMERIC_TYPECODES!r}, got {typecode!r}")
+        table_size = 1 << (2 * capacity - 1).bit_length()
+        block = shared_memory.SharedMemory(create = True, size = self._layout(capacity, typecode, table_size)[-1])
+        self._open(block, lock if lock is not None else multiprocessing.Lock(), owner = True)
+        header = self._header
+        header[_CAPACITY], header[_TABLE_SIZE] = capacity, table_size
+        header[_TYPECODE], header[_DESCENDING] = ord(typecode), int(self._descending)
+        self._map()
+
+    @classmethod
+    def attach(cls, name, lock):
+        """
+        Attach to an existing shared heap by the name of its block.
+
+        Parameters:
+        name : str
+            The `name` of the heap to attach to.
+        lock : multiprocessing.Lock
+            The lock the heap was created with.
+
+        Returns:
+        SharedMinHeap | SharedMaxHeap
+            A heap sharing the block.
+
+        Raises:
+        TypeError
+            If the block holds a heap of the other ordering.
+
+        """
+        if shared_memory is None:
+            raise ImportError("Shared heaps require multiprocessing.shared_memory (Python 3.8+)")
+        heap = cls.__new__(cls)
+        heap._open(shared_memory.SharedMemory(name = name), lock, owner = False)
+        if bool(heap._header[_DESCENDING]) != cls._descending:
+            heap.close()
+            raise TypeError(f"Shared memory block {name!r} does not hold a {cls.__name__}")
+        heap._map()
+        return heap
+
+    @staticmethod
+    def _layout(capacity, typecode, table_size):
+        """
+        Return the byte offsets of the priorities, frequencies, positions and hash table,
+        and the total size of the block.
+        """
+        priorities = _HEADER_FIELDS * 8
+        frequencies = _align(priorities + capacity * array(typecode).itemsize)
+        positions = frequencies + capacity * 8
+        table = positions + capacity * 8
+        return (priorities, frequencies, positions, table, table + table_size * 8)
+
+    def _open(self, block, lock, *, owner):
+        self._block = block
+        self.lock = lock
+        self._owner = owner
+        self._header = block.buf[:_HEADER_FIELDS * 8].cast("q")
+        self._views = [self._header]
+
+    def _map(self):
+        """
+        Create the typed views of the block's arrays from the header.
+        """
+        header, buffer = self._header, self._block.buf
+        self.capacity = capacity = header[_CAPACITY]
+        self.typecode = typecode = chr(header[_TYPECODE])
+        table_size = header[_TABLE_SIZE]
+        priorities, frequencies, positions, table, end = self._layout(capacity, typecode, table_size)
+        self._priorities = buffer[priorities:priorities + capacity * array(typecode).itemsize].cast(typecode)
+        self._frequencies = buffer[frequencies:positions].cast("q")
+        self._positions = buffer[positions:table].cast("q")
+        self._table = buffer[table:end].cast("q")
+        self._mask = table_size - 1
+        self._shift = 64 - (table_size.bit_length() - 1)
+        self._views += [self._priorities, self._frequencies, self._positions, self._table]
+
+    @property
+    def name(self):
+        """
+        The name of the shared memory block, for `attach`.
+        """
+        return self._block.name
+
+    def __reduce__(self):
+        return (_attach, (self.__class__, self.name, self.lock))
+
+    def _coerce(self, value):
+        """
+        Convert a value to the heap's typecode.
+
+        Raises:
+        TypeError
+            If the value is not a number representable by the typecode, or is NaN.
+
+        """
+        try:
+            value = array(self.typecode, (value,))[0]
+        except (TypeError, OverflowError):
+            raise TypeError(f"Cannot insert value into heap: {value!r} is not representable with typecode {self.typecode!r}.")
+        if value != value:
+            raise TypeError(f"Cannot insert value into heap: {value!r} is not equatable to itself.")
+        return value
+
+    def _home(self, value):
+        """
+        Return the hash table position a value is probed from.
+        """
+        return ((hash(value) * _GOLDEN) & _BITS64) >> self._shift
+
+    def _find(self, value):
+        """
+        Return the hash table position of a value, or -1 if it is not in the heap.
+
+        Time Complexity:
+        O(1) expected
+
+        """
+        table, priorities, mask = self._table, self._priorities, self._mask
+        position = self._home(value)
+        while True:
+            entry = table[position]
+            if entry == 0:
+                return -1
+            if priorities[entry - 1] == value:
+                return position
+            position = (position + 1) & mask
+
+    def _index(self, value, slot):
+        """
+        Add a value, stored in `slot`, to the hash table.
+        """
+        table, mask = self._table, self._mask
+        position = self._home(value)
+        while table[position]:
+            position = (position + 1) & mask
+        table[position] = slot + 1
+        self._positions[slot] = position
+
+    def _unindex(self, position):
+        """
+        Delete a hash table entry, shifting later entries of its probe run back into the gap.
+
+        Time Complexity:
+        O(1) expected
+
+        """
+        table, priorities, positions, mask, home_of = self._table, self._priorities, self._positions, self._mask, self._home
+        table[position] = 0
+        gap, current = position, position
+        while True:
+            current = (current + 1) & mask
+            entry = table[current]
+            if entry == 0:
+                return
+            home = home_of(priorities[entry - 1])
+            # The entry may fill the gap unless its home lies cyclically in (gap, current].
+            if gap <= current:
+                stays = gap < home <= current
+            else:
+                stays = gap < home or home <= current
+            if not stays:
+                table[gap] = entry
+                positions[entry - 1] = gap
+                table[current] = 0
+                gap = current
+
+    def _move(self, source, target):
+        """
+        Copy the slot at `source` into `target`, updating its hash table entry.
+        """
+        priorities, frequencies, positions = self._priorities, self._frequencies, self._positions
+        priorities[target] = priorities[source]
+        frequencies[target] = frequencies[source]
+        position = positions[source]
+        positions[target] = position
+        self._table[position] = target + 1
+
+    def _sift_up(self, idx):
+        """
+        Move the slot at `idx` towards the root until the heap property holds.
+
+        Returns:
+        int
+            The final index of the slot.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        priorities, frequencies, positions, table = self._priorities, self._frequencies, self._positions, self._table
+        comes_before = self._comes_before
+        value, frequency, position = priorities[idx], frequencies[idx], positions[idx]
+        while idx > 0:
+            parent_idx = (idx - 1) >> 1
+            parent_value = priorities[parent_idx]
+            if not comes_before(value, parent_value):
+                break
+            priorities[idx] = parent_value
+            frequencies[idx] = frequencies[parent_idx]
+            moved = positions[idx] = positions[parent_idx]
+            table[moved] = idx + 1
+            idx = parent_idx
+        priorities[idx], frequencies[idx], positions[idx] = value, frequency, position
+        table[position] = idx + 1
+        return idx
+
+    def _sift_down(self, idx):
+        """
+        Move the slot at `idx` away from the root until the heap property holds.
+
+        Returns:
+        int
+            The final index of the slot.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        priorities, frequencies, positions, table = self._priorities, self._frequencies, self._positions, self._table
+        comes_before = self._comes_before
+        n = self._header[_SLOTS]
+        value, frequency, position = priorities[idx], frequencies[idx], positions[idx]
+        child_idx = 2 * idx + 1
+        while child_idx < n:
+            child_value = priorities[child_idx]
+            sibling_idx = child_idx + 1
+            if sibling_idx < n:
+                sibling_value = priorities[sibling_idx]
+                if comes_before(sibling_value, child_value):
+                    child_idx, child_value = sibling_idx, sibling_value
+            if not comes_before(child_value, value):
+                break
+            priorities[idx] = child_value
+            frequencies[idx] = frequencies[child_idx]
+            moved = positions[idx] = positions[child_idx]
+            table[moved] = idx + 1
+            idx = child_idx
+            child_idx = 2 * idx + 1
+        priorities[idx], frequencies[idx], positions[idx] = value, frequency, position
+        table[position] = idx + 1
+        return idx
+
+    def _delete_at(self, idx):
+        """
+        Remove the slot at `idx` with all its occurrences, filling it with the last slot.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        header = self._header
+        self._unindex(self._positions[idx])
+        last = header[_SLOTS] - 1
+        header[_SIZE] -= self._frequencies[idx]
+        header[_SLOTS] = last
+        if idx != last:
+            self._move(last, idx)
+            if self._sift_down(idx) == idx:
+                self._sift_up(idx)
+
+    def insert(self, value, *, count = 1):
+        """
+        Insert a value, or add occurrences of a value already in the heap.
+
+        Parameters:
+        value : int or float
+            The value, converted to the heap's typecode.
+        count : int, optional
+            Number of occurrences to add. Defaults to 1.
+
+        Raises:
+        ValueError
+            If `count` is not a positive integer, or the heap already holds `capacity`
+            unique values.
+        TypeError
+            If the value is not representable by the typecode.
+
+        Time Complexity:
+        O(log(N)), or O(1) for a value already in the heap.
+
+        """
+        if not isinstance(count, int) or count < 1:
+            raise ValueError("Count must be a positive integer")
+        value = self._coerce(value)
+        with self.lock:
+            header = self._header
+            position = self._find(value)
+            if position >= 0:
+                self._frequencies[self._table[position] - 1] += count
+            else:
+                slot = header[_SLOTS]
+                if slot >= self.capacity:
+                    raise ValueError(f"Shared heap is full ({self.capacity} unique values)")
+                self._priorities[slot] = value
+                self._frequencies[slot] = count
+                self._index(value, slot)
+                header[_SLOTS] = slot + 1
+                self._sift_up(slot)
+            header[_SIZE] += count
+
+    def insert_many(self, values):
+        """
+        Insert every value of an iterable, holding the lock once.
+
+        Raises:
+        ValueError
+            If the heap fills up. The values before the first that did not fit are inserted.
+        TypeError
+            If a value is not representable by the typecode. Nothing is inserted then.
+
+        Time Complexity:
+        O(K * log(N))
+
+        """
+        values = [self._coerce(value) for value in values]
+        with self.lock:
+            header, frequencies, priorities = self._header, self._frequencies, self._priorities
+            for value in values:
+                position = self._find(value)
+                if position >= 0:
+                    frequencies[self._table[position] - 1] += 1
+                else:
+                    slot = header[_SLOTS]
+                    if slot >= self.capacity:
+                        raise ValueError(f"Shared heap is full ({self.capacity} unique values)")
+                    priorities[slot] = value
+                    frequencies[slot] = 1
+                    self._index(value, slot)
+                    header[_SLOTS] = slot + 1
+                    self._sift_up(slot)
+                header[_SIZE] += 1
+
+    def peek(self):
+        """
+        Return the root value without removing it, or None if the heap is empty.
+
+        Time Complexity:
+        O(1)
+
+        """
+        with self.lock:
+            return self._priorities[0] if self._header[_SLOTS] else None
+
+    def pop(self):
+        """
+        Remove and return one occurrence of the root value.
+
+        Raises:
+        IndexError
+            If called on an empty heap.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        with self.lock:
+            header = self._header
+            if not header[_SLOTS]:
+                raise IndexError("Pop from empty heap")
+            value = self._priorities[0]
+            if self._frequencies[0] > 1:
+                self._frequencies[0] -= 1
+                header[_SIZE] -= 1
+            else:
+                self._delete_at(0)
+            return value
+
+    def remove(self, value, *, count = 1, strict = True):
+        """
+        Remove occurrences of a value.
+
+        Parameters, return value and errors are as for `IndexedHeap.remove`.
+
+        Time Complexity:
+        O(1) if occurrences remain, otherwise O(log(N)).
+
+        """
+        if not isinstance(count, int) or count < 1:
+            raise ValueError("Count must be a positive integer")
+        value = self._coerce(value)
+        with self.lock:
+            position = self._find(value)
+            if position < 0:
+                if strict:
+                    raise KeyError(f"{value} not in heap")
+                return False
+            idx = self._table[position] - 1
+            frequency = self._frequencies[idx]
+            if count > frequency:
+                if strict:
+                    raise ValueError(f"Count must be less than or equal to the value's frequency ({frequency})")
+                count = frequency
+            if count == frequency:
+                self._delete_at(idx)
+            else:
+                self._frequencies[idx] = frequency - count
+                self._header[_SIZE] -= count
+            return True
+
+    def count(self, value):
+        """
+        Return the frequency of a value, or 0 if it is not in the heap.
+
+        Time Complexity:
+        O(1)
+
+        """
+        try:
+            value = self._coerce(value)
+        except TypeError:
+            return 0
+        with self.lock:
+            position = self._find(value)
+            return 0 if position < 0 else self._frequencies[self._table[position] - 1]
+
+    def to_sorted_list(self):
+        """
+        Return every value in heap order, repeated by frequency, without modifying the heap.
+
+        Time Complexity:
+        O(N * log(N))
+
+        """
+        with self.lock:
+            n = self._header[_SLOTS]
+            values = self._priorities[:n].tolist()
+            frequencies = self._frequencies[:n].tolist()
+        result = []
+        for value, frequency in sorted(zip(values, frequencies), reverse = self._descending):
+            result.extend([value] * frequency)
+        return result
+
+    def __contains__(self, value):
+        return self.count(value) > 0
+
+    def __len__(self):
+        return self._header[_SIZE]
+
+    def __bool__(self):
+        return self._header[_SIZE] > 0
+
+    def close(self):
+        """
+        Detach this process from the block. Other processes are unaffected.
+        """
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._block.close()
+
+    def unlink(self):
+        """
+        Destroy the block once every process has closed it. Call once, from the creating process.
+        """
+        self._block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self._owner:
+            self.unlink()
+
+class SharedMinHeap(SharedNumericHeap):
+    """
+    Shared-memory numeric heap with the smallest value at the root.
+    """
+    _descending = False
+    _comes_before = staticmethod(lt)
+
+class SharedMaxHeap(SharedNumericHeap):
+    """
+    Shared-memory numeric heap with the largest value at the root.
+    """
+    _descending = True
+    _comes_before = staticmethod(gt)
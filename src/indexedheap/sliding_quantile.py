@@ -0,0 +1,159 @@
+from collections import deque
+from .indexed_heap import MinHeap, MaxHeap
+
+class SlidingQuantile:
+    """
+    Running quantile of the most recent `window` samples, e.g. a rolling median or p95.
+
+    The samples in the window are split between two indexed heaps: a `MaxHeap` holding the
+    lowest `floor(q * (n - 1)) + 1` samples and a `MinHeap` holding the rest, so the
+    quantile is the root of the lower heap. A new sample goes into one heap, the expiring
+    sample is removed from the heap holding it by `IndexedHeap.remove`, and at most one
+    sample then moves between the heaps to restore the split. Repeated samples share a slot
+    through the frequency counter.
+
+    The quantile is the lower nearest-rank sample: with n samples in the window it is the
+    sample at index `floor(q * (n - 1))` of the sorted window, so `q=0.5` gives the lower
+    median.
+
+    Time Complexity Overview (N = window):
+    - add: O(log(N))
+    - evict: O(log(N))
+    - quantile: O(1)
+    - process: O(K * log(N)) for K samples
+
+    """
+
+    def __init__(self, window, q = 0.5, *, value_type = None):
+        """
+        Initialize an empty window.
+
+        Parameters:
+        window : int
+            The maximum number of samples kept. Adding a sample to a full window evicts
+            the oldest one.
+        q : float, optional
+            The quantile to track, between 0 and 1. Defaults to 0.5 (the median).
+        value_type : type, optional
+            Passed to both heaps to skip per-sample validation, e.g. `float`.
+
+        Raises:
+        ValueError
+            If `window` is not a positive integer or `q` is not between 0 and 1.
+
+        """
+        if not isinstance(window, int) or window < 1:
+            raise ValueError("window must be a positive integer")
+        if not 0 <= q <= 1:
+            raise ValueError(f"q must be between 0 and 1, got {q!r}")
+        self.window = window
+        self.q = q
+        self.samples = deque()
+        self.low = MaxHeap(value_type = value_type)
+        self.high = MinHeap(value_type = value_type)
+
+    def _rebalance(self):
+        """
+        Move samples between the heaps until the lower heap holds `floor(q * (n - 1)) + 1`.
+        """
+        low, high = self.low, self.high
+        n = len(self.samples)
+        target = int(self.q * (n - 1)) + 1 if n else 0
+        while len(low) > target:
+            high.insert(low.pop())
+        while len(low) < target:
+            low.insert(high.pop())
+
+    def add(self, sample):
+        """
+        Add a sample, evicting the oldest sample if the window is full.
+
+        Parameters:
+        sample : Any
+            The sample. All samples must be mutually comparable.
+
+        Returns:
+        Any or None
+            The evicted sample, or None if the window had room.
+
+        Raises:
+        TypeError
+            If the sample is not valid for the heaps.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        low = self.low
+        if low and sample <= low.values[0]:
+            low.insert(sample)
+        else:
+            self.high.insert(sample)
+        self.samples.append(sample)
+        evicted = self.evict() if len(self.samples) > self.window else None
+        self._rebalance()
+        return evicted
+
+    def evict(self):
+        """
+        Remove and return the oldest sample in the window.
+
+        Raises:
+        IndexError
+            If the window is empty.
+
+        Time Complexity:
+        O(log(N))
+
+        """
+        if not self.samples:
+            raise IndexError("Evict from empty window")
+        sample = self.samples.popleft()
+        low = self.low
+        # Every sample in the upper heap is at least the lower heap's root, so a sample
+        # that does not exceed the root is held by the lower heap.
+        if low and sample <= low.values[0]:
+            low.remove(sample)
+        else:
+            self.high.remove(sample)
+        self._rebalance()
+        return sample
+
+    def quantile(self):
+        """
+        Return the tracked quantile of the samples in the window, or None if it is empty.
+
+        Time Complexity:
+        O(1)
+
+        """
+        return self.low.peek()
+
+    def process(self, samples):
+        """
+        Add every sample of an iterable, returning the quantile after each one.
+
+        Returns:
+        list
+            The quantile of the window after each sample was added.
+
+        Time Complexity:
+        O(K * log(N))
+
+        """
+        add, low = self.add, self.low
+        result = []
+        append = result.append
+        for sample in samples:
+            add(sample)
+            append(low.values[0])
+        return result
+
+    def __len__(self):
+        """
+        Return the number of samples in the window.
+        """
+        return len(self.samples)
+
+    def __bool__(self):
+        return bool(self.samples)
@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from indexedheap import AsyncIndexedPriorityQueue, MaxHeap
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_put_get_order():
+    async def main():
+        queue = AsyncIndexedPriorityQueue()
+        for value in [5, 1, 3]:
+            await queue.put(value)
+        return [await queue.get() for _ in range(3)]
+    assert run(main()) == [1, 3, 5]
+
+def test_max_heap_class():
+    async def main():
+        queue = AsyncIndexedPriorityQueue(heap_class=MaxHeap)
+        await queue.put("low", priority=1)
+        await queue.put("high", priority=9)
+        return await queue.get()
+    assert run(main()) == "high"
+
+def test_get_waits_for_put():
+    async def main():
+        queue = AsyncIndexedPriorityQueue()
+        getter = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        queue.put_nowait("job")
+        return await asyncio.wait_for(getter, 1)
+    assert run(main()) == "job"
+
+def test_nowait_errors():
+    queue = AsyncIndexedPriorityQueue(maxsize=1)
+    with pytest.raises(asyncio.QueueEmpty):
+        queue.get_nowait()
+    queue.put_nowait(1)
+    assert queue.full()
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait(2)
+
+def test_put_back_pressure():
+    async def main():
+        queue = AsyncIndexedPriorityQueue(maxsize=1)
+        await queue.put(1)
+        putter = asyncio.ensure_future(queue.put(2))
+        await asyncio.sleep(0)
+        assert not putter.done()
+        assert await queue.get() == 1
+        await asyncio.wait_for(putter, 1)
+        return queue.qsize()
+    assert run(main()) == 1
+
+def test_remove_frees_room_and_update_priority():
+    async def main():
+        queue = AsyncIndexedPriorityQueue(maxsize=2)
+        await queue.put("a", priority=1)
+        await queue.put("b", priority=2)
+        putter = asyncio.ensure_future(queue.put("c", priority=3))
+        await asyncio.sleep(0)
+        assert queue.remove("a") == True
+        await asyncio.wait_for(putter, 1)
+        queue.update_priority("c", 0)
+        assert "a" not in queue
+        return [await queue.get(), await queue.get()]
+    assert run(main()) == ["c", "b"]
+
+def test_small_put_not_blocked_by_large_put():
+    async def main():
+        queue = AsyncIndexedPriorityQueue(maxsize=2)
+        await queue.put(1)
+        await queue.put(2)
+        large = asyncio.ensure_future(queue.put(5, count=2))
+        small = asyncio.ensure_future(queue.put(3))
+        await asyncio.sleep(0)
+        assert await queue.get() == 1
+        await asyncio.wait_for(small, 1)
+        assert not large.done()
+        assert await queue.get() == 2
+        assert await queue.get() == 3
+        await asyncio.wait_for(large, 1)
+        return queue.count(5)
+    assert run(main()) == 2
+
+def test_cancelled_getter_passes_wakeup_on():
+    async def main():
+        queue = AsyncIndexedPriorityQueue()
+        first = asyncio.ensure_future(queue.get())
+        second = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        first.cancel()
+        queue.put_nowait(1)
+        return await asyncio.wait_for(second, 1)
+    assert run(main()) == 1
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        AsyncIndexedPriorityQueue(maxsize=-1)
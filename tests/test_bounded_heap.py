@@ -0,0 +1,102 @@
+import pytest
+import random
+from indexedheap import BoundedHeap
+
+@pytest.mark.parametrize("keep", ["largest", "smallest"])
+class TestBoundedHeap:
+    def test_streaming_top_k(self, keep):
+        rng = random.Random(3)
+        data = rng.sample(range(1000), 300)
+        heap = BoundedHeap(10, keep=keep)
+        evicted = [heap.push(value) for value in data]
+        expected = sorted(data, reverse=keep == "largest")[:10]
+        assert sorted(heap.to_sorted_list()) == sorted(expected)
+        assert len(heap) == 10
+        assert heap.full()
+        assert evicted[:10] == [None] * 10
+        assert sorted(evicted[10:] + expected) == sorted(data)
+
+    def test_reject_and_replace(self, keep):
+        heap = BoundedHeap(2, keep=keep)
+        sign = 1 if keep == "largest" else -1
+        assert heap.push("a", priority=sign * 10) is None
+        assert heap.push("b", priority=sign * 30) is None
+        assert heap.push("c", priority=sign * 5) == "c"
+        assert "c" not in heap
+        assert heap.push("d", priority=sign * 20) == "a"
+        assert heap.to_sorted_list() == ["d", "b"]
+        assert heap.push("e", priority=sign * 20) == "e"
+
+    def test_duplicates_and_insert(self, keep):
+        heap = BoundedHeap(3, keep=keep)
+        assert heap.insert(5, count=2) == []
+        assert heap.insert(7) == []
+        worst, best = (5, 9) if keep == "largest" else (7, 1)
+        assert heap.insert(best) == [worst]
+        assert len(heap) == 3
+
+    def test_reinsert_without_priority(self, keep):
+        heap = BoundedHeap(3, keep=keep)
+        sign = 1 if keep == "largest" else -1
+        heap.push("job", priority=sign * 5)
+        heap.push("task", priority=sign * 3)
+        assert heap.push("job") is None
+        assert heap.count("job") == 2
+        assert heap.priority("job") == sign * 5
+        assert heap.push("job") == "task"
+        assert heap.count("job") == 3
+
+    def test_reprioritise_held_value(self, keep):
+        heap = BoundedHeap(2, keep=keep)
+        sign = 1 if keep == "largest" else -1
+        heap.push("a", priority=sign * 5)
+        heap.push("b", priority=sign * 6)
+        assert heap.push("a", priority=sign * 1) == "a"
+        assert heap.priority("a") == sign * 1
+        assert heap.count("a") == 1
+        assert heap.push("a", priority=sign * 9) == "b"
+        assert heap.count("a") == 2
+        assert heap.to_sorted_list() == ["a", "a"]
+
+    def test_early_rejection(self, keep, monkeypatch):
+        heap = BoundedHeap(3, [1, 2, 3], keep=keep)
+        monkeypatch.setattr(heap, "_validate_value", None)
+        assert heap.push(0 if keep == "largest" else 4) == (0 if keep == "largest" else 4)
+        monkeypatch.undo()
+        with pytest.raises(TypeError):
+            heap.push("helloworld")
+        assert sorted(heap.to_sorted_list()) == [1, 2, 3]
+
+    def test_reinsert_after_update_priority(self, keep):
+        heap = BoundedHeap(2, [1, 2], keep=keep)
+        sign = 1 if keep == "largest" else -1
+        worst, best = (1, 2) if keep == "largest" else (2, 1)
+        heap.update_priority(worst, sign * 10)
+        assert heap.push(worst) == best
+        assert heap.count(worst) == 2
+
+    def test_bulk(self, keep):
+        heap = BoundedHeap(5, list(range(20)), keep=keep)
+        expected = sorted(range(20), reverse=keep == "largest")[:5]
+        assert sorted(heap.to_sorted_list()) == sorted(expected)
+        evicted = heap.insert_many([100, -100])
+        assert len(heap) == 5
+        assert len(evicted) == 2
+        merged = heap | BoundedHeap(5, [200, -200], keep=keep)
+        assert len(merged) == 5
+        assert (200 if keep == "largest" else -200) in merged
+
+    def test_invalid_arguments(self, keep):
+        with pytest.raises(ValueError):
+            BoundedHeap(0, keep=keep)
+        with pytest.raises(ValueError):
+            BoundedHeap(3, keep="middle")
+        heap = BoundedHeap(3, [1], keep=keep)
+        with pytest.raises(TypeError):
+            heap.push("helloworld")
+
+def test_bulk_constructors():
+    heap = BoundedHeap.from_sorted(range(10), capacity=3)
+    assert heap.to_sorted_list() == [7, 8, 9]
+    heap = BoundedHeap.from_counts({1: 5, 2: 1}, capacity=3, keep="smallest")
+    assert heap.to_sorted_list() == [1, 1, 1]
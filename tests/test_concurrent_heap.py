@@ -0,0 +1,114 @@
+import pytest
+import threading
+import time
+from queue import Empty, Full
+from indexedheap import ConcurrentMaxHeap, ConcurrentMinHeap
+
+@pytest.mark.parametrize("HeapClass", [ConcurrentMinHeap, ConcurrentMaxHeap])
+class TestConcurrentHeap:
+    def test_heap_api(self, HeapClass):
+        heap = HeapClass([3, 1, 2], arity=4)
+        heap.insert(5, count=2)
+        assert len(heap) == 5
+        assert heap.count(5) == 2
+        assert 5 in heap
+        assert heap.peek() == (1 if HeapClass is ConcurrentMinHeap else 5)
+        assert heap.remove(5) == True
+        assert heap.to_sorted_list() == sorted([1, 2, 3, 5], reverse=HeapClass is ConcurrentMaxHeap)
+        assert list(heap) == heap.to_sorted_list()
+
+    def test_pop_nowait_empty(self, HeapClass):
+        heap = HeapClass()
+        with pytest.raises(Empty):
+            heap.get_nowait()
+        with pytest.raises(Empty):
+            heap.pop(timeout=0.01)
+
+    def test_blocking_pop_waits_for_insert(self, HeapClass):
+        heap = HeapClass()
+        result = []
+        consumer = threading.Thread(target=lambda: result.append(heap.pop(timeout=5)))
+        consumer.start()
+        time.sleep(0.05)
+        heap.put(7)
+        consumer.join(5)
+        assert result == [7]
+        assert len(heap) == 0
+
+    def test_maxsize(self, HeapClass):
+        heap = HeapClass([1, 2], maxsize=3)
+        heap.put_nowait(3)
+        assert heap.full()
+        with pytest.raises(Full):
+            heap.put_nowait(4)
+        with pytest.raises(Full):
+            heap.insert(4, timeout=0.01)
+        with pytest.raises(ValueError):
+            heap.insert_many([4, 5, 6, 7])
+        producer = threading.Thread(target=lambda: heap.insert(4, timeout=5))
+        producer.start()
+        time.sleep(0.05)
+        heap.get()
+        producer.join(5)
+        assert 4 in heap
+        assert len(heap) == 3
+
+    def test_small_insert_not_blocked_by_large_insert(self, HeapClass):
+        heap = HeapClass([1, 2], maxsize=2)
+        inserted = []
+        large = threading.Thread(target=lambda: heap.insert(5, count=2, timeout=5))
+        large.start()
+        time.sleep(0.05)
+        small = threading.Thread(target=lambda: inserted.append(heap.insert(3, timeout=5)))
+        small.start()
+        time.sleep(0.05)
+        heap.get()
+        small.join(1)
+        assert not small.is_alive()
+        assert inserted == [None]
+        assert 3 in heap
+        heap.get()
+        heap.get()
+        large.join(5)
+        assert heap.count(5) == 2
+
+    def test_maxsize_exceeded_by_arr(self, HeapClass):
+        with pytest.raises(ValueError):
+            HeapClass([1, 2, 3], maxsize=2)
+
+    def test_pop_many(self, HeapClass):
+        heap = HeapClass()
+        heap.insert_many([4, 1, 3, 2])
+        expected = sorted([4, 1, 3, 2], reverse=HeapClass is ConcurrentMaxHeap)
+        assert heap.pop_many(3) == expected[:3]
+        assert heap.pop_many(3) == expected[3:]
+        with pytest.raises(Empty):
+            heap.pop_many(3, block=False)
+
+    def test_producers_and_consumers(self, HeapClass):
+        heap = HeapClass(maxsize=50)
+        producer_count, items_per_producer = 4, 500
+        consumed = []
+        consumed_lock = threading.Lock()
+
+        def produce(offset):
+            for i in range(items_per_producer):
+                heap.put(offset + i)
+
+        def consume():
+            while True:
+                try:
+                    values = heap.pop_many(10, timeout=0.5)
+                except Empty:
+                    return
+                with consumed_lock:
+                    consumed.extend(values)
+
+        threads = [threading.Thread(target=produce, args=(p * items_per_producer,)) for p in range(producer_count)]
+        threads += [threading.Thread(target=consume) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+        assert sorted(consumed) == list(range(producer_count * items_per_producer))
+        assert len(heap) == 0
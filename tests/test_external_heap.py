@@ -0,0 +1,107 @@
+import pytest
+import os
+import random
+from collections import Counter
+from indexedheap import ExternalHeap, MaxHeap, MinHeap
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestExternalHeap:
+    def test_matches_reference(self, HeapClass, tmp_path):
+        rng = random.Random(18)
+        best = min if HeapClass is MinHeap else max
+        with ExternalHeap(8, heap_class=HeapClass, max_runs=4, directory=str(tmp_path)) as heap:
+            reference = Counter()
+            for _ in range(2000):
+                choice = rng.random()
+                if choice < 0.5:
+                    value = rng.randrange(300)
+                    heap.insert(value)
+                    reference[value] += 1
+                elif choice < 0.6 and reference:
+                    value = rng.choice(sorted(reference))
+                    assert heap.remove(value) == True
+                    reference[value] -= 1
+                elif reference:
+                    expected = best(reference)
+                    assert heap.peek() == expected
+                    assert heap.pop() == expected
+                    reference[expected] -= 1
+                reference += Counter()
+                assert len(heap) == sum(reference.values())
+            popped = [heap.pop() for _ in range(len(heap))]
+            assert popped == sorted(reference.elements(), reverse=HeapClass is MaxHeap)
+            assert not heap
+            assert heap.peek() is None
+            with pytest.raises(IndexError):
+                heap.pop()
+
+    def test_spills_to_disk(self, HeapClass, tmp_path):
+        values = list(range(100))
+        random.Random(1).shuffle(values)
+        heap = ExternalHeap(10, heap_class=HeapClass, directory=str(tmp_path))
+        heap.insert_many(values)
+        assert heap.run_count() > 0
+        assert len(heap.buffer.values) <= 10
+        assert len(heap) == 100
+        heap.insert("x", priority=-1 if HeapClass is MinHeap else 1000)
+        assert heap.pop() == "x"
+        assert [heap.pop() for _ in range(100)] == sorted(values, reverse=HeapClass is MaxHeap)
+        heap.close()
+        assert os.listdir(str(tmp_path)) == []
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+def test_remove_spilled_values(HeapClass, tmp_path):
+    values = list(range(40)) * 2
+    random.Random(3).shuffle(values)
+    with ExternalHeap(6, heap_class=HeapClass, directory=str(tmp_path)) as heap:
+        heap.insert_many(values)
+        assert heap.run_count() > 0
+        spilled = 20 if HeapClass is MinHeap else 19
+        assert heap.buffer.count(spilled) == 0
+        with pytest.raises(ValueError):
+            heap.remove(spilled, count=3)
+        assert heap.remove(spilled) == True
+        assert heap.remove(spilled, count=5, strict=False) == True
+        with pytest.raises(KeyError):
+            heap.remove(spilled)
+        with pytest.raises(KeyError):
+            heap.remove(1000)
+        assert len(heap) == 78
+        expected = sorted([value for value in values if value != spilled], reverse=HeapClass is MaxHeap)
+        assert [heap.pop() for _ in range(78)] == expected
+        assert not heap
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+def test_remove_many(HeapClass, tmp_path):
+    values = list(range(50)) * 2
+    random.Random(5).shuffle(values)
+    with ExternalHeap(8, heap_class=HeapClass, directory=str(tmp_path)) as heap:
+        heap.insert_many(values)
+        with pytest.raises(KeyError):
+            heap.remove_many([1, 2, 1000])
+        with pytest.raises(ValueError):
+            heap.remove_many([3, 3, 3])
+        assert len(heap) == 100
+        assert heap.remove_many(list(range(0, 50, 5)) + [1000, 7, 7, 7], strict=False) == 12
+        assert len(heap) == 88
+        expected = Counter(values)
+        expected.subtract(list(range(0, 50, 5)) + [7, 7])
+        popped = [heap.pop() for _ in range(88)]
+        assert popped == sorted(expected.elements(), reverse=HeapClass is MaxHeap)
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        ExternalHeap(1)
+    with pytest.raises(ValueError):
+        ExternalHeap(10, max_runs=0)
+    with ExternalHeap(10) as heap:
+        heap.insert(1)
+        with pytest.raises(ValueError):
+            heap.remove(1, count=2)
+        with pytest.raises(ValueError):
+            heap.remove(1, count=0)
+        with pytest.raises(KeyError):
+            heap.remove(2)
+        assert heap.remove(2, strict=False) == False
+        assert heap.remove(1, count=2, strict=False) == True
+        assert len(heap) == 0
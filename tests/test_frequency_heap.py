@@ -0,0 +1,101 @@
+import pytest
+import random
+from collections import Counter
+from indexedheap import FrequencyHeap, SpaceSavingHeap
+
+@pytest.fixture
+def stream():
+    rng = random.Random(15)
+    return [int(rng.paretovariate(1.2)) for _ in range(5000)]
+
+class TestFrequencyHeap:
+    def test_counts(self, stream):
+        counter = Counter(stream)
+        heap = FrequencyHeap(stream)
+        assert len(heap) == len(counter)
+        assert heap.total() == len(stream)
+        for value, count in counter.items():
+            assert heap.count(value) == count
+        assert [count for _, count in heap.most_common(10)] == [count for _, count in counter.most_common(10)]
+        assert sorted(heap.most_common()) == sorted(counter.items())
+        assert heap.count("missing") == 0
+
+    def test_insert_and_remove(self):
+        heap = FrequencyHeap()
+        heap.insert("a")
+        heap.insert("b", count=3)
+        assert heap.peek() == ("b", 3)
+        heap.insert("a", count=5)
+        assert heap.most_common(1) == [("a", 6)]
+        assert heap.remove("a", count=4) == True
+        assert heap.peek() == ("b", 3)
+        with pytest.raises(ValueError):
+            heap.remove("a", count=3)
+        assert heap.remove("a", count=3, strict=False) == True
+        assert "a" not in heap
+        with pytest.raises(KeyError):
+            heap.remove("a")
+        assert heap.remove("a", strict=False) == False
+        with pytest.raises(ValueError):
+            heap.insert("a", count=0)
+        assert heap.total() == 3
+
+    def test_pop(self):
+        heap = FrequencyHeap(["x", "y", "y"])
+        assert heap.pop() == ("y", 2)
+        assert heap.pop() == ("x", 1)
+        assert heap.peek() is None
+        assert heap.total() == 0
+        with pytest.raises(IndexError):
+            heap.pop()
+
+    def test_validation(self):
+        with pytest.raises(TypeError):
+            FrequencyHeap("abc")
+        with pytest.raises(TypeError):
+            FrequencyHeap([[1]])
+        with pytest.raises(TypeError):
+            FrequencyHeap().insert([1])
+
+class TestSpaceSavingHeap:
+    def test_heavy_hitters(self, stream):
+        counter = Counter(stream)
+        heap = SpaceSavingHeap(20)
+        heap.insert_many(stream)
+        assert len(heap) == 20
+        assert heap.total() == len(stream)
+        for value, count in heap.most_common():
+            assert count - heap.error(value) <= counter[value] <= count
+        for value, count in counter.items():
+            if count > len(stream) / 20:
+                assert value in heap
+        assert [value for value, _ in heap.most_common(3)] == [value for value, _ in counter.most_common(3)]
+
+    def test_eviction(self):
+        heap = SpaceSavingHeap(2)
+        assert heap.insert("a", count=5) is None
+        assert heap.insert("b") is None
+        assert heap.insert("c") == "b"
+        assert heap.count("c") == 2
+        assert heap.error("c") == 1
+        assert heap.count("b") == 0
+        with pytest.raises(KeyError):
+            heap.error("b")
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            SpaceSavingHeap(0)
+        with pytest.raises(ValueError):
+            SpaceSavingHeap(2).insert("a", count=-1)
+
+    def test_rejected_key_not_counted(self):
+        heap = SpaceSavingHeap(1)
+        heap.insert("a", count=3)
+        for _ in range(2):
+            with pytest.raises(TypeError):
+                heap.insert(["unhashable"])
+        assert heap.total() == 3
+        heap.insert("b")
+        with pytest.raises(TypeError):
+            heap.insert(["unhashable"], count=5)
+        assert heap.total() == 4
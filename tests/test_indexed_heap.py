@@ -1,6 +1,10 @@
 import pytest
+import heapq
+from array import array
+from collections import Counter
 from indexedheap import MaxHeap, MinHeap
 import math
+import random
 
 @pytest.fixture
 def arr():
@@ -114,6 +118,17 @@ class TestInsert:
         assert len(heap) == expected_count
         assert heap.count(value) == expected_count
     
+    def test_reinsert_without_priority_keeps_stored_priority(self, HeapClass):
+        heap = HeapClass()
+        heap.insert("job", priority=5)
+        heap.insert("task", priority=3)
+        heap.insert("job")
+        assert heap.count("job") == 2
+        assert heap.priority("job") == 5
+        assert len(heap) == 3
+        with pytest.raises(TypeError):
+            heap.insert("other")
+
     def test_insert_unique(self, HeapClass):
         heap = HeapClass()
         for i in range(1, 10):
@@ -266,3 +281,642 @@ class TestEquality:
         heap1 = HeapClass(arr)
         heap2 = HeapClass(duplicate_value_arr[1])
         assert heap1 != heap2
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestPriority:
+    def test_insert_with_priority_orders_by_priority(self, HeapClass):
+        heap = HeapClass()
+        jobs = {"a": 5, "b": 1, "c": 3}
+        for job, priority in jobs.items():
+            heap.insert(job, priority=priority)
+        expected = sorted(jobs, key=jobs.get, reverse=HeapClass is MaxHeap)
+        assert heap.to_sorted_list() == expected
+        assert heap.priority("a") == 5
+
+    def test_insert_with_priority_value_not_comparable(self, HeapClass):
+        heap = HeapClass()
+        heap.insert(("job", 1), priority=1)
+        heap.insert(frozenset([1]), priority=2)
+        assert len(heap) == 2
+
+    def test_insert_priority_not_comparable(self, HeapClass):
+        heap = HeapClass()
+        heap.insert("a", priority=1)
+        with pytest.raises(TypeError) as exception_info:
+            heap.insert("b", priority="one")
+        assert "not comparable" in str(exception_info.value)
+
+    def test_insert_existing_value_with_priority_updates_priority(self, HeapClass):
+        heap = HeapClass()
+        heap.insert("a", priority=1)
+        heap.insert("b", priority=2)
+        heap.insert("a", priority=3)
+        assert heap.count("a") == 2
+        assert heap.priority("a") == 3
+        assert heap.peek() == ("b" if HeapClass is MinHeap else "a")
+
+    def test_priority_missing_value(self, HeapClass):
+        heap = HeapClass()
+        with pytest.raises(KeyError):
+            heap.priority("a")
+
+    def test_update_priority(self, HeapClass, arr):
+        heap = HeapClass()
+        for i, priority in enumerate(arr):
+            heap.insert(i, priority=priority)
+        priorities = dict(enumerate(arr))
+        for i, priority in [(0, 10000), (5, -10000), (9, 0), (3, 2)]:
+            heap.update_priority(i, priority)
+            priorities[i] = priority
+            assert heap.priority(i) == priority
+        expected = sorted(priorities, key=priorities.get, reverse=HeapClass is MaxHeap)
+        assert heap.to_sorted_list() == expected
+
+    def test_update_priority_missing_value(self, HeapClass):
+        heap = HeapClass()
+        with pytest.raises(KeyError):
+            heap.update_priority("a", 1)
+
+    def test_update_priority_keeps_frequency(self, HeapClass):
+        heap = HeapClass()
+        heap.insert("a", count=3, priority=1)
+        heap.update_priority("a", 2)
+        assert heap.count("a") == 3
+        assert len(heap) == 3
+
+    def test_decrease_key(self, HeapClass):
+        heap = HeapClass()
+        heap.insert("a", priority=5)
+        heap.insert("b", priority=3)
+        heap.decrease_key("a", 1)
+        assert heap.priority("a") == 1
+        assert heap.peek() == ("a" if HeapClass is MinHeap else "b")
+        with pytest.raises(ValueError):
+            heap.decrease_key("a", 2)
+
+    def test_increase_key(self, HeapClass):
+        heap = HeapClass()
+        heap.insert("a", priority=1)
+        heap.insert("b", priority=3)
+        heap.increase_key("a", 5)
+        assert heap.priority("a") == 5
+        assert heap.peek() == ("b" if HeapClass is MinHeap else "a")
+        with pytest.raises(ValueError):
+            heap.increase_key("a", 4)
+
+    def test_equality_compares_priorities(self, HeapClass):
+        heap1 = HeapClass()
+        heap2 = HeapClass()
+        heap1.insert("a", priority=1)
+        heap2.insert("a", priority=2)
+        assert heap1 != heap2
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestTypedStorage:
+    @pytest.mark.parametrize("typecode", ["d", "q"])
+    def test_typed_storage_matches_list_storage(self, HeapClass, typecode):
+        rng = random.Random(0)
+        list_heap = HeapClass()
+        typed_heap = HeapClass(typecode=typecode)
+        for _ in range(500):
+            value = rng.randint(-50, 50)
+            op = rng.random()
+            if op < 0.6:
+                list_heap.insert(value)
+                typed_heap.insert(value)
+            elif op < 0.8 and list_heap:
+                assert list_heap.pop() == typed_heap.pop()
+            else:
+                assert list_heap.remove(value, strict=False) == typed_heap.remove(value, strict=False)
+            assert list_heap.internal_heap() == typed_heap.internal_heap()
+            assert len(list_heap) == len(typed_heap)
+        assert list_heap.to_sorted_list() == typed_heap.to_sorted_list()
+
+    def test_typed_storage_with_priorities(self, HeapClass):
+        heap = HeapClass(typecode="d")
+        heap.insert("a", priority=1.5)
+        heap.insert("b", priority=0.5)
+        heap.update_priority("b", 2.5)
+        assert heap.peek() == ("a" if HeapClass is MinHeap else "b")
+        assert heap.priority("b") == 2.5
+
+    def test_typed_storage_rejects_non_numeric_priority(self, HeapClass):
+        heap = HeapClass(typecode="q")
+        with pytest.raises(TypeError):
+            heap.insert("a")
+        assert len(heap) == 0
+        assert "a" not in heap
+
+    def test_typed_storage_rejects_priority_before_modifying(self, HeapClass):
+        heap = HeapClass(typecode="q")
+        heap.insert("a", priority=1)
+        with pytest.raises(TypeError):
+            heap.insert("a", priority=2.5)
+        assert heap.count("a") == 1
+        assert heap.priority("a") == 1
+        assert len(heap) == 1
+
+    def test_typed_storage_rejects_invalid_count(self, HeapClass):
+        heap = HeapClass(typecode="q")
+        with pytest.raises(ValueError):
+            heap.insert(2, count=1.5)
+        with pytest.raises(ValueError):
+            heap.insert(2, count=0)
+        assert len(heap.values) == len(heap.priorities) == len(heap.frequencies) == 0
+        assert len(heap) == 0
+
+    def test_typed_storage_pushpop_validates_typecode(self, HeapClass):
+        heap = HeapClass([1, 5], typecode="q")
+        with pytest.raises(TypeError):
+            heap.pushpop(2.5)
+        with pytest.raises(TypeError):
+            heap.pushpop(0.5 if HeapClass is MinHeap else 9.5)
+        assert heap.internal_heap() == HeapClass([1, 5]).internal_heap()
+
+    def test_invalid_typecode(self, HeapClass):
+        with pytest.raises(ValueError):
+            HeapClass(typecode="u")
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestBulkOperations:
+    @pytest.mark.parametrize("initial_size", [0, 5, 1000])
+    def test_insert_many(self, HeapClass, initial_size):
+        rng = random.Random(initial_size)
+        initial = [rng.randint(0, 100) for _ in range(initial_size)]
+        batch = [rng.randint(0, 100) for _ in range(200)]
+        heap = HeapClass(initial)
+        heap.insert_many(iter(batch))
+        assert len(heap) == len(initial) + len(batch)
+        assert heap.count(batch[0]) == (initial + batch).count(batch[0])
+        assert heap.to_sorted_list() == sorted(initial + batch, reverse=HeapClass is MaxHeap)
+
+    def test_insert_many_invalid_batch_leaves_heap_unchanged(self, HeapClass, arr):
+        heap = HeapClass(arr)
+        before = heap.internal_heap()
+        with pytest.raises(TypeError) as exception_info:
+            heap.insert_many([1, 2, "helloworld"])
+        assert "not comparable" in str(exception_info.value)
+        assert heap.internal_heap() == before
+        assert len(heap) == len(arr)
+
+    def test_insert_many_typed_storage_rejects_batch(self, HeapClass):
+        heap = HeapClass(typecode="q")
+        with pytest.raises(TypeError):
+            heap.insert_many([1, 2.5])
+        assert len(heap) == 0
+        assert 1 not in heap
+
+    def test_pop_many(self, HeapClass, arr, duplicate_value_arr):
+        heap = HeapClass(arr + duplicate_value_arr[1])
+        expected = sorted(arr + duplicate_value_arr[1], reverse=HeapClass is MaxHeap)
+        assert heap.pop_many(7) == expected[:7]
+        assert heap.pop_many(0) == []
+        assert len(heap) == len(expected) - 7
+        assert heap.to_sorted_list() == expected[7:]
+
+    def test_pop_many_splits_frequency(self, HeapClass, duplicate_value_arr):
+        value, arr = duplicate_value_arr
+        heap = HeapClass(arr)
+        assert heap.pop_many(3) == [value] * 3
+        assert heap.count(value) == len(arr) - 3
+
+    def test_pop_many_more_than_size(self, HeapClass, arr):
+        heap = HeapClass(arr)
+        with pytest.raises(IndexError):
+            heap.pop_many(len(arr) + 1)
+        assert len(heap) == len(arr)
+        assert heap.pop_many(len(arr) + 1, strict=False) == sorted(arr, reverse=HeapClass is MaxHeap)
+        assert len(heap) == 0
+
+    def test_pop_many_invalid_k(self, HeapClass, arr):
+        heap = HeapClass(arr)
+        with pytest.raises(ValueError):
+            heap.pop_many(-1)
+        with pytest.raises(ValueError):
+            heap.pop_many(1.5)
+
+    @pytest.mark.parametrize("removed_count", [3, 150])
+    def test_remove_many(self, HeapClass, removed_count):
+        rng = random.Random(removed_count)
+        values = [rng.randint(0, 100) for _ in range(200)]
+        heap = HeapClass(values)
+        to_remove = values[:removed_count]
+        assert heap.remove_many(to_remove) == removed_count
+        remaining = values[removed_count:]
+        assert len(heap) == len(remaining)
+        for value in set(values):
+            assert heap.count(value) == remaining.count(value)
+        assert heap.to_sorted_list() == sorted(remaining, reverse=HeapClass is MaxHeap)
+
+    def test_remove_many_strict(self, HeapClass, arr):
+        heap = HeapClass(arr)
+        before = heap.internal_heap()
+        with pytest.raises(KeyError):
+            heap.remove_many([arr[0], "#"])
+        with pytest.raises(ValueError):
+            heap.remove_many([arr[0], arr[0]])
+        assert heap.internal_heap() == before
+
+    def test_remove_many_not_strict(self, HeapClass, arr):
+        heap = HeapClass(arr)
+        assert heap.remove_many([arr[0], arr[0], "#"], strict=False) == 1
+        assert arr[0] not in heap
+        assert len(heap) == len(arr) - 1
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestSortedIteration:
+    def test_iteration_with_duplicates(self, HeapClass, arr, duplicate_value_arr):
+        values = arr + duplicate_value_arr[1]
+        heap = HeapClass(values)
+        before = heap.internal_heap()
+        assert list(heap) == sorted(values, reverse=HeapClass is MaxHeap)
+        assert heap.internal_heap() == before
+
+    def test_partial_iteration(self, HeapClass, arr):
+        heap = HeapClass(arr)
+        iterator = iter(heap)
+        expected = sorted(arr, reverse=HeapClass is MaxHeap)
+        assert [next(iterator) for _ in range(3)] == expected[:3]
+
+    def test_modification_during_iteration(self, HeapClass, arr):
+        heap = HeapClass(arr)
+        with pytest.raises(RuntimeError):
+            for value in heap:
+                heap.remove(value)
+
+    def test_top(self, HeapClass, arr, duplicate_value_arr):
+        values = arr + duplicate_value_arr[1]
+        heap = HeapClass(values)
+        expected = sorted(values, reverse=HeapClass is MaxHeap)
+        assert heap.top(0) == []
+        assert heap.top(5) == expected[:5]
+        assert heap.top(len(values) + 5) == expected
+        with pytest.raises(ValueError):
+            heap.top(-1)
+
+    @pytest.mark.parametrize("k", [0, 1, 4, 15, 100])
+    def test_nsmallest_nlargest(self, HeapClass, arr, duplicate_value_arr, k):
+        values = arr + duplicate_value_arr[1]
+        heap = HeapClass(values)
+        assert heap.nsmallest(k) == sorted(values)[:k]
+        assert heap.nlargest(k) == sorted(values, reverse=True)[:k]
+        assert len(heap) == len(values)
+
+    def test_to_sorted_list_with_priorities(self, HeapClass):
+        heap = HeapClass()
+        priorities = {"a": 3, "b": 1, "c": 2}
+        for value, priority in priorities.items():
+            heap.insert(value, count=2, priority=priority)
+        expected = sorted(priorities, key=priorities.get, reverse=HeapClass is MaxHeap)
+        assert heap.to_sorted_list() == [value for value in expected for _ in range(2)]
+        assert list(heap) == heap.to_sorted_list()
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestTypedValidation:
+    @pytest.mark.parametrize("value_type, values", [
+        (int, [5, 1, 3, 1]),
+        (float, [2.5, -1.0, 2.5]),
+        (str, ["b", "a", "c"]),
+        (tuple, [(1, "b"), (0, "z"), (1, "a")]),
+    ])
+    def test_value_type_heap(self, HeapClass, value_type, values):
+        heap = HeapClass(values, value_type=value_type)
+        heap.insert(values[0])
+        expected = sorted(values + [values[0]], reverse=HeapClass is MaxHeap)
+        assert heap.to_sorted_list() == expected
+
+    def test_value_type_rejects_other_types(self, HeapClass):
+        heap = HeapClass([1], value_type=int)
+        with pytest.raises(TypeError):
+            heap.insert("helloworld")
+        with pytest.raises(TypeError):
+            heap.insert_many([2, 1.5])
+        with pytest.raises(TypeError):
+            HeapClass(["helloworld"], value_type=int)
+        assert heap.internal_heap() == [(1, 1)]
+
+    def test_value_type_accepts_subclasses(self, HeapClass):
+        heap = HeapClass(value_type=int)
+        heap.insert(True)
+        assert True in heap
+
+    def test_value_type_with_separate_priorities(self, HeapClass):
+        heap = HeapClass(value_type=str, priority_type=float)
+        heap.insert("a", priority=2.0)
+        heap.insert("b", priority=1.0)
+        heap.update_priority("b", 3.0)
+        assert heap.peek() == ("a" if HeapClass is MinHeap else "b")
+        with pytest.raises(TypeError):
+            heap.insert("c", priority="high")
+        with pytest.raises(TypeError):
+            heap.update_priority("a", 1)
+
+    def test_invalid_value_type(self, HeapClass):
+        with pytest.raises(TypeError) as exception_info:
+            HeapClass(value_type=list)
+        assert "not hashable" in str(exception_info.value)
+        with pytest.raises(TypeError) as exception_info:
+            HeapClass(value_type=object)
+        assert "not comparable" in str(exception_info.value)
+        with pytest.raises(TypeError):
+            HeapClass(value_type=1)
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestArity:
+    @pytest.mark.parametrize("arity", [2, 3, 4, 8])
+    def test_arity_operations(self, HeapClass, arity):
+        rng = random.Random(arity)
+        initial = [rng.randint(0, 200) for _ in range(100)]
+        heap = HeapClass(initial, arity=arity)
+        reference = list(initial)
+        for _ in range(500):
+            op = rng.random()
+            value = rng.randint(0, 200)
+            if op < 0.4:
+                heap.insert(value)
+                reference.append(value)
+            elif op < 0.6 and reference:
+                expected = min(reference) if HeapClass is MinHeap else max(reference)
+                assert heap.pop() == expected
+                reference.remove(expected)
+            elif op < 0.8:
+                assert heap.remove(value, strict=False) == (value in reference)
+                if value in reference:
+                    reference.remove(value)
+            elif reference:
+                assert heap.peek() == (min(reference) if HeapClass is MinHeap else max(reference))
+        assert heap.to_sorted_list() == sorted(reference, reverse=HeapClass is MaxHeap)
+        assert list(heap) == heap.to_sorted_list()
+
+    @pytest.mark.parametrize("arity", [3, 4])
+    def test_arity_update_priority(self, HeapClass, arity):
+        heap = HeapClass(arity=arity)
+        priorities = {i: (i * 37) % 101 for i in range(50)}
+        for value, priority in priorities.items():
+            heap.insert(value, priority=priority)
+        for value in range(0, 50, 3):
+            priorities[value] = (value * 53) % 97
+            heap.update_priority(value, priorities[value])
+        expected = sorted(priorities, key=lambda value: (priorities[value], value), reverse=HeapClass is MaxHeap)
+        assert [heap.priority(value) for value in heap.to_sorted_list()] == [priorities[value] for value in expected]
+
+    @pytest.mark.parametrize("arity", [1, 0, 2.5, "2"])
+    def test_invalid_arity(self, HeapClass, arity):
+        with pytest.raises(ValueError):
+            HeapClass(arity=arity)
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestMerge:
+    @pytest.mark.parametrize("other_size", [3, 300])
+    def test_update_with_heap(self, HeapClass, other_size):
+        rng = random.Random(other_size)
+        values = [rng.randint(0, 100) for _ in range(100)]
+        other_values = [rng.randint(50, 150) for _ in range(other_size)]
+        heap = HeapClass(values)
+        other = HeapClass(other_values)
+        heap.update(other)
+        assert len(heap) == len(values) + len(other_values)
+        for value in set(values + other_values):
+            assert heap.count(value) == values.count(value) + other_values.count(value)
+        assert heap.to_sorted_list() == sorted(values + other_values, reverse=HeapClass is MaxHeap)
+        assert other.to_sorted_list() == sorted(other_values, reverse=HeapClass is MaxHeap)
+
+    def test_update_with_iterable(self, HeapClass, arr):
+        heap = HeapClass(arr[:5])
+        heap.update(iter(arr[5:]))
+        assert heap.to_sorted_list() == sorted(arr, reverse=HeapClass is MaxHeap)
+
+    def test_update_with_itself(self, HeapClass, arr):
+        heap = HeapClass(arr)
+        heap.update(heap)
+        assert len(heap) == 2 * len(arr)
+        assert heap.count(arr[0]) == 2
+
+    def test_update_keeps_first_priority(self, HeapClass):
+        heap = HeapClass()
+        heap.insert("a", priority=5)
+        heap.insert("b", priority=3)
+        other = HeapClass()
+        other.insert("a", count=2, priority=1 if HeapClass is MinHeap else 9)
+        heap.update(other)
+        assert heap.count("a") == 3
+        assert heap.priority("a") == (1 if HeapClass is MinHeap else 9)
+        assert heap.peek() == "a"
+        heap.update(HeapClass([]))
+        other = HeapClass()
+        other.insert("b", priority=2 if HeapClass is MaxHeap else 4)
+        heap.update(other)
+        assert heap.priority("b") == 3
+
+    def test_update_not_comparable(self, HeapClass):
+        heap = HeapClass([1, 2])
+        with pytest.raises(TypeError):
+            heap.update(HeapClass(["a"]))
+        assert heap.internal_heap() == HeapClass([1, 2]).internal_heap()
+
+    def test_merge_and_or(self, HeapClass, arr):
+        heap1 = HeapClass(arr[:4])
+        heap2 = HeapClass(arr[4:])
+        merged = heap1 | heap2
+        assert merged.to_sorted_list() == sorted(arr, reverse=HeapClass is MaxHeap)
+        assert heap1.merge(heap2) == merged
+        assert len(heap1) == 4
+        heap1 |= heap2
+        assert heap1 == merged
+
+    def test_or_with_other_types(self, HeapClass, arr):
+        OtherClass = MaxHeap if HeapClass is MinHeap else MinHeap
+        with pytest.raises(TypeError):
+            HeapClass(arr) | OtherClass(arr)
+        with pytest.raises(TypeError):
+            HeapClass(arr) | arr
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestPushPop:
+    def test_matches_heapq(self, HeapClass):
+        rng = random.Random(14)
+        sign = 1 if HeapClass is MinHeap else -1
+        for _ in range(50):
+            data = [rng.randrange(30) for _ in range(rng.randint(1, 20))]
+            heap = HeapClass(data)
+            reference = [sign * value for value in data]
+            heapq.heapify(reference)
+            for _ in range(40):
+                value = rng.randrange(40)
+                if rng.random() < 0.5:
+                    assert heap.pushpop(value) == sign * heapq.heappushpop(reference, sign * value)
+                else:
+                    assert heap.replace(value) == sign * heapq.heapreplace(reference, sign * value)
+                assert len(heap) == len(reference)
+                assert heap.to_sorted_list() == sorted(sign * value for value in reference)[::sign]
+
+    def test_pushpop_short_circuit(self, HeapClass):
+        heap = HeapClass([2, 5])
+        before = heap.internal_heap()
+        new_root = 1 if HeapClass is MinHeap else 6
+        assert heap.pushpop(new_root) == new_root
+        assert heap.internal_heap() == before
+        assert HeapClass().pushpop(3) == 3
+
+    def test_frequencies(self, HeapClass):
+        heap = HeapClass()
+        heap.insert("a", count=2, priority=1 if HeapClass is MinHeap else 9)
+        heap.insert("b", priority=5)
+        assert heap.replace("c", priority=3) == "a"
+        assert heap.count("a") == 1
+        assert heap.pushpop("b", priority=0 if HeapClass is MinHeap else 10) == "b"
+        assert heap.count("b") == 1
+        assert len(heap) == 3
+
+    def test_replace_existing_root_keeps_priority(self, HeapClass):
+        heap = HeapClass()
+        first, second = (1, 2) if HeapClass is MinHeap else (2, 1)
+        heap.insert("a", priority=first)
+        heap.insert("b", priority=second)
+        assert heap.replace("a") == "a"
+        assert len(heap) == 2
+        assert heap.to_sorted_list() == ["a", "b"]
+
+    def test_replace_empty(self, HeapClass):
+        with pytest.raises(IndexError):
+            HeapClass().replace(1)
+        heap = HeapClass([1])
+        with pytest.raises(TypeError):
+            heap.pushpop("helloworld")
+        assert heap.internal_heap() == [(1, 1)]
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestLazyRemove:
+    def test_remove_marks_dead(self, HeapClass, arr):
+        heap = HeapClass(arr, lazy_remove=True, compact_threshold=1.0)
+        slots = len(heap.internal_heap())
+        assert heap.remove(50) == True
+        assert heap.remove(1) == True
+        assert len(heap.internal_heap()) == slots
+        assert heap.dead == 2
+        assert 50 not in heap and 1 not in heap
+        assert heap.count(1) == 0
+        assert len(heap) == len(arr) - 2
+        with pytest.raises(KeyError):
+            heap.remove(50)
+        expected = sorted([value for value in arr if value not in (1, 50)], reverse=HeapClass is MaxHeap)
+        assert heap.to_sorted_list() == expected
+        assert list(heap) == expected
+        assert [heap.pop() for _ in range(len(heap))] == expected
+        assert not heap
+        assert heap.peek() is None
+
+    def test_compaction(self, HeapClass):
+        heap = HeapClass(list(range(10)), lazy_remove=True, compact_threshold=0.3)
+        heap.remove(2)
+        heap.remove(5)
+        heap.remove(7)
+        assert heap.dead == 3
+        heap.remove(8)
+        assert heap.dead == 0
+        assert len(heap.internal_heap()) == 6
+        heap.remove_many([0, 9])
+        heap.compact()
+        assert heap.dead == 0
+        assert heap.to_sorted_list() == sorted([1, 3, 4, 6], reverse=HeapClass is MaxHeap)
+
+    def test_reinsert_and_merge(self, HeapClass):
+        heap = HeapClass(lazy_remove=True, compact_threshold=1.0)
+        heap.insert("a", priority=1)
+        heap.insert("b", priority=2)
+        heap.remove("a")
+        heap.insert("a", priority=3)
+        assert heap.priority("a") == 3
+        assert heap.count("a") == 1
+        other = HeapClass()
+        other.update(heap)
+        assert other.internal_heap() == [(value, 1) for value in other.values]
+        assert other.to_sorted_list() == heap.to_sorted_list()
+
+    def test_nsmallest_nlargest_skip_dead_slots(self, HeapClass):
+        heap = HeapClass(list(range(10)), lazy_remove=True, compact_threshold=0.9)
+        heap.remove(0)
+        heap.remove(1)
+        heap.remove(9)
+        assert heap.dead == 3
+        assert heap.nsmallest(3) == [2, 3, 4]
+        assert heap.nlargest(3) == [8, 7, 6]
+        assert heap.nsmallest(10) == list(range(2, 9))
+
+    def test_random_operations(self, HeapClass):
+        rng = random.Random(16)
+        heap = HeapClass(lazy_remove=True, compact_threshold=0.4)
+        reference = []
+        for _ in range(2000):
+            choice = rng.random()
+            if choice < 0.45:
+                value = rng.randrange(100)
+                heap.insert(value)
+                reference.append(value)
+            elif choice < 0.8 and reference:
+                value = rng.choice(reference)
+                heap.remove(value)
+                reference.remove(value)
+            elif reference:
+                expected = min(reference) if HeapClass is MinHeap else max(reference)
+                assert heap.peek() == expected
+                assert heap.pop() == expected
+                reference.remove(expected)
+            assert len(heap) == len(reference)
+        assert heap.to_sorted_list() == sorted(reference, reverse=HeapClass is MaxHeap)
+
+    def test_invalid_threshold(self, HeapClass):
+        with pytest.raises(ValueError):
+            HeapClass(compact_threshold=0)
+        with pytest.raises(ValueError):
+            HeapClass(compact_threshold=1.5)
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestBulkConstructors:
+    def test_from_iterable(self, HeapClass, arr):
+        heap = HeapClass.from_iterable(iter(arr + arr[:3]))
+        assert heap == HeapClass(arr + arr[:3])
+        assert len(heap) == len(arr) + 3
+        assert heap.to_sorted_list() == sorted(arr + arr[:3], reverse=HeapClass is MaxHeap)
+        numeric = HeapClass.from_iterable(array("q", [5, 1, 5, 3]), typecode="q")
+        assert numeric.count(5) == 2
+        assert numeric.to_sorted_list() == sorted([5, 1, 5, 3], reverse=HeapClass is MaxHeap)
+
+    def test_from_counts(self, HeapClass):
+        heap = HeapClass.from_counts(Counter({"b": 2, "a": 1, "c": 3}), arity=4)
+        assert heap.arity == 4
+        assert len(heap) == 6
+        assert heap.count("c") == 3
+        assert heap.to_sorted_list() == sorted("abbccc", reverse=HeapClass is MaxHeap)
+        for counts in ({"a": 0}, {"a": 1.5}):
+            with pytest.raises(ValueError):
+                HeapClass.from_counts(counts)
+
+    @pytest.mark.parametrize("arity", [2, 3])
+    def test_from_sorted(self, HeapClass, arity):
+        data = sorted([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5], reverse=HeapClass is MaxHeap)
+        heap = HeapClass.from_sorted(data, arity=arity)
+        assert heap.values == list(dict.fromkeys(data))
+        assert heap.count(5) == 3
+        assert heap.to_sorted_list() == data
+        heap.insert(0)
+        heap.remove(5)
+        assert heap.to_sorted_list() == sorted(data[:data.index(5)] + data[data.index(5) + 1:] + [0], reverse=HeapClass is MaxHeap)
+        with pytest.raises(ValueError):
+            HeapClass.from_sorted(list(reversed(data)))
+        with pytest.raises(ValueError):
+            HeapClass.from_sorted([1, 2, 1] if HeapClass is MinHeap else [2, 1, 2])
+
+    def test_validation(self, HeapClass):
+        with pytest.raises(TypeError):
+            HeapClass.from_iterable([1, "a"])
+        with pytest.raises(TypeError):
+            HeapClass.from_iterable([1, [2]])
+        with pytest.raises(TypeError):
+            HeapClass.from_counts({1: 1, "a": 1})
+        with pytest.raises(TypeError):
+            HeapClass.from_iterable([1, 2.5], value_type=int)
+        with pytest.raises(TypeError):
+            HeapClass.from_iterable([1.5, 2.5], typecode="q")
+        assert HeapClass.from_iterable([True, 2, 1.5]).to_sorted_list() == sorted([True, 2, 1.5], reverse=HeapClass is MaxHeap)
+        assert HeapClass.from_iterable([]).to_sorted_list() == []
@@ -0,0 +1,90 @@
+import pickle
+import pytest
+import random
+from indexedheap import InstrumentedMaxHeap, InstrumentedMinHeap, MaxHeap, MinHeap, create_heap
+
+@pytest.mark.parametrize("HeapClass, PlainClass", [(InstrumentedMinHeap, MinHeap), (InstrumentedMaxHeap, MaxHeap)])
+class TestInstrumentedHeap:
+    def test_matches_plain_heap(self, HeapClass, PlainClass):
+        rng = random.Random(5)
+        data = [rng.randrange(100) for _ in range(300)]
+        heap, plain = HeapClass(data[:50]), PlainClass(data[:50])
+        for value in data[50:]:
+            heap.insert(value)
+            plain.insert(value)
+        for value in data[:20]:
+            assert heap.remove(value, strict=False) == plain.remove(value, strict=False)
+        assert heap.pop_many(10) == plain.pop_many(10)
+        assert heap.to_sorted_list() == plain.to_sorted_list()
+        assert heap == plain
+
+    def test_counters(self, HeapClass, PlainClass):
+        heap = HeapClass()
+        for value in range(64):
+            heap.insert(value)
+        stats = heap.stats()
+        assert stats["sift_ups"] == 64
+        assert stats["comparisons"] > 0
+        assert stats["index_writes"] == stats["swaps"] + stats["sift_ups"] + stats["sift_downs"]
+        # Ascending values never move in a min-heap, and always climb to the root of a max-heap.
+        if HeapClass is InstrumentedMinHeap:
+            assert stats["average_sift_depth"] == 0.0
+        else:
+            assert stats["average_sift_depth"] > 3
+        heap.pop()
+        stats = heap.stats()
+        assert stats["sift_downs"] == 1
+        assert stats["swaps"] > 0
+
+    def test_latencies(self, HeapClass, PlainClass):
+        heap = HeapClass([3, 1, 2])
+        heap.insert(4)
+        heap.insert_many([5, 6])
+        heap.pop()
+        heap.remove(4)
+        operations = heap.stats()["operations"]
+        assert operations["insert"]["calls"] == 1
+        assert operations["insert_many"]["calls"] == 2
+        assert operations["pop"]["calls"] == 1
+        assert operations["remove"]["calls"] == 1
+        for entry in operations.values():
+            assert sum(entry["histogram"].values()) == entry["calls"]
+            assert entry["max_seconds"] <= entry["total_seconds"]
+            assert entry["mean_seconds"] == entry["total_seconds"] / entry["calls"]
+
+    def test_stale_index_repair(self, HeapClass, PlainClass):
+        heap = HeapClass([1, 2])
+        heap.value_to_index[99] = 10
+        with pytest.raises(KeyError):
+            heap.update_priority(99, 0)
+        assert heap.stats()["stale_index_repairs"] == 1
+
+    def test_reset_copy_and_pickle(self, HeapClass, PlainClass):
+        heap = HeapClass(list(range(10)))
+        heap.to_sorted_list()
+        before = heap.stats()
+        assert before["comparisons"] > 0
+        assert heap._copy().stats()["comparisons"] == 0
+        clone = pickle.loads(pickle.dumps(heap))
+        assert clone.stats() == before
+        assert clone.to_sorted_list() == heap.to_sorted_list()
+        heap.reset_stats()
+        assert heap.stats()["comparisons"] == 0
+        assert heap.stats()["operations"] == {}
+
+    def test_iteration_counters(self, HeapClass, PlainClass):
+        heap = HeapClass(list(range(32)))
+        heap.reset_stats()
+        heap.to_sorted_list()
+        assert heap.stats()["comparisons"] == 0
+        assert list(heap) == heap.to_sorted_list()
+        stats = heap.stats()
+        assert stats["comparisons"] > 0
+        assert stats["sift_ups"] == stats["sift_downs"] == stats["index_writes"] == 0
+        assert len(heap) == 32
+
+def test_create_heap_instrumented():
+    assert isinstance(create_heap([1], instrumented=True), InstrumentedMinHeap)
+    assert isinstance(create_heap(order="max", instrumented=True), InstrumentedMaxHeap)
+    with pytest.raises(ValueError):
+        create_heap(backend="pairing", instrumented=True)
@@ -0,0 +1,127 @@
+import pytest
+import random
+from indexedheap import IndexedMinMaxHeap
+
+@pytest.fixture
+def arr():
+    return [1, -10, 50, 2, 25, 642, 1.32, 8, -1000, 3.5, 1, 1]
+
+def assert_min_max_property(heap):
+    priorities = heap.priorities
+    n = len(priorities)
+    for idx in range(n):
+        stack = [2 * idx + 1, 2 * idx + 2]
+        while stack:
+            child_idx = stack.pop()
+            if child_idx >= n:
+                continue
+            if heap._is_min_level(idx):
+                assert priorities[idx] <= priorities[child_idx]
+            else:
+                assert priorities[idx] >= priorities[child_idx]
+            stack.extend([2 * child_idx + 1, 2 * child_idx + 2])
+    for value, idx in heap.value_to_index.items():
+        assert heap.values[idx] == value
+
+class TestIndexedMinMaxHeap:
+    def test_both_ends(self, arr):
+        heap = IndexedMinMaxHeap(arr)
+        assert_min_max_property(heap)
+        assert len(heap) == len(arr)
+        assert heap.peek_min() == heap.peek() == -1000
+        assert heap.peek_max() == 642
+        assert heap.pop_max() == 642
+        assert heap.pop_min() == -1000
+        assert heap.to_sorted_list() == sorted(arr)[1:-1]
+        assert list(heap) == sorted(arr)[1:-1]
+
+    def test_empty(self):
+        heap = IndexedMinMaxHeap()
+        assert heap.peek_min() is None
+        assert heap.peek_max() is None
+        with pytest.raises(IndexError):
+            heap.pop_min()
+        with pytest.raises(IndexError):
+            heap.pop_max()
+
+    def test_frequencies(self):
+        heap = IndexedMinMaxHeap([5, 5, 1, 3])
+        assert heap.pop_max() == 5
+        assert heap.count(5) == 1
+        assert len(heap) == 3
+        assert heap.pop_max() == 5
+        assert heap.pop_max() == 3
+        assert heap.pop_max() == 1
+        assert not heap
+
+    def test_remove_and_priorities(self):
+        heap = IndexedMinMaxHeap()
+        for value, priority in [("a", 5), ("b", 3), ("c", 4), ("d", 9), ("e", 1)]:
+            heap.insert(value, priority=priority)
+        heap.remove("d")
+        assert heap.peek_max() == "a"
+        heap.update_priority("e", 10)
+        assert heap.peek_max() == "e"
+        assert heap.peek_min() == "b"
+        heap.decrease_key("a", 0)
+        assert heap.to_sorted_list() == ["a", "b", "c", "e"]
+        assert_min_max_property(heap)
+
+    def test_random_operations(self):
+        rng = random.Random(12)
+        for _ in range(50):
+            heap = IndexedMinMaxHeap(rng.sample(range(100), rng.randint(0, 30)))
+            reference = {value: value for value in heap.values}
+            for _ in range(200):
+                choice = rng.random()
+                if choice < 0.3:
+                    value = rng.randrange(300)
+                    if value not in reference:
+                        reference[value] = rng.randrange(1000)
+                        heap.insert(value, priority=reference[value])
+                elif choice < 0.45 and reference:
+                    value = heap.pop_max()
+                    assert all(reference[value] >= priority for priority in reference.values())
+                    del reference[value]
+                elif choice < 0.6 and reference:
+                    value = heap.pop_min()
+                    assert all(reference[value] <= priority for priority in reference.values())
+                    del reference[value]
+                elif choice < 0.8 and reference:
+                    value = rng.choice(sorted(reference))
+                    heap.remove(value)
+                    del reference[value]
+                elif reference:
+                    value = rng.choice(sorted(reference))
+                    reference[value] = rng.randrange(1000)
+                    heap.update_priority(value, reference[value])
+                assert_min_max_property(heap)
+                if reference:
+                    assert heap.priority(heap.peek_min()) == min(reference.values())
+                    assert heap.priority(heap.peek_max()) == max(reference.values())
+            assert len(heap) == len(reference)
+
+    def test_insert_many_and_remove_many(self):
+        heap = IndexedMinMaxHeap([10, 20])
+        heap.insert_many(range(30))
+        assert_min_max_property(heap)
+        assert heap.peek_max() == 29
+        assert heap.remove_many(range(15, 30)) == 15
+        assert_min_max_property(heap)
+        assert heap.peek_max() == 20
+        assert heap.pop_min() == 0
+
+    def test_validation(self):
+        heap = IndexedMinMaxHeap([1])
+        with pytest.raises(TypeError):
+            heap.insert("helloworld")
+        with pytest.raises(TypeError):
+            heap.insert([1], priority=2)
+
+def test_bulk_constructors():
+    data = [7, 3, 3, 9, 1, 4]
+    for heap in (IndexedMinMaxHeap.from_sorted(sorted(data)), IndexedMinMaxHeap.from_iterable(data),
+                 IndexedMinMaxHeap.from_counts({7: 1, 3: 2, 9: 1, 1: 1, 4: 1})):
+        assert heap.peek_min() == 1
+        assert heap.peek_max() == 9
+        assert heap.to_sorted_list() == sorted(data)
@@ -0,0 +1,117 @@
+import bisect
+import pytest
+import random
+from indexedheap import OrderStatisticHeap
+
+def test_matches_sorted_list():
+    rng = random.Random(11)
+    heap = OrderStatisticHeap()
+    reference = []
+    for _ in range(2000):
+        value = rng.randrange(200)
+        if reference and rng.random() < 0.4:
+            value = rng.choice(reference)
+            heap.remove(value)
+            reference.remove(value)
+        else:
+            heap.insert(value)
+            bisect.insort(reference, value)
+        assert len(heap) == len(reference)
+    assert heap.to_sorted_list() == reference
+    for k in range(0, len(reference), 7):
+        assert heap.kth(k) == reference[k]
+    for priority in range(-1, 202, 5):
+        assert heap.rank(priority) == bisect.bisect_left(reference, priority)
+        assert heap.count_range(priority, priority + 30) == bisect.bisect_left(reference, priority + 30) - bisect.bisect_left(reference, priority)
+        assert heap.count(priority) == reference.count(priority)
+
+def test_pop_range():
+    heap = OrderStatisticHeap([5, 1, 3, 3, 9, 7])
+    assert heap.pop_range(3, 8) == [3, 3, 5, 7]
+    assert heap.to_sorted_list() == [1, 9]
+    assert 3 not in heap
+    assert heap.pop_range(8, 3) == []
+    assert len(heap) == 2
+    heap.insert(3)
+    assert heap.to_sorted_list() == [1, 3, 9]
+
+def test_pop_range_incomparable_bound():
+    heap = OrderStatisticHeap([1, 2, 3, 4, 5])
+    with pytest.raises(TypeError):
+        heap.pop_range(2, "x")
+    assert len(heap) == 5
+    assert heap.to_sorted_list() == [1, 2, 3, 4, 5]
+    assert heap.pop_range(2, 4) == [2, 3]
+
+def test_priorities_and_pop():
+    heap = OrderStatisticHeap()
+    heap.insert("a", priority=3)
+    heap.insert("b", priority=1, count=2)
+    heap.insert("c", priority=3)
+    assert heap.peek() == "b"
+    assert heap.rank(3) == 2
+    assert heap.kth(2) == "a"
+    heap.insert("a", priority=0)
+    assert heap.priority("a") == 0
+    assert heap.count("a") == 2
+    assert [heap.pop() for _ in range(5)] == ["a", "a", "b", "b", "c"]
+    assert heap.peek() is None
+    with pytest.raises(IndexError):
+        heap.pop()
+
+def test_reinsert_without_priority_keeps_stored_priority():
+    heap = OrderStatisticHeap([1, 5, 9])
+    heap.insert(7, priority=100)
+    heap.insert(7)
+    assert heap.priority(7) == 100
+    assert heap.count(7) == 2
+    assert heap.to_sorted_list() == [1, 5, 9, 7, 7]
+    jobs = OrderStatisticHeap()
+    jobs.insert("job", priority=5)
+    jobs.insert("job")
+    assert jobs.count("job") == 2
+    with pytest.raises(TypeError):
+        jobs.insert("other")
+
+def test_errors():
+    heap = OrderStatisticHeap([1, 2, 2])
+    with pytest.raises(KeyError):
+        heap.remove(5)
+    assert heap.remove(5, strict=False) is False
+    with pytest.raises(ValueError):
+        heap.remove(2, count=3)
+    assert heap.remove(2, count=3, strict=False)
+    assert heap.to_sorted_list() == [1]
+    with pytest.raises(IndexError):
+        heap.kth(1)
+    with pytest.raises(TypeError):
+        heap.insert([1])
+    with pytest.raises(TypeError):
+        heap.insert("a")
+    with pytest.raises(TypeError):
+        OrderStatisticHeap((1, 2))
+    assert heap.to_sorted_list() == [1]
+
+def check_treap(node):
+    if node is None:
+        return 0
+    for child in (node.left, node.right):
+        if child is not None:
+            assert child.weight <= node.weight
+    if node.left is not None:
+        assert node.left.key < node.key
+    if node.right is not None:
+        assert node.key < node.right.key
+    size = node.count + check_treap(node.left) + check_treap(node.right)
+    assert node.size == size
+    return size
+
+def test_treap_invariants():
+    rng = random.Random(2)
+    heap = OrderStatisticHeap([rng.randrange(500) for _ in range(1000)])
+    assert check_treap(heap.root) == len(heap) == 1000
+    for _ in range(300):
+        heap.insert(rng.randrange(500))
+        heap.remove(heap.kth(rng.randrange(len(heap))))
+    heap.pop_range(100, 200)
+    assert check_treap(heap.root) == len(heap)
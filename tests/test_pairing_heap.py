@@ -0,0 +1,150 @@
+import pytest
+import pickle
+import random
+from indexedheap import MaxHeap, MinHeap, PairingMaxHeap, PairingMinHeap, create_heap
+
+@pytest.fixture
+def arr():
+    return [1, -10, 50, 2, 25, 642, 1.32, 8, -1000, 3.5, 1, 1]
+
+@pytest.mark.parametrize("HeapClass", [PairingMinHeap, PairingMaxHeap])
+class TestPairingHeap:
+    def test_basic_operations(self, HeapClass, arr):
+        heap = HeapClass(arr)
+        expected = sorted(arr, reverse=HeapClass is PairingMaxHeap)
+        assert len(heap) == len(arr)
+        assert heap.count(1) == 3
+        assert heap.peek() == expected[0]
+        assert heap.to_sorted_list() == expected
+        assert [heap.pop() for _ in range(len(arr))] == expected
+        assert not heap
+        assert heap.peek() is None
+        with pytest.raises(IndexError):
+            heap.pop()
+
+    def test_validation(self, HeapClass):
+        heap = HeapClass([1])
+        with pytest.raises(TypeError) as exception_info:
+            heap.insert("helloworld")
+        assert "not comparable" in str(exception_info.value)
+        with pytest.raises(TypeError) as exception_info:
+            heap.insert([1], priority=2)
+        assert "not hashable" in str(exception_info.value)
+        with pytest.raises(TypeError):
+            HeapClass("helloworld")
+
+    def test_invalid_count(self, HeapClass):
+        heap = HeapClass([1])
+        for count in (0, -2, 1.5, "2"):
+            with pytest.raises(ValueError):
+                heap.insert(2, count=count)
+            with pytest.raises(ValueError):
+                heap.remove(1, count=count)
+        assert len(heap) == 1
+        assert 2 not in heap
+        assert heap.to_sorted_list() == [1]
+
+    def test_remove(self, HeapClass, arr):
+        heap = HeapClass(arr)
+        assert heap.remove(1, count=2) == True
+        assert heap.count(1) == 1
+        assert heap.remove(50) == True
+        assert 50 not in heap
+        with pytest.raises(KeyError):
+            heap.remove(50)
+        assert heap.remove(50, strict=False) == False
+        with pytest.raises(ValueError):
+            heap.remove(1, count=2)
+        remaining = [value for value in arr if value != 50]
+        remaining.remove(1)
+        remaining.remove(1)
+        assert heap.to_sorted_list() == sorted(remaining, reverse=HeapClass is PairingMaxHeap)
+
+    def test_priorities(self, HeapClass):
+        heap = HeapClass()
+        for value, priority in [("a", 5), ("b", 3), ("c", 4)]:
+            heap.insert(value, priority=priority)
+        heap.decrease_key("a", 1)
+        heap.increase_key("b", 10)
+        heap.update_priority("c", 6)
+        assert heap.priority("a") == 1
+        expected = ["a", "c", "b"] if HeapClass is PairingMinHeap else ["b", "c", "a"]
+        assert heap.to_sorted_list() == expected
+        with pytest.raises(ValueError):
+            heap.decrease_key("a", 2)
+        with pytest.raises(KeyError):
+            heap.update_priority("z", 1)
+
+    def test_reinsert_without_priority_keeps_stored_priority(self, HeapClass):
+        heap = HeapClass()
+        heap.insert("task", priority=3)
+        heap.insert("job", priority=5)
+        heap.insert("job")
+        assert heap.count("job") == 2
+        assert heap.priority("job") == 5
+        assert len(heap) == 3
+        with pytest.raises(TypeError):
+            heap.insert("other")
+
+    def test_pickle_large_heap(self, HeapClass):
+        values = list(range(50_000))
+        random.Random(2).shuffle(values)
+        heap = HeapClass(values)
+        heap.insert("job", count=2, priority=-1 if HeapClass is PairingMinHeap else 10**6)
+        heap.pop()
+        restored = pickle.loads(pickle.dumps(heap))
+        assert type(restored) is HeapClass
+        assert len(restored) == len(heap)
+        assert restored.count("job") == 1
+        assert restored.priority("job") == heap.priority("job")
+        assert restored.to_sorted_list() == heap.to_sorted_list()
+        assert [restored.pop() for _ in range(100)] == [heap.pop() for _ in range(100)]
+
+    def test_matches_array_backend(self, HeapClass):
+        ArrayClass = MinHeap if HeapClass is PairingMinHeap else MaxHeap
+        rng = random.Random(0)
+        pairing, array_heap = HeapClass(), ArrayClass()
+        for _ in range(3000):
+            value = rng.randrange(100)
+            op = rng.random()
+            if op < 0.35:
+                priority = rng.randrange(1000)
+                pairing.insert(value, priority=priority)
+                array_heap.insert(value, priority=priority)
+            elif op < 0.55 and array_heap:
+                assert array_heap.priority(array_heap.peek()) == pairing.priority(pairing.peek())
+                popped = array_heap.pop()
+                if pairing.peek() != popped:
+                    pairing.remove(popped)
+                else:
+                    pairing.pop()
+            elif op < 0.75:
+                assert pairing.remove(value, strict=False) == array_heap.remove(value, strict=False)
+            elif value in array_heap:
+                priority = rng.randrange(1000)
+                pairing.update_priority(value, priority)
+                array_heap.update_priority(value, priority)
+            assert len(pairing) == len(array_heap)
+            assert pairing.count(value) == array_heap.count(value)
+        assert sorted(pairing.to_sorted_list()) == sorted(array_heap.to_sorted_list())
+
+    def test_meld(self, HeapClass, arr):
+        heap1 = HeapClass(arr[:6])
+        heap2 = HeapClass(arr[6:] + [50])
+        heap1.meld(heap2)
+        assert len(heap1) == len(arr) + 1
+        assert heap1.count(50) == 2
+        assert heap1.to_sorted_list() == sorted(arr + [50], reverse=HeapClass is PairingMaxHeap)
+        assert len(heap2) == 0
+        assert not heap2
+        with pytest.raises(TypeError):
+            heap1.meld(MinHeap())
+
+def test_create_heap():
+    assert isinstance(create_heap(), MinHeap)
+    assert isinstance(create_heap([1], order="max"), MaxHeap)
+    assert isinstance(create_heap(backend="pairing"), PairingMinHeap)
+    assert create_heap([3, 1, 2], order="max", backend="pairing").peek() == 3
+    assert create_heap([3, 1, 2], arity=4).arity == 4
+    with pytest.raises(ValueError):
+        create_heap(backend="fibonacci")
@@ -0,0 +1,109 @@
+import pytest
+import pickle
+import random
+from indexedheap import BoundedHeap, HeapSnapshot, IndexedMinMaxHeap, MaxHeap, MinHeap
+
+def heaps():
+    rng = random.Random(17)
+    priority_heap = MaxHeap()
+    for value in ["a", "b", "c", "d"]:
+        priority_heap.insert(value, count=2, priority=rng.random())
+    return [
+        MinHeap([rng.random() for _ in range(500)], typecode="d"),
+        MaxHeap([rng.randrange(100) for _ in range(500)], typecode="q", arity=4),
+        MinHeap([1, 2.5, 3], typecode="d"),
+        MinHeap(["x", "y", "z"]),
+        priority_heap,
+        BoundedHeap(3, [4, 1, 7, 2], keep="smallest"),
+        IndexedMinMaxHeap([5, 1, 9, 3]),
+        MinHeap(typecode="q"),
+    ]
+
+@pytest.mark.parametrize("heap", heaps(), ids=lambda heap: type(heap).__name__)
+class TestPersistence:
+    def test_dump_and_load(self, heap, tmp_path):
+        path = tmp_path / "heap.bin"
+        heap.dump(path)
+        loaded = type(heap).load(path)
+        assert type(loaded) is type(heap)
+        assert loaded == heap
+        assert loaded.to_sorted_list() == heap.to_sorted_list()
+        if heap:
+            assert loaded.pop() == heap.peek()
+            assert len(loaded) == len(heap) - 1
+
+    @pytest.mark.parametrize("protocol", [2, 4, 5])
+    def test_pickle(self, heap, protocol):
+        assert pickle.loads(pickle.dumps(heap, protocol=protocol)) == heap
+        buffers = []
+        data = pickle.dumps(heap, protocol=protocol, buffer_callback=buffers.append if protocol >= 5 else None)
+        assert pickle.loads(data, buffers=buffers) == heap
+        assert bool(buffers) == (protocol >= 5 and heap.typecode is not None)
+
+class TestHeapSnapshot:
+    def test_mmap_snapshot(self, tmp_path):
+        rng = random.Random(1)
+        heap = MaxHeap([rng.randrange(1000) for _ in range(300)], typecode="q")
+        path = tmp_path / "heap.bin"
+        heap.dump(path)
+        with MaxHeap.load(path, mmap=True) as snapshot:
+            assert isinstance(snapshot, HeapSnapshot)
+            assert len(snapshot) == len(heap)
+            assert snapshot.peek() == heap.peek()
+            assert snapshot.top(5) == heap.top(5)
+            assert snapshot.to_sorted_list() == heap.to_sorted_list()
+            value = heap.values[10]
+            assert value in snapshot
+            assert snapshot.count(value) == heap.count(value)
+            assert -1 not in snapshot
+            copy = snapshot.to_heap()
+            assert copy == heap
+            copy.pop()
+            assert len(snapshot) == len(heap)
+
+    def test_empty_snapshot(self, tmp_path):
+        path = tmp_path / "heap.bin"
+        MinHeap(typecode="d").dump(path)
+        with MinHeap.load(path, mmap=True) as snapshot:
+            assert snapshot.peek() is None
+            assert not snapshot
+            assert list(snapshot) == []
+
+    def test_lazy_heap_is_compacted(self, tmp_path):
+        heap = MinHeap(list(range(10)), typecode="q", lazy_remove=True, compact_threshold=1.0)
+        heap.remove(0)
+        heap.remove(5)
+        path = tmp_path / "heap.bin"
+        heap.dump(path)
+        with MinHeap.load(path, mmap=True) as snapshot:
+            assert snapshot.to_sorted_list() == heap.to_sorted_list()
+        assert MinHeap.load(path).dead == 0
+        assert pickle.loads(pickle.dumps(heap)).to_sorted_list() == heap.to_sorted_list()
+        assert heap.dead == 2
+
+    def test_bounded_heap_direction(self, tmp_path):
+        heap = BoundedHeap(3, [7, 1, 5, 9, 3], keep="smallest", typecode="q")
+        path = tmp_path / "heap.bin"
+        heap.dump(path)
+        with BoundedHeap.load(path, mmap=True) as snapshot:
+            assert snapshot.to_sorted_list() == heap.to_sorted_list() == [5, 3, 1]
+            assert snapshot.top(2) == [5, 3]
+
+    def test_min_max_heap_is_rejected(self, tmp_path):
+        path = tmp_path / "heap.bin"
+        IndexedMinMaxHeap(list(range(100)), typecode="q").dump(path)
+        with pytest.raises(ValueError):
+            IndexedMinMaxHeap.load(path, mmap=True)
+        assert IndexedMinMaxHeap.load(path).to_sorted_list() == list(range(100))
+
+    def test_errors(self, tmp_path):
+        path = tmp_path / "heap.bin"
+        MinHeap(["a", "b"]).dump(path)
+        with pytest.raises(ValueError):
+            MinHeap.load(path, mmap=True)
+        with pytest.raises(TypeError):
+            MaxHeap.load(path)
+        other = tmp_path / "other.bin"
+        other.write_bytes(b"not a heap")
+        with pytest.raises(ValueError):
+            MinHeap.load(other)
@@ -0,0 +1,87 @@
+import pytest
+import random
+from indexedheap import DeadlineScheduler
+
+@pytest.fixture(params=[None, 5.0], ids=["heap_only", "timing_wheel"])
+def scheduler(request):
+    return DeadlineScheduler(horizon=request.param, resolution=1.0)
+
+class TestDeadlineScheduler:
+    def test_pop_expired_in_deadline_order(self, scheduler):
+        for key, deadline in [("c", 30), ("a", 10), ("b", 20), ("d", 100)]:
+            scheduler.schedule(key, deadline)
+        assert scheduler.pop_expired(5) == []
+        assert scheduler.pop_expired(25) == ["a", "b"]
+        assert len(scheduler) == 2
+        assert scheduler.pop_expired(30) == ["c"]
+        assert scheduler.next_deadline() == 100
+        assert scheduler.pop_expired(1000) == ["d"]
+        assert not scheduler
+        assert scheduler.next_deadline() is None
+
+    def test_cancel(self, scheduler):
+        scheduler.schedule("a", 10)
+        scheduler.schedule("b", 2)
+        scheduler.pop_expired(0)
+        assert scheduler.cancel("a") == True
+        assert scheduler.cancel("b") == True
+        assert scheduler.cancel("a") == False
+        assert "a" not in scheduler
+        assert scheduler.pop_expired(100) == []
+
+    def test_reschedule(self, scheduler):
+        scheduler.schedule("a", 10)
+        scheduler.schedule("b", 20)
+        scheduler.reschedule("a", 30)
+        assert scheduler.deadline("a") == 30
+        scheduler.pop_expired(1)
+        scheduler.reschedule("b", 2)
+        assert scheduler.pop_expired(25) == ["b"]
+        assert scheduler.pop_expired(30) == ["a"]
+        with pytest.raises(KeyError):
+            scheduler.reschedule("a", 40)
+
+    def test_schedule_duplicate_key(self, scheduler):
+        scheduler.schedule("a", 10)
+        with pytest.raises(ValueError):
+            scheduler.schedule("a", 20)
+
+    def test_matches_reference(self, scheduler):
+        rng = random.Random(0)
+        reference = {}
+        now = 0.0
+        for step in range(2000):
+            key = rng.randrange(200)
+            op = rng.random()
+            if op < 0.4:
+                deadline = now + rng.uniform(0, 50)
+                if key in reference:
+                    scheduler.reschedule(key, deadline)
+                else:
+                    scheduler.schedule(key, deadline)
+                reference[key] = deadline
+            elif op < 0.7:
+                assert scheduler.cancel(key) == (key in reference)
+                reference.pop(key, None)
+            else:
+                now += rng.uniform(0, 3)
+                expired = sorted((deadline, key) for key, deadline in reference.items() if deadline <= now)
+                assert scheduler.pop_expired(now) == [key for _, key in expired]
+                for _, key in expired:
+                    del reference[key]
+            assert len(scheduler) == len(reference)
+
+    def test_wheel_parks_far_timers(self):
+        scheduler = DeadlineScheduler(horizon=10, resolution=1)
+        scheduler.pop_expired(0)
+        scheduler.schedule("near", 5)
+        scheduler.schedule("far", 500)
+        assert len(scheduler.heap) == 1
+        assert scheduler.cancel("far") == True
+        assert len(scheduler.heap) == 1
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            DeadlineScheduler(horizon=-1)
+        with pytest.raises(ValueError):
+            DeadlineScheduler(resolution=0)
@@ -0,0 +1,82 @@
+import pytest
+import random
+from indexedheap import MaxHeap, MinHeap, ShardedHeap
+
+@pytest.mark.parametrize("HeapClass", [MinHeap, MaxHeap])
+class TestShardedHeap:
+    def test_matches_single_heap(self, HeapClass):
+        rng = random.Random(4)
+        data = [rng.randrange(500) for _ in range(2000)]
+        reference = HeapClass(data)
+        with ShardedHeap(3, heap_class=HeapClass, batch_size=64) as heap:
+            heap.insert_many(data)
+            assert len(heap) == 2000
+            assert heap.peek() == reference.peek()
+            for value in data[:300]:
+                assert heap.remove(value, strict=False) == reference.remove(value, strict=False)
+            assert len(heap) == len(reference)
+            assert heap.count(data[500]) == reference.count(data[500])
+            assert [heap.pop() for _ in range(50)] == reference.pop_many(50)
+            assert heap.pop_many(400) == reference.pop_many(400)
+            assert heap.to_sorted_list() == reference.to_sorted_list()
+            assert heap.pop_many(10_000, strict=False) == reference.to_sorted_list()
+            assert not heap
+            assert heap.peek() is None
+            with pytest.raises(IndexError):
+                heap.pop()
+
+    def test_priorities_and_errors(self, HeapClass):
+        with ShardedHeap(2, heap_class=HeapClass, batch_size=1) as heap:
+            heap.insert("low", priority=1)
+            heap.insert("high", priority=9, count=2)
+            assert "high" in heap
+            assert heap.count("high") == 2
+            assert heap.peek() == ("low" if HeapClass is MinHeap else "high")
+            with pytest.raises(TypeError):
+                heap.insert("bad", priority="x")
+            with pytest.raises(TypeError):
+                heap.insert([1])
+            with pytest.raises(KeyError):
+                heap.remove("missing")
+            with pytest.raises(ValueError):
+                heap.remove("low", count=2)
+            with pytest.raises(IndexError):
+                heap.pop_many(4)
+            assert len(heap) == 3
+
+    def test_reinsert_without_priority(self, HeapClass):
+        with ShardedHeap(2, heap_class=HeapClass, batch_size=1) as heap:
+            heap.insert("other", priority=3)
+            heap.insert("job", priority=5)
+            heap.insert("job")
+            heap.insert_many(["job", "other"])
+            assert heap.count("job") == 3
+            assert heap.count("other") == 2
+            assert len(heap) == 5
+
+    def test_insert_many_validates_batch(self, HeapClass):
+        with ShardedHeap(2, heap_class=HeapClass) as heap:
+            heap.insert(1)
+            with pytest.raises(TypeError):
+                heap.insert_many(["a", 2])
+            with pytest.raises(TypeError):
+                heap.insert("a")
+            assert len(heap) == 1
+
+def test_rejected_insert_keeps_rest_of_batch():
+    with ShardedHeap(1, batch_size=10, typecode="q") as heap:
+        heap.insert("a", priority=1)
+        heap.insert("b")
+        heap.insert("c", priority=3)
+        with pytest.raises(TypeError):
+            heap.flush()
+        assert len(heap) == 2
+        assert heap.to_sorted_list() == ["a", "c"]
+        assert heap.pop_many(2) == ["a", "c"]
+        assert not heap
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        ShardedHeap(0)
+    with pytest.raises(ValueError):
+        ShardedHeap(2, batch_size=0)
@@ -0,0 +1,95 @@
+import multiprocessing
+import pytest
+import random
+from indexedheap import MaxHeap, MinHeap, SharedMaxHeap, SharedMinHeap
+
+pytest.importorskip("multiprocessing.shared_memory")
+
+def consume(heap, results):
+    popped = []
+    while True:
+        try:
+            popped.append(heap.pop())
+        except IndexError:
+            break
+    results.put(popped)
+    heap.close()
+
+@pytest.mark.parametrize("HeapClass, ReferenceClass", [(SharedMinHeap, MinHeap), (SharedMaxHeap, MaxHeap)])
+class TestSharedHeap:
+    def test_matches_indexed_heap(self, HeapClass, ReferenceClass):
+        rng = random.Random(8)
+        reference = ReferenceClass()
+        with HeapClass(300, typecode="q") as heap:
+            for _ in range(3000):
+                choice = rng.random()
+                if choice < 0.5:
+                    value = rng.randrange(-150, 150)
+                    count = rng.randint(1, 3)
+                    heap.insert(value, count=count)
+                    reference.insert(value, count=count)
+                elif choice < 0.75 and reference:
+                    value = rng.choice(reference.values)
+                    count = rng.randint(1, 3)
+                    assert heap.remove(value, count=count, strict=False) == reference.remove(value, count=count, strict=False)
+                elif reference:
+                    assert heap.pop() == reference.pop()
+                assert len(heap) == len(reference)
+                assert heap.peek() == reference.peek()
+            for value in range(-150, 150, 7):
+                assert heap.count(value) == reference.count(value)
+            assert heap.to_sorted_list() == reference.to_sorted_list()
+
+    def test_semantics(self, HeapClass, ReferenceClass):
+        with HeapClass(2) as heap:
+            heap.insert_many([1, 2, 2])
+            assert 2 in heap and 3 not in heap
+            assert heap.count(2.0) == 2
+            with pytest.raises(ValueError):
+                heap.insert(3)
+            with pytest.raises(TypeError):
+                heap.insert("a")
+            with pytest.raises(TypeError):
+                heap.insert(float("nan"))
+            with pytest.raises(KeyError):
+                heap.remove(5)
+            with pytest.raises(ValueError):
+                heap.remove(1, count=2)
+            assert heap.remove(2, count=2)
+            assert heap.pop() == 1.0
+            assert not heap
+            assert heap.peek() is None
+            with pytest.raises(IndexError):
+                heap.pop()
+
+    def test_attach(self, HeapClass, ReferenceClass):
+        with HeapClass(10) as heap:
+            heap.insert(4)
+            other = HeapClass.attach(heap.name, heap.lock)
+            other.insert(7)
+            assert heap.to_sorted_list() == other.to_sorted_list()
+            other.close()
+            with pytest.raises(TypeError):
+                (SharedMaxHeap if HeapClass is SharedMinHeap else SharedMinHeap).attach(heap.name, heap.lock)
+
+    def test_processes_share_one_heap(self, HeapClass, ReferenceClass):
+        data = list(range(2000)) * 2
+        with HeapClass(2000, typecode="q") as heap:
+            heap.insert_many(data)
+            results = multiprocessing.Queue()
+            workers = [multiprocessing.Process(target=consume, args=(heap, results)) for _ in range(3)]
+            for worker in workers:
+                worker.start()
+            popped = [results.get(timeout=60) for _ in workers]
+            for worker in workers:
+                worker.join()
+            for values in popped:
+                assert values == sorted(values, reverse=HeapClass is SharedMaxHeap)
+            assert sorted(value for values in popped for value in values) == sorted(data)
+            assert not heap
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        SharedMinHeap(0)
+    with pytest.raises(ValueError):
+        SharedMinHeap(10, typecode="u")
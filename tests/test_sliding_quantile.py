@@ -0,0 +1,53 @@
+import pytest
+import random
+from indexedheap import SlidingQuantile
+
+def brute_force(samples, window, q):
+    result = []
+    for i in range(len(samples)):
+        current = sorted(samples[max(0, i + 1 - window):i + 1])
+        result.append(current[int(q * (len(current) - 1))])
+    return result
+
+@pytest.mark.parametrize("window", [1, 2, 7, 50])
+@pytest.mark.parametrize("q", [0, 0.25, 0.5, 0.95, 1])
+def test_matches_sorted_window(window, q):
+    rng = random.Random(window)
+    samples = [rng.randrange(20) for _ in range(300)]
+    assert SlidingQuantile(window, q).process(samples) == brute_force(samples, window, q)
+
+def test_add_and_evict():
+    median = SlidingQuantile(3)
+    assert median.quantile() is None
+    assert median.add(5) is None
+    assert median.add(1) is None
+    assert median.quantile() == 1
+    assert median.add(9) is None
+    assert median.quantile() == 5
+    assert median.add(7) == 5
+    assert median.quantile() == 7
+    assert median.evict() == 1
+    assert len(median) == 2
+    assert median.quantile() == 7
+    median.evict()
+    median.evict()
+    assert not median
+    assert median.quantile() is None
+    with pytest.raises(IndexError):
+        median.evict()
+
+def test_duplicates_share_slots():
+    median = SlidingQuantile(100, value_type=float)
+    median.process([1.0] * 60 + [2.0] * 40)
+    assert median.quantile() == 1.0
+    assert len(median.low.values) + len(median.high.values) <= 3
+    median.process([2.0] * 30)
+    assert median.quantile() == 2.0
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        SlidingQuantile(0)
+    with pytest.raises(ValueError):
+        SlidingQuantile(10, 1.5)
+    with pytest.raises(TypeError):
+        SlidingQuantile(10).add([1])